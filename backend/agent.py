@@ -3,14 +3,23 @@ Press Release Generation Agent - AI-powered PR content creation
 Handles client requests and generates tailored press releases for different media outlets using DeepSeek AI
 """
 
-from uagents import Agent, Context, Model
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from datetime import datetime
-from openai import OpenAI
 import json
 import os
 import requests
 
+from metrics import fallback_releases_total, llm_releases_total, llm_request_duration, start_metrics_server
+from tracing import current_span, start_span
+from content_cleaner import clean_content
+from outlet_styles import OUTLETS as OUTLET_STYLES  # Outlet-specific styles and instructions for AI
+from local_engine import generate_release
+# The message base class without the rest of uagents (Agent pulls in the ledger client and ASGI server)
+from uagents_core.models import Model
+
+if TYPE_CHECKING:
+    from uagents import Context
+
 # Define message models for Press Release workflow
 class PressReleaseRequest(Model):
     title: str
@@ -20,6 +29,7 @@ class PressReleaseRequest(Model):
     category: str  # e.g., "Product Launch", "Acquisition", "Funding", "Event"
     contact_info: Optional[str] = ""
     additional_notes: Optional[str] = ""
+    trace_context: Optional[str] = ""  # W3C traceparent of the web app's request
 
 class GeneratedPressRelease(Model):
     outlet: str
@@ -35,103 +45,24 @@ class PressReleaseResponse(Model):
     timestamp: str
     status: str
 
-# Instantiate agent with consistent seed to get same address every time
-agent = Agent(
-    name="press_release_agent",
-    seed="press-release-seed-phrase"
-)
+# Built by build_agent(): importing this module for its models or fallback doesn't derive keys or query the network
+agent = None
 
 # Get DeepSeek API key from environment
 API_KEY_DS = os.getenv('API_KEY_DS')
-
-# Initialize OpenAI client for OpenRouter
-client = None
-if API_KEY_DS:
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=API_KEY_DS,
-    )
-
-# Outlet-specific styles and instructions for AI
-OUTLET_STYLES = {
-    "TechCrunch": {
-        "tone": "Direct, tech-focused, startup-friendly",
-        "style": "Bold headlines, focus on innovation and market disruption",
-        "instructions": "Write a professional press release in TechCrunch style: tech-focused, startup-friendly, emphasize innovation and market disruption. Use markdown formatting with bold headings (##) and bullet points. Target 300-500 words. Focus on technical achievements and business impact."
-    },
-    "The Verge": {
-        "tone": "Consumer-focused, accessible tech coverage",
-        "style": "Engaging, lifestyle-oriented tech angle",
-        "instructions": "Write a professional press release in The Verge style: consumer-focused, accessible tech coverage with engaging narrative. Use markdown formatting with clear headings (##) and focus on human aspects of technology. Target 400-600 words. Make it engaging and relatable."
-    },
-    "Forbes": {
-        "tone": "Business-focused, executive perspective",
-        "style": "Professional, market impact, financial implications",
-        "instructions": "Write a professional press release in Forbes style: business-focused, executive perspective, emphasize market impact and financial implications. Use markdown formatting with professional headings (##). Target 500-800 words. Focus on business strategy and market positioning."
-    },
-    "General": {
-        "tone": "Balanced, broad appeal",
-        "style": "Standard press release format, accessible to all audiences",
-        "instructions": "Write a professional press release in standard format: balanced tone, broad appeal, accessible to all audiences. Use markdown formatting with clear headings (##) and bullet points. Follow traditional PR structure with headline, dateline, body paragraphs, and contact info. Target 400-600 words."
-    },
-    "Adevarul": {
-        "tone": "Romanian news perspective, factual reporting",
-        "style": "Straightforward news reporting, local angle",
-        "instructions": "Write a professional press release in Romanian news style: factual reporting, straightforward news format with local perspective. Use markdown formatting with clear headings (##). Target 300-500 words. Objective and informative tone."
-    },
-    "CNN": {
-        "tone": "News-focused, broad appeal",
-        "style": "Breaking news format, impact-focused",
-        "instructions": "Write a professional press release in CNN news style: breaking news format, broad appeal, focus on impact and implications. Use markdown formatting with bold headings (##). Target 400-600 words. Clear, authoritative reporting tone."
-    }
-}
+# Point at loadtest/openrouter_stub.py to exercise the agent without spending quota
+OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1').rstrip('/')
 
 def clean_press_release_content(content: str) -> str:
     """Clean and format press release content from AI response"""
-    # Remove LaTeX formatting
-    content = content.replace('\\boxed{', '').replace('}', '')
-    
-    # Remove code block markers if present
-    if content.startswith('```'):
-        lines = content.split('\n')
-        # Find first content line after opening ```
-        start_idx = 1
-        for i, line in enumerate(lines[1:], 1):
-            if not line.strip().startswith('```') and line.strip():
-                start_idx = i
-                break
-        # Find last content line before closing ```
-        end_idx = len(lines)
-        for i in range(len(lines) - 1, -1, -1):
-            if not lines[i].strip().startswith('```') and lines[i].strip():
-                end_idx = i + 1
-                break
-        content = '\n'.join(lines[start_idx:end_idx])
-    
-    # Remove any remaining markdown code block indicators
-    content = content.replace('```markdown', '').replace('```', '')
-    
-    # Clean up excessive whitespace while preserving paragraph breaks
-    lines = content.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        cleaned_line = line.strip()
-        cleaned_lines.append(cleaned_line)
-    
-    # Join lines and clean up excessive line breaks
-    content = '\n'.join(cleaned_lines)
-    # Replace multiple consecutive empty lines with maximum 2
-    while '\n\n\n' in content:
-        content = content.replace('\n\n\n', '\n\n')
-    
-    return content.strip()
+    return clean_content(content)
 
-async def generate_ai_press_release(request: PressReleaseRequest, outlet: str, ctx: Context) -> GeneratedPressRelease:
-    """Generate press release using DeepSeek AI via OpenRouter with OpenAI client"""
+async def generate_ai_press_release(request: PressReleaseRequest, outlet: str, ctx: "Context") -> GeneratedPressRelease:
+    """Generate press release using DeepSeek AI via OpenRouter's chat completions API"""
     
-    if not client:
-        ctx.logger.error("❌ OpenAI client not initialized - API key missing")
-        return create_fallback_release(request, outlet)
+    if not API_KEY_DS:
+        ctx.logger.error(f"❌ API_KEY_DS not set for {outlet}")
+        return create_fallback_release(request, outlet, reason="no_api_key")
     
     outlet_info = OUTLET_STYLES.get(outlet, OUTLET_STYLES["General"])
     
@@ -152,11 +83,6 @@ Generate a professional press release in markdown format. Include proper heading
     try:
         ctx.logger.info(f"🤖 Calling DeepSeek AI for {outlet}...")
         
-        # Check API key first
-        if not API_KEY_DS:
-            ctx.logger.error(f"❌ API_KEY_DS not set for {outlet}")
-            return create_fallback_release(request, outlet)
-        
         # Log the request structure for debugging (without exposing the API key)
         request_data = {
             "model": "deepseek/deepseek-r1-zero:free",
@@ -177,17 +103,26 @@ Generate a professional press release in markdown format. Include proper heading
         
         ctx.logger.info(f"📡 API Request structure: model={request_data['model']}, messages_count={len(request_data['messages'])}")
         
-        # Call OpenRouter API with DeepSeek model
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY_DS}",
-                "HTTP-Referer": "https://pr-connect-r40k.onrender.com",
-                "X-Title": "PR-Connect",
-            },
-            json=request_data,  # Use json= instead of data=json.dumps() to set Content-Type automatically
-            timeout=30  # Add 30 second timeout
-        )
+        # Call OpenRouter API with DeepSeek model (latency recorded per outlet and outcome)
+        with llm_request_duration.time(outlet=outlet, outcome="error") as labels:
+            with start_span("openrouter.chat_completion", service="agent", outlet=outlet, model=request_data["model"]) as span:
+                try:
+                    response = requests.post(
+                        url=f"{OPENROUTER_BASE_URL}/chat/completions",
+                        headers={
+                            "Authorization": f"Bearer {API_KEY_DS}",
+                            "HTTP-Referer": "https://pr-connect-r40k.onrender.com",
+                            "X-Title": "PR-Connect",
+                            "traceparent": span.traceparent(),
+                        },
+                        json=request_data,  # Use json= instead of data=json.dumps() to set Content-Type automatically
+                        timeout=30  # Add 30 second timeout
+                    )
+                    labels["outcome"] = "success" if response.status_code == 200 else f"http_{response.status_code}"
+                    span.set_attribute("http_status", response.status_code)
+                except requests.exceptions.Timeout:
+                    labels["outcome"] = "timeout"
+                    raise
         
         ctx.logger.info(f"📊 API Response Status: {response.status_code}")
         
@@ -200,7 +135,8 @@ Generate a professional press release in markdown format. Include proper heading
                 ctx.logger.info(f"🤖 Raw AI Response: {content_text[:300]}...")
                 
                 # Clean the content
-                cleaned_content = clean_press_release_content(content_text)
+                with start_span("content.clean", service="agent", outlet=outlet, chars=len(content_text)):
+                    cleaned_content = clean_press_release_content(content_text)
                 
                 # Use the cleaned content directly - no need to parse JSON
                 content = cleaned_content
@@ -213,6 +149,7 @@ Generate a professional press release in markdown format. Include proper heading
                     ctx.logger.info(f"🎭 Using tone: {tone}")
                     ctx.logger.info(f"📄 Content preview: {content[:150]}...")
                     ctx.logger.info(f"🚀 SUCCESS: Using AI-generated content for {outlet}")
+                    llm_releases_total.inc(outlet=outlet, outcome="success")
                     
                     return GeneratedPressRelease(
                         outlet=outlet,
@@ -222,10 +159,10 @@ Generate a professional press release in markdown format. Include proper heading
                     )
                 else:
                     ctx.logger.warning(f"⚠️ Content too short: {len(content)} chars")
-                    return create_fallback_release(request, outlet)
+                    return create_fallback_release(request, outlet, reason="short_content")
             else:
                 ctx.logger.error(f"❌ No choices in API response: {ai_response}")
-                return create_fallback_release(request, outlet)
+                return create_fallback_release(request, outlet, reason="empty_response")
         else:
             ctx.logger.error(f"❌ API Error for {outlet}: Status {response.status_code}")
             try:
@@ -233,52 +170,34 @@ Generate a professional press release in markdown format. Include proper heading
                 ctx.logger.error(f"❌ API Error Details: {error_response}")
             except:
                 ctx.logger.error(f"❌ API Raw Response: {response.text}")
-            return create_fallback_release(request, outlet)
+            return create_fallback_release(request, outlet, reason="http_error")
             
     except requests.exceptions.Timeout:
         ctx.logger.error(f"⏰ API Timeout for {outlet}: DeepSeek API took longer than 30 seconds")
-        return create_fallback_release(request, outlet)
+        return create_fallback_release(request, outlet, reason="timeout")
     except requests.exceptions.ConnectionError:
         ctx.logger.error(f"🌐 Connection Error for {outlet}: Cannot reach OpenRouter API")
-        return create_fallback_release(request, outlet)
+        return create_fallback_release(request, outlet, reason="connection_error")
     except requests.exceptions.RequestException as e:
         ctx.logger.error(f"🔌 Network Error for {outlet}: {str(e)}")
-        return create_fallback_release(request, outlet)
+        return create_fallback_release(request, outlet, reason="network_error")
     except Exception as e:
         ctx.logger.error(f"❌ Error calling AI for {outlet}: {str(e)}")
-        return create_fallback_release(request, outlet)
+        return create_fallback_release(request, outlet, reason="error")
 
-def create_fallback_release(request: PressReleaseRequest, outlet: str) -> GeneratedPressRelease:
+def create_fallback_release(request: PressReleaseRequest, outlet: str, reason: str = "error") -> GeneratedPressRelease:
     """Create fallback content when AI fails"""
+    fallback_releases_total.inc(source="agent", outlet=outlet, reason=reason)
+    llm_releases_total.inc(outlet=outlet, outcome="fallback")
+    span = current_span()
+    if span is not None:
+        span.set_attribute("fallback_reason", reason)
     outlet_info = OUTLET_STYLES.get(outlet, OUTLET_STYLES["General"])
     
-    fallback_content = f"""# {request.title}
-
-**{request.company_name}** announces {request.category.lower()}.
-
-## Overview
-
-{request.body}
-
-## Key Highlights
-
-- Innovative approach to industry challenges
-- Strategic positioning for market growth
-- Commitment to excellence and quality delivery
-
-## About {request.company_name}
-
-{request.company_name} continues to focus on innovation and excellence, delivering value to customers and stakeholders.
-
-## Contact Information
-
-**Contact:** {request.contact_info if request.contact_info else f'For more information, contact {request.company_name}'}
-
-{f"**Additional Notes:** {request.additional_notes}" if request.additional_notes else ""}
-
-*This press release was generated for {outlet} - {outlet_info['tone']}*"""
+    # Built from the brief's own facts by the local engine (no LLM)
+    fallback_content = generate_release(request, outlet)
     
-    print(f"⚠️ WARNING: Using fallback template content for {outlet} (not AI-generated)")
+    print(f"⚠️ WARNING: Using local engine content for {outlet} (not AI-generated)")
     print(f"📄 Fallback content preview: {fallback_content[:150]}...")
     
     return GeneratedPressRelease(
@@ -288,8 +207,7 @@ def create_fallback_release(request: PressReleaseRequest, outlet: str) -> Genera
         word_count=len(fallback_content.split())
     )
 
-@agent.on_event("startup")
-async def startup_message(ctx: Context):
+async def startup_message(ctx: "Context"):
     """Agent startup notification"""
     ctx.logger.info(f"🎯 Press Release Generation Agent Online (AI-Powered)")
     ctx.logger.info(f"📧 Agent Address: {ctx.agent.address}")
@@ -297,8 +215,7 @@ async def startup_message(ctx: Context):
     ctx.logger.info(f"🔑 API Key Status: {'✅ Configured' if API_KEY_DS else '❌ Missing'}")
     ctx.logger.info(f"🏢 Ready to generate AI-powered press releases for multiple outlets")
 
-@agent.on_message(model=PressReleaseRequest)
-async def handle_press_release_request(ctx: Context, sender: str, msg: PressReleaseRequest):
+async def handle_press_release_request(ctx: "Context", sender: str, msg: PressReleaseRequest):
     """Process press release generation requests using AI"""
     ctx.logger.info(f"📝 New AI press release request from {sender}")
     ctx.logger.info(f"🏢 Company: {msg.company_name}")
@@ -324,7 +241,10 @@ async def handle_press_release_request(ctx: Context, sender: str, msg: PressRele
     
     for outlet in msg.target_outlets:
         ctx.logger.info(f"🤖 Generating AI-powered {outlet} version...")
-        release = await generate_ai_press_release(msg, outlet, ctx)
+        # Continues the web app's trace so each outlet shows up under its /generate request
+        with start_span(f"agent.generate {outlet}", service="agent", traceparent=msg.trace_context, outlet=outlet) as span:
+            release = await generate_ai_press_release(msg, outlet, ctx)
+            span.set_attribute("word_count", release.word_count)
         generated_releases.append(release)
         ctx.logger.info(f"✅ {outlet} version complete ({release.word_count} words)")
     
@@ -343,5 +263,23 @@ async def handle_press_release_request(ctx: Context, sender: str, msg: PressRele
     # Send the generated press releases back
     await ctx.send(sender, response)
 
+def build_agent():
+    """Instantiate the agent (consistent seed, so the same address every time) and register its handlers"""
+    global agent
+    if agent is None:
+        from uagents import Agent
+        agent = Agent(
+            name="press_release_agent",
+            seed="press-release-seed-phrase"
+        )
+        agent.on_event("startup")(startup_message)
+        agent.on_message(model=PressReleaseRequest)(handle_press_release_request)
+    return agent
+
 if __name__ == "__main__":
-    agent.run()
\ No newline at end of file
+    # Per-outlet LLM latency and fallback counts; the web app serves its own /metrics
+    metrics_port = int(os.getenv('AGENT_METRICS_PORT', 9102))
+    if metrics_port:
+        start_metrics_server(metrics_port)
+        print(f"📈 Agent metrics on http://0.0.0.0:{metrics_port}/metrics")
+    build_agent().run()
\ No newline at end of file
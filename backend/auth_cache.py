@@ -0,0 +1,83 @@
+"""
+Verified JWT payload cache for PR-Connect
+Bounded, TTL-limited LRU so the hot path can skip signature verification and the
+per-user token version check for tokens seen recently
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 4096))
+# Upper bound on how long another worker's revocation can go unnoticed here
+TOKEN_CACHE_TTL = float(os.environ.get('TOKEN_CACHE_TTL', 60))
+
+
+class TokenCache:
+    """Thread-safe LRU of token -> verified payload with per-entry expiry"""
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (expires_at, payload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token):
+        """Cached payload for a token, or None if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, payload = entry
+            if expires_at <= now:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return payload
+
+    def put(self, token, payload):
+        """Cache a verified payload, never beyond the token's own expiry"""
+        ttl = self.ttl
+        if payload.get('exp'):
+            ttl = min(ttl, payload['exp'] - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (time.monotonic() + ttl, payload)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        """Drop every cached token belonging to a user"""
+        with self._lock:
+            stale = [token for token, (_, payload) in self._entries.items() if payload.get('user_id') == user_id]
+            for token in stale:
+                del self._entries[token]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+token_cache = TokenCache()
@@ -0,0 +1,4 @@
+"""
+PR-Connect benchmarks
+Standalone scripts, run from the backend directory: python benchmarks/<script>.py
+"""
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Response compression on /api/requests-shaped payloads
+Builds history lists (requests with six generated releases each), then reports the
+bytes saved and the CPU time per response for each encoding and level.
+
+Usage: python benchmarks/bench_compression.py [--sizes 10 50 200] [--json out.json]
+"""
+
+import argparse
+import gzip
+import json
+import random
+
+from common import measure, print_table, write_results
+
+import compression
+
+OUTLETS = ["TechCrunch", "CNN", "Adevarul", "The Verge", "Forbes", "General"]
+VOCABULARY = (
+    "company announces today launch new platform customers growth market funding round "
+    "partnership product innovation industry leading technology solution revenue team "
+    "investors expansion global users enterprise software data security cloud AI "
+    "according said chief executive officer statement available pricing quarter year"
+).split()
+
+
+def release_text(rng, words=450):
+    """Release-like prose: repetitive vocabulary with some variation, like real output"""
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        length = rng.randint(8, 24)
+        sentence = ' '.join(rng.choice(VOCABULARY) for _ in range(length))
+        sentences.append(sentence.capitalize() + '.')
+    return ' '.join(sentences)
+
+
+def history_payload(num_requests, seed=42):
+    """JSON body shaped like GET /api/requests for one user"""
+    rng = random.Random(seed)
+    data = []
+    for request_id in range(num_requests, 0, -1):
+        responses = []
+        for index, outlet in enumerate(OUTLETS):
+            body = release_text(rng)
+            responses.append({
+                'id': request_id * 10 + index,
+                'body': body,
+                'request_id': request_id,
+                'tone': 'professional',
+                'word_count': len(body.split()),
+                'created_at': '2026-01-01T12:00:00'
+            })
+        data.append({
+            'id': request_id,
+            'title': f"Company announcement {request_id}",
+            'body': release_text(rng, words=120),
+            'company_name': 'Acme Corp',
+            'category': 'Product Launch',
+            'newspaper': rng.choice(OUTLETS),
+            'created_at': '2026-01-01T12:00:00',
+            'responses': responses
+        })
+    return json.dumps({"success": True, "data": data, "count": len(data)}).encode('utf-8')
+
+
+def encoders():
+    """(label, function) pairs for every encoding/level worth comparing"""
+    options = [
+        (f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+        for level in (1, 6, 9)
+    ]
+    if compression.brotli is not None:
+        options += [
+            (f"br-{quality}", lambda data, quality=quality: compression.brotli.compress(data, quality=quality))
+            for quality in (4, 5, 9)
+        ]
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 50, 200],
+                        help='Number of requests in the history payload')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    if compression.brotli is None:
+        print("ℹ️ brotli not installed; measuring gzip only")
+
+    results = []
+    for size in args.sizes:
+        payload = history_payload(size)
+        for label, encode in encoders():
+            compressed = encode(payload)
+            timing = measure(lambda: encode(payload), repeat=args.repeat)
+            results.append({
+                "requests": size,
+                "encoding": label,
+                "raw_kb": round(len(payload) / 1024, 1),
+                "compressed_kb": round(len(compressed) / 1024, 1),
+                "saved_pct": round((1 - len(compressed) / len(payload)) * 100, 1),
+                "cpu_ms": timing["median_ms"],
+                "mb_per_sec": round(len(payload) / 1024 / 1024 / (timing["median_ms"] / 1000), 1)
+            })
+
+    print("🗜️ Response compression on /api/requests payloads")
+    print_table(results, ["requests", "encoding", "raw_kb", "compressed_kb", "saved_pct", "cpu_ms", "mb_per_sec"])
+    write_results("compression", results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+CPU cost of the content pipeline and model serializers
+Times the shared content cleaner (whole and streamed), the multi-pass cleaner it replaced, the outlet
+templates (generate_content_for_outlet, create_fallback_release) and the models' to_dict
+serializers on representative and worst-case inputs. With --baseline, compares medians
+against a stored run and exits non-zero when anything is slower than the threshold.
+
+Usage: python benchmarks/bench_content_pipeline.py [--quick] [--filter clean] [--json out.json]
+       python benchmarks/bench_content_pipeline.py --save-baseline
+       python benchmarks/bench_content_pipeline.py --baseline [path] [--threshold 0.15]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Always a throwaway database: the serializer cases seed a user and hundreds of requests
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='prconnect-bench-'), 'bench.db')}"
+os.environ.pop('DATABASE_REPLICA_URL', None)
+# Keep per-call debug formatting out of the measurements
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from common import BACKEND_DIR, compare_to_baseline, load_results, measure, print_table, write_results
+
+import agent
+import app as backend
+from content_cleaner import StreamingCleaner, clean_content
+from models import db, NewsOutlet, Request, Response, Transcript, User
+
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, 'benchmarks', 'baselines', 'content_pipeline.json')
+OUTLETS = ["TechCrunch", "The Verge", "Forbes", "Adevarul", "CNN", "General"]
+WORDS = ("launch platform customers growth revenue partnership market product team "
+         "announcement investment innovation technology global users feature").split()
+
+
+def release_text(rng, words):
+    """Markdown press release of roughly the given length"""
+    paragraphs = []
+    while sum(len(p.split()) for p in paragraphs) < words:
+        paragraphs.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))) + '.')
+    sections = ["# Acme Announces New Platform", "**SAN FRANCISCO** - Acme today announced its platform."]
+    for i, paragraph in enumerate(paragraphs):
+        if i % 3 == 0:
+            sections.append(f"## Section {i // 3 + 1}")
+        sections.append(paragraph)
+        if i % 4 == 1:
+            sections.append("- First highlight\n- Second highlight\n- Third highlight")
+    return '\n\n'.join(sections)
+
+
+def cleaner_inputs(rng):
+    """Representative and worst-case raw LLM outputs"""
+    typical = release_text(rng, 600)
+    long_output = release_text(rng, 20000)
+    fences = '\n'.join(
+        f"```markdown\n{release_text(rng, 40)}\n```" if i % 2 else "```\n```" for i in range(200)
+    )
+    escapes = ' '.join(
+        f"\\u201c{rng.choice(WORDS)}\\u201d \\u2014 \\u0219i \\u021b{rng.choice(WORDS)} \\u00e9\\u00e8"
+        for _ in range(2500)
+    )
+    blank_lines = '\n'.join(f"{line}\n\n\n\n\n\n" for line in release_text(rng, 3000).split('\n'))
+    return {
+        "typical (600 words, boxed + fenced)": f"\\boxed{{```markdown\n{typical}\n```}}",
+        "long output (20k words)": f"```markdown\n{long_output}\n```",
+        "nested code fences (200)": f"```\n{fences}\n```",
+        "heavy \\uXXXX escapes (20k)": escapes,
+        "runs of blank lines": blank_lines,
+    }
+
+
+def legacy_clean_press_release_content(content):
+    """The agent's previous cleaner: several passes plus a rescan per collapsed blank line"""
+    content = content.replace('\\boxed{', '').replace('}', '')
+    if content.startswith('```'):
+        lines = content.split('\n')
+        start_idx = 1
+        for i, line in enumerate(lines[1:], 1):
+            if not line.strip().startswith('```') and line.strip():
+                start_idx = i
+                break
+        end_idx = len(lines)
+        for i in range(len(lines) - 1, -1, -1):
+            if not lines[i].strip().startswith('```') and lines[i].strip():
+                end_idx = i + 1
+                break
+        content = '\n'.join(lines[start_idx:end_idx])
+    content = content.replace('```markdown', '').replace('```', '')
+    content = '\n'.join(line.strip() for line in content.split('\n'))
+    while '\n\n\n' in content:
+        content = content.replace('\n\n\n', '\n\n')
+    return content.strip()
+
+
+LEGACY_UNICODE_REPLACEMENTS = {
+    '\\u2013': '\u2013', '\\u2014': '\u2014', '\\u201c': '"', '\\u201d': '"', '\\u2018': "'",
+    '\\u2019': "'", '\\u0219': '\u0219', '\\u021b': '\u021b', '\\u0103': '\u0103', '\\u00ee': '\u00ee',
+    '\\u00e2': '\u00e2',
+}
+
+
+def legacy_clean_ai_content(content):
+    """The backend's previous cleaner: eleven replace passes, a regex pass, then \\n"""
+    for opener in ('\\boxed{markdown', '\\boxed{'):
+        if content.startswith(opener):
+            content = content[len(opener):]
+            if content.endswith('}'):
+                content = content[:-1]
+            break
+    content = content.strip()
+    for fence in ('```markdown', '```'):
+        if content.startswith(fence):
+            content = content[len(fence):].strip()
+            if content.endswith('```'):
+                content = content[:-3].strip()
+            break
+    for escape_seq, replacement in LEGACY_UNICODE_REPLACEMENTS.items():
+        content = content.replace(escape_seq, replacement)
+    content = re.sub(r'\\u([0-9a-fA-F]{4})', lambda m: chr(int(m.group(1), 16)), content)
+    return content.replace('\\n', '\n').strip()
+
+
+def clean_streamed(raw, chunk_size=256):
+    """Clean raw as it would arrive from a streaming completion"""
+    cleaner = StreamingCleaner()
+    parts = [cleaner.feed(raw[i:i + chunk_size]) for i in range(0, len(raw), chunk_size)]
+    parts.append(cleaner.finish())
+    return ''.join(parts)
+
+
+def press_release_request(rng):
+    return backend.PressReleaseRequest(
+        title="Acme Launches AI Platform for Small Businesses",
+        body=release_text(rng, 250),
+        company_name="Acme Corp",
+        target_outlets=OUTLETS,
+        category="Product Launch",
+        contact_info="press@acme.example",
+        additional_notes="Available for interviews next week"
+    )
+
+
+def seed_history(num_requests, rng):
+    """One user with num_requests requests x 6 responses and as many transcripts"""
+    outlets = [NewsOutlet(name=name) for name in OUTLETS]
+    db.session.add_all(outlets)
+    user = User(full_name="Bench User", email="bench@example.com", company_name="Acme", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    start = datetime(2026, 1, 1)
+    for i in range(num_requests):
+        created_at = start + timedelta(minutes=i)
+        req = Request(title=f"Announcement {i}", body=release_text(rng, 150), company_name="Acme",
+                      category="Product Launch", news_outlet_id=outlets[i % len(outlets)].id,
+                      user_id=user.id, created_at=created_at)
+        db.session.add(req)
+        db.session.flush()
+        db.session.add_all([
+            Response(body=release_text(rng, rng.randint(300, 700)), request_id=req.id,
+                     tone="professional", word_count=500, created_at=created_at)
+            for _ in outlets
+        ])
+        text = release_text(rng, 400)
+        db.session.add(Transcript(text=text, user_id=user.id, created_at=created_at,
+                                  word_count=len(text.split()), preview=Transcript.make_preview(text)))
+    db.session.commit()
+
+
+def run_cases(args):
+    rng = random.Random(args.seed)
+    repeat = 3 if args.quick else args.repeat
+    cases = []
+
+    for label, raw in cleaner_inputs(rng).items():
+        assert clean_streamed(raw) == clean_content(raw)
+        cases.append(("legacy agent cleaner", label, lambda raw=raw: legacy_clean_press_release_content(raw)))
+        cases.append(("legacy backend cleaner", label, lambda raw=raw: legacy_clean_ai_content(raw)))
+        cases.append(("content_cleaner.clean_content", label, lambda raw=raw: clean_content(raw)))
+        cases.append(("content_cleaner.StreamingCleaner", label, lambda raw=raw: clean_streamed(raw)))
+
+    pr_request = press_release_request(rng)
+    for outlet in OUTLETS:
+        cases.append(("app.generate_content_for_outlet", outlet,
+                      lambda outlet=outlet: backend.generate_content_for_outlet(pr_request, outlet)))
+
+    def fallback_releases():
+        # The agent prints a preview of every fallback release; keep that out of the output
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [agent.create_fallback_release(pr_request, outlet, reason="benchmark") for outlet in OUTLETS]
+    cases.append(("agent.create_fallback_release", "all outlets", fallback_releases))
+
+    results = []
+    for name, case, fn in cases:
+        if args.filter and args.filter not in name:
+            continue
+        timing = measure(fn, repeat=repeat)
+        results.append({"benchmark": name, "case": case, **timing})
+
+    if not args.filter or args.filter in "models.to_dict":
+        with backend.app.app_context():
+            db.create_all()
+            seed_history(args.history, rng)
+            requests = Request.query.order_by(Request.created_at.desc()).all()
+            responses = Response.query.all()
+            transcripts = Transcript.query.all()
+            for case, fn in [
+                (f"Request x{len(requests)}", lambda: [r.to_dict() for r in requests]),
+                (f"Response x{len(responses)}", lambda: [r.to_dict() for r in responses]),
+                (f"Transcript x{len(transcripts)}", lambda: [t.to_dict() for t in transcripts]),
+                (f"history payload x{len(requests)}",
+                 lambda: [dict(r.to_dict(), responses=[resp.to_dict() for resp in r.responses]) for r in requests]),
+            ]:
+                # The warmup call loads lazy relationships; samples measure serialization only
+                timing = measure(fn, repeat=repeat)
+                results.append({"benchmark": "models.to_dict", "case": case, **timing})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--quick', action='store_true', help='Three samples per case')
+    parser.add_argument('--history', type=int, default=300, help='Seeded requests for the serializer cases')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Write results to {os.path.relpath(DEFAULT_BASELINE, BACKEND_DIR)}')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, help='Compare with a stored run')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed slowdown before failing (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    results = run_cases(args)
+    print("⚙️ Content pipeline and serializers (median of samples)")
+    print_table(results, ["benchmark", "case", "median_ms", "min_ms", "stdev_ms"])
+    write_results("content_pipeline", results, args.json)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(DEFAULT_BASELINE), exist_ok=True)
+        write_results("content_pipeline", results, DEFAULT_BASELINE)
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        comparison = compare_to_baseline(results, baseline["results"], ("benchmark", "case"), threshold=args.threshold)
+        print()
+        print(f"📊 Compared with {args.baseline} ({baseline['timestamp']}, Python {baseline['python']})")
+        print_table(comparison, ["benchmark", "case", "baseline", "median_ms", "change_pct", "status"])
+        regressions = [row for row in comparison if row["status"] == "regression"]
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+CORS overhead per request
+Compares the old origin check (allowlist rebuilt from the environment on every call)
+with the precompiled set + pattern, then times preflight and simple GET requests
+through the Flask test client with an Origin header.
+
+Usage: python benchmarks/bench_cors.py [--calls 20000] [--requests 2000] [--json out.json]
+"""
+
+import argparse
+import os
+import tempfile
+
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='prconnect-bench-'), 'bench.db')}")
+
+from common import measure, print_table, write_results
+
+import app as backend
+
+ORIGINS = {
+    "allowed (exact)": "https://pr-connect-frontend-xocv.onrender.com",
+    "allowed (pattern)": "https://pr-connect-preview-42.onrender.com",
+    "rejected": "https://example.com",
+}
+
+
+def legacy_is_origin_allowed(origin):
+    """The previous implementation: rebuild the allowlist on every call"""
+    if not origin:
+        return False
+    allowed_origins = backend.get_cors_origins()
+    if origin in allowed_origins:
+        return True
+    if origin.startswith('https://pr-connect') and origin.endswith('.onrender.com'):
+        return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--calls', type=int, default=20000, help='Origin checks per sample')
+    parser.add_argument('--requests', type=int, default=2000, help='HTTP requests per sample')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    matcher_results = []
+    for label, origin in ORIGINS.items():
+        for name, check in [("legacy", legacy_is_origin_allowed), ("precompiled", backend.is_origin_allowed)]:
+            assert check(origin) == legacy_is_origin_allowed(origin)
+            timing = measure(lambda: check(origin), repeat=5, number=args.calls)
+            matcher_results.append({
+                "origin": label,
+                "matcher": name,
+                "us_per_check": round(timing["median_ms"] * 1000, 3)
+            })
+
+    print("🌐 Origin check cost")
+    print_table(matcher_results, ["origin", "matcher", "us_per_check"])
+
+    client = backend.app.test_client()
+    origin = ORIGINS["allowed (exact)"]
+    preflight_headers = {
+        'Origin': origin,
+        'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': 'Authorization,Content-Type'
+    }
+    preflight = client.options('/api/categories', headers=preflight_headers)
+    max_age = int(preflight.headers.get('Access-Control-Max-Age', 0))
+
+    request_results = []
+    for label, send in [
+        ("OPTIONS preflight", lambda: client.options('/api/categories', headers=preflight_headers)),
+        ("GET with Origin", lambda: client.get('/api/categories', headers={'Origin': origin})),
+    ]:
+        timing = measure(send, repeat=5, number=args.requests // 5 or 1)
+        request_results.append({
+            "request": label,
+            "ms_per_request": round(timing["median_ms"], 4)
+        })
+
+    print()
+    print("⏱️ Request overhead through the Flask test client")
+    print_table(request_results, ["request", "ms_per_request"])
+    print(f"🗂️ Access-Control-Max-Age: {max_age}s (browsers skip the preflight for repeat calls within that window)")
+
+    write_results("cors", {"matcher": matcher_results, "requests": request_results, "max_age": max_age}, args.json)
+
+
+if __name__ == '__main__':
+    main()
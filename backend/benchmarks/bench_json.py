@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+JSON serialization of the history and admin request lists
+Seeds a SQLite database, then times building and encoding the /api/requests and
+/api/admin/requests payloads with the stdlib encoder and with orjson (if installed).
+
+Usage: python benchmarks/bench_json.py [--requests 500] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from common import measure, print_table, write_results
+
+from flask import Flask
+
+import json_provider
+from data_export import fetch_request_page, MAX_PAGE_SIZE
+from models import db, NewsOutlet, Request, Response, User
+
+OUTLETS = ["TechCrunch", "CNN", "Adevarul", "The Verge", "Forbes", "General"]
+
+
+def seed(num_requests, seed_value=7):
+    """One user with num_requests requests, each answered by all six outlets"""
+    rng = random.Random(seed_value)
+    outlets = [NewsOutlet(name=name) for name in OUTLETS]
+    db.session.add_all(outlets)
+    user = User(full_name="Bench User", email="bench@example.com", company_name="Acme", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+
+    start = datetime(2026, 1, 1)
+    for i in range(num_requests):
+        created_at = start + timedelta(minutes=i)
+        req = Request(title=f"Announcement {i}", body="Brief " * 60, company_name="Acme",
+                      category="Product Launch", news_outlet_id=outlets[i % len(outlets)].id,
+                      user_id=user.id, created_at=created_at)
+        db.session.add(req)
+        db.session.flush()
+        db.session.add_all([
+            Response(body=f"{outlet.name} release text " * rng.randint(60, 120), request_id=req.id,
+                     tone="professional", word_count=400, created_at=created_at)
+            for outlet in outlets
+        ])
+    db.session.commit()
+    return user.id
+
+
+def history_payload(user_id):
+    """Same shape as GET /api/requests"""
+    requests = Request.query.filter_by(user_id=user_id).order_by(Request.created_at.desc()).all()
+    data = []
+    for req in requests:
+        req_dict = req.to_dict()
+        req_dict['responses'] = [resp.to_dict() for resp in req.responses]
+        data.append(req_dict)
+    return {"success": True, "data": data, "count": len(data)}
+
+
+def admin_payload():
+    """Same shape as GET /api/admin/requests (one maximum-size page)"""
+    records, next_cursor = fetch_request_page({}, limit=MAX_PAGE_SIZE)
+    return {"success": True, "data": records, "next_cursor": next_cursor}
+
+
+def stdlib_encode(obj):
+    """What Flask's default provider does: sorted keys, stdlib encoder"""
+    return json.dumps(obj, default=json_provider._default, sort_keys=True,
+                      ensure_ascii=True, separators=(',', ':')).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='prconnect-bench-')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    db.init_app(app)
+
+    encoders = [("stdlib (sorted)", stdlib_encode)]
+    if json_provider.orjson is not None:
+        encoders.append(("orjson", lambda obj: json_provider.orjson.dumps(
+            obj, default=json_provider._default, option=json_provider.orjson.OPT_NON_STR_KEYS)))
+    else:
+        print("ℹ️ orjson not installed; measuring the stdlib encoder only")
+
+    results = []
+    with app.app_context():
+        db.create_all()
+        user_id = seed(args.requests)
+
+        for endpoint, build in [("/api/requests", lambda: history_payload(user_id)),
+                                ("/api/admin/requests", admin_payload)]:
+            build_timing = measure(build, repeat=args.repeat)
+            payload = build()
+            db.session.expunge_all()
+            for label, encode in encoders:
+                timing = measure(lambda: encode(payload), repeat=args.repeat)
+                results.append({
+                    "endpoint": endpoint,
+                    "encoder": label,
+                    "records": len(payload["data"]),
+                    "body_kb": round(len(encode(payload)) / 1024, 1),
+                    "build_ms": build_timing["median_ms"],
+                    "encode_ms": timing["median_ms"],
+                    "encode_share_pct": round(timing["median_ms"] / (timing["median_ms"] + build_timing["median_ms"]) * 100, 1)
+                })
+
+    print(f"🧾 JSON serialization ({args.requests} seeded requests x {len(OUTLETS)} releases)")
+    print_table(results, ["endpoint", "encoder", "records", "body_kb", "build_ms", "encode_ms", "encode_share_pct"])
+    write_results("json_serialization", results, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Throughput of the local (no-LLM) press release engine
+Times analyze_content and each outlet generator on short, typical and long briefs, plus a
+full fallback request (one analysis, all six outlets), and reports releases/second. This
+is the capacity the backend keeps when the agent is down or shedding load.
+
+Usage: python benchmarks/bench_local_engine.py [--quick] [--json out.json]
+"""
+
+import argparse
+import random
+
+from common import measure, print_table, write_results
+
+from local_engine import STYLE_GENERATORS, analyze_content, generate_release
+
+
+class Brief:
+    """The request fields the engine reads"""
+
+    def __init__(self, body):
+        self.title = "Acme Robotics Launches Orbit Pro Warehouse Robot"
+        self.body = body
+        self.company_name = "Acme Robotics"
+        self.category = "Product Launch"
+        self.contact_info = "press@acme.example"
+        self.additional_notes = "Demo units are available for review."
+
+
+FACT_SENTENCES = [
+    "Acme Robotics today launched Orbit Pro, its next-generation warehouse robot, in Bucharest.",
+    "The robot costs $49,000 and cuts picking time by 35%.",
+    "The company closed a $12 million Series A led by Example Ventures on March 3, 2026.",
+    "Deliveries start in Q3 2026 from its plant in Cluj-Napoca, Romania.",
+    "\"Orbit Pro is the robot our customers asked for,\" said Jane Doe.",
+    "Jane Doe, CEO of Acme Robotics, founded the company in 2019.",
+    "CTO Mihai Popescu leads a team of 40 engineers across Central Europe.",
+]
+FILLER = ("The team worked with operators to refine navigation, safety and battery life "
+          "so the fleet can run through full shifts without manual intervention.")
+
+
+def brief_body(rng, words):
+    sentences = list(FACT_SENTENCES)
+    while sum(len(s.split()) for s in sentences) < words:
+        sentences.insert(rng.randint(1, len(sentences)), FILLER)
+    paragraphs = [' '.join(sentences[i:i + 3]) for i in range(0, len(sentences), 3)]
+    return '\n\n'.join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--quick', action='store_true', help='Fewer samples per case')
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    repeat, number = (3, 50) if args.quick else (7, 200)
+    results = []
+    for label, words in [("short (80 words)", 80), ("typical (250 words)", 250), ("long (1500 words)", 1500)]:
+        brief = Brief(brief_body(rng, words))
+        analysis = analyze_content(brief.body)
+        cases = [("analyze_content", lambda: analyze_content(brief.body))]
+        cases += [(f"generate {outlet}", lambda fn=fn: fn(brief, analysis)) for outlet, fn in STYLE_GENERATORS.items()]
+        cases.append(("full fallback (6 outlets)",
+                      lambda: [generate_release(brief, outlet, analyze_content(brief.body) if i == 0 else analysis)
+                               for i, outlet in enumerate(STYLE_GENERATORS)]))
+        for name, fn in cases:
+            timing = measure(fn, repeat=repeat, number=number)
+            releases = len(STYLE_GENERATORS) if name.startswith("full") else 1
+            results.append({
+                "brief": label,
+                "case": name,
+                "median_ms": timing["median_ms"],
+                "per_sec": round(releases * 1000 / timing["median_ms"]) if timing["median_ms"] else None,
+                **{k: v for k, v in timing.items() if k != "median_ms"}
+            })
+
+    print("🏭 Local press release engine (median per call; per_sec counts releases, or analyses)")
+    print_table(results, ["brief", "case", "median_ms", "per_sec"])
+    write_results("local_engine", results, args.json)
+
+
+if __name__ == '__main__':
+    main()
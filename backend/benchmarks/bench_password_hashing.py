@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Login throughput at different password hashing costs
+Runs concurrent check_password calls through the hashing pool, the way a burst of
+logins hits the web workers, and reports logins/second and latency percentiles.
+
+Usage: python benchmarks/bench_password_hashing.py [--logins 64] [--concurrency 8] [--json out.json]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import percentile, print_table, write_results
+
+import password_hashing
+from password_hashing import hash_password, verify_password
+
+COST_SETTINGS = [
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:300000",
+    "pbkdf2:sha256:600000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+]
+
+
+def bench_method(method, logins, concurrency):
+    """Hash once, then verify `logins` times from `concurrency` request threads"""
+    pwhash = hash_password("correct horse battery staple", method=method)
+    latencies = []
+
+    def login():
+        start = time.perf_counter()
+        assert verify_password(pwhash, "correct horse battery staple")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as request_threads:
+        for _ in range(logins):
+            request_threads.submit(login)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "method": method,
+        "logins": logins,
+        "concurrency": concurrency,
+        "pool_workers": password_hashing.PASSWORD_HASH_WORKERS,
+        "logins_per_sec": round(logins / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--methods', nargs='*', default=COST_SETTINGS)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    print(f"🔑 Password hashing benchmark ({password_hashing.PASSWORD_HASH_EXECUTOR} pool, "
+          f"{password_hashing.PASSWORD_HASH_WORKERS} workers)")
+    results = [bench_method(method, args.logins, args.concurrency) for method in args.methods]
+    print_table(results, ["method", "logins_per_sec", "p50_ms", "p95_ms", "p99_ms"])
+    write_results("password_hashing", results, args.json)
+
+
+if __name__ == '__main__':
+    main()
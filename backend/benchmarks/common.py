@@ -0,0 +1,115 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmarks import backend modules (models, app, agent) by their top-level names
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(fn, repeat=5, number=1, warmup=1):
+    """
+    Time fn() and return per-call statistics in milliseconds
+
+    Args:
+        repeat: Number of timed samples
+        number: Calls per sample (the sample time is divided by this)
+        warmup: Untimed calls before sampling
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+    return {
+        "mean_ms": round(statistics.mean(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(min(samples), 4),
+        "max_ms": round(max(samples), 4),
+        "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+        "number": number
+    }
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned text table"""
+    widths = {col: max(len(col), *(len(str(row.get(col, ''))) for row in rows)) for col in columns}
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    print("  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        print("  ".join(str(row.get(col, '')).ljust(widths[col]) for col in columns))
+
+
+def write_results(name, results, path=None):
+    """Write machine-readable results with environment metadata; returns the document"""
+    document = {
+        "benchmark": name,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+    if path:
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"📄 Results written to {path}")
+    return document
+
+
+def load_results(path):
+    """Read a document written by write_results"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results, baseline_results, key_fields, metric="median_ms", threshold=0.15):
+    """
+    Compare result rows with a stored baseline, matched on key_fields
+
+    Returns:
+        list: One row per current result with baseline, change_pct and a status of
+              "ok", "regression" (slower than threshold), "improved" or "new"
+    """
+    def key(row):
+        return tuple(row.get(field) for field in key_fields)
+
+    baseline = {key(row): row for row in baseline_results}
+    rows = []
+    for row in results:
+        entry = {field: row.get(field) for field in key_fields}
+        entry[metric] = row[metric]
+        previous = baseline.get(key(row))
+        if previous is None or not previous.get(metric):
+            entry.update({"baseline": None, "change_pct": None, "status": "new"})
+        else:
+            change = (row[metric] - previous[metric]) / previous[metric]
+            entry.update({
+                "baseline": previous[metric],
+                "change_pct": round(change * 100, 1),
+                "status": "regression" if change > threshold else "improved" if change < -threshold else "ok"
+            })
+        rows.append(entry)
+    return rows
@@ -0,0 +1,323 @@
+"""
+Near-duplicate brief detection for PR-Connect
+MinHash signatures over word shingles, bucketed with LSH bands, so that briefs which are
+small edits of earlier ones can reuse past generations instead of calling the agent again
+"""
+
+import atexit
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+
+# Signature size and banding: 16 bands of 4 rows puts the LSH "knee" around
+# Jaccard 0.5, well below the reuse threshold, so true near-duplicates are not missed
+NUM_PERM = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+SIGNATURE_SEED = 1337
+
+SIMILARITY_THRESHOLD = float(os.environ.get('BRIEF_SIMILARITY_THRESHOLD', 0.8))
+SNAPSHOT_PATH = os.environ.get('BRIEF_INDEX_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'brief_index.json'))
+SNAPSHOT_EVERY = int(os.environ.get('BRIEF_INDEX_SNAPSHOT_EVERY', 50))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def brief_text(title, body):
+    """Text that identifies a brief for similarity purposes"""
+    return f"{title or ''}\n{body or ''}"
+
+
+def shingles(text):
+    """Hashed word n-grams of a normalized text"""
+    words = _WORD_PATTERN.findall((text or '').lower())
+    if not words:
+        return set()
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))}
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+class BriefIndex:
+    """In-memory MinHash/LSH index of past briefs, grouped per user"""
+
+    def __init__(self, num_perm=NUM_PERM, num_bands=NUM_BANDS, threshold=SIMILARITY_THRESHOLD):
+        if num_perm % num_bands:
+            raise ValueError("num_perm must be a multiple of num_bands")
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows_per_band = num_perm // num_bands
+        self.threshold = threshold
+
+        rng = random.Random(SIGNATURE_SEED)
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._lock = threading.RLock()
+        # Identical briefs from one user collapse into a single entry holding all
+        # request ids (one per outlet and per repeated generation)
+        self._entries = {}        # entry_key -> {"user_id", "signature", "request_ids"}
+        self._request_entries = {}  # request_id -> entry_key
+        self._buckets = [dict() for _ in range(num_bands)]
+        # Highest request id read from the database by catch_up_from_database. Only catch-up
+        # advances it: this worker's own new requests can have higher ids than requests other
+        # workers stored but this one hasn't read yet
+        self.db_watermark = 0
+        self._dirty = 0
+
+        self._lookups = 0
+        self._hits = 0
+        self._reuses = 0
+        self._latencies = deque(maxlen=1000)
+
+    def signature(self, text):
+        """MinHash signature of a text"""
+        hashed = shingles(text)
+        if not hashed:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+            for a, b in self._permutations
+        )
+
+    def _band_keys(self, signature):
+        rows = self.rows_per_band
+        return [hash(signature[i * rows:(i + 1) * rows]) for i in range(self.num_bands)]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def add(self, request_ids, user_id, text=None, signature=None):
+        """Index the requests created from one brief"""
+        if signature is None:
+            signature = self.signature(text)
+        entry_key = (user_id, signature)
+
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                entry = {"user_id": user_id, "signature": signature, "request_ids": []}
+                self._entries[entry_key] = entry
+                for band, band_key in enumerate(self._band_keys(signature)):
+                    self._buckets[band].setdefault(band_key, set()).add(entry_key)
+            for request_id in request_ids:
+                if request_id in self._request_entries:
+                    continue
+                entry["request_ids"].append(request_id)
+                self._request_entries[request_id] = entry_key
+            self._dirty += 1
+
+    def remove(self, request_id):
+        """Forget a deleted request, dropping its entry once it has no requests left"""
+        with self._lock:
+            entry_key = self._request_entries.pop(request_id, None)
+            if entry_key is None:
+                return
+            entry = self._entries[entry_key]
+            entry["request_ids"].remove(request_id)
+            if not entry["request_ids"]:
+                del self._entries[entry_key]
+                for band, band_key in enumerate(self._band_keys(entry["signature"])):
+                    bucket = self._buckets[band].get(band_key)
+                    if bucket:
+                        bucket.discard(entry_key)
+                        if not bucket:
+                            del self._buckets[band][band_key]
+            self._dirty += 1
+
+    def is_indexed(self, request_id):
+        with self._lock:
+            return request_id in self._request_entries
+
+    def advance_watermark(self, request_id):
+        with self._lock:
+            self.db_watermark = max(self.db_watermark, request_id)
+
+    def group_for(self, request_id):
+        """All request ids indexed under the same brief as request_id"""
+        with self._lock:
+            entry_key = self._request_entries.get(request_id)
+            if entry_key is None:
+                return [request_id]
+            return sorted(self._entries[entry_key]["request_ids"])
+
+    def query(self, text, user_id=None, threshold=None, limit=5):
+        """
+        Find earlier briefs similar to the given text
+
+        Returns:
+            list: {"request_ids", "similarity"} dicts, most similar first
+        """
+        threshold = self.threshold if threshold is None else threshold
+        start = time.perf_counter()
+        signature = self.signature(text)
+
+        with self._lock:
+            candidates = set()
+            for band, band_key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(band_key, ()))
+
+            matches = []
+            for entry_key in candidates:
+                entry = self._entries[entry_key]
+                if user_id is not None and entry["user_id"] != user_id:
+                    continue
+                score = self.similarity(signature, entry["signature"])
+                if score >= threshold:
+                    matches.append({
+                        "request_ids": sorted(entry["request_ids"]),
+                        "similarity": round(score, 3)
+                    })
+
+            matches.sort(key=lambda m: (m["similarity"], m["request_ids"][-1]), reverse=True)
+            self._lookups += 1
+            if matches:
+                self._hits += 1
+            self._latencies.append(time.perf_counter() - start)
+
+        return matches[:limit]
+
+    def record_reuse(self):
+        """Count a generation served from a previous brief"""
+        with self._lock:
+            self._reuses += 1
+
+    def stats(self):
+        """Index size, hit rate and lookup latency"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            lookups = self._lookups
+            return {
+                "entries": len(self._entries),
+                "requests_indexed": len(self._request_entries),
+                "db_watermark": self.db_watermark,
+                "threshold": self.threshold,
+                "lookups": lookups,
+                "hits": self._hits,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "reuses": self._reuses,
+                "avg_lookup_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                "p95_lookup_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3) if latencies else 0.0
+            }
+
+    def save_snapshot(self, path=SNAPSHOT_PATH):
+        """Persist the index to disk (atomic replace)"""
+        with self._lock:
+            data = {
+                "num_perm": self.num_perm,
+                "num_bands": self.num_bands,
+                "seed": SIGNATURE_SEED,
+                "db_watermark": self.db_watermark,
+                "entries": [
+                    [entry["user_id"], list(entry["signature"]), entry["request_ids"]]
+                    for entry in self._entries.values()
+                ]
+            }
+            self._dirty = 0
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path=SNAPSHOT_PATH):
+        """Load a snapshot written by save_snapshot; returns False if missing or incompatible"""
+        if not os.path.exists(path):
+            return False
+        with open(path) as f:
+            data = json.load(f)
+        if (data.get("num_perm"), data.get("num_bands"), data.get("seed")) != (self.num_perm, self.num_bands, SIGNATURE_SEED):
+            return False
+        for user_id, signature, request_ids in data.get("entries", []):
+            self.add(request_ids, user_id, signature=tuple(signature))
+        with self._lock:
+            # Snapshots from before the watermark was split out may be past rows never read: re-scan those
+            self.db_watermark = max(self.db_watermark, data.get("db_watermark", 0))
+            self._dirty = 0
+        return True
+
+    def maybe_save_snapshot(self, path=SNAPSHOT_PATH):
+        """Save the snapshot once enough changes have accumulated"""
+        if self._dirty >= SNAPSHOT_EVERY:
+            self.save_snapshot(path)
+
+
+def catch_up_from_database(index, batch_size=1000):
+    """
+    Index requests stored after the index's db_watermark (requires an app context)
+    Cheap when nothing is new: a single primary-key range query. Other web workers'
+    writes are picked up here on the next lookup; this worker's own requests, already
+    added when they were stored, are skipped.
+    """
+    from models import Request
+
+    added = 0
+    while True:
+        rows = Request.query.with_entities(Request.id, Request.user_id, Request.title, Request.body)\
+                            .filter(Request.id > index.db_watermark)\
+                            .order_by(Request.id)\
+                            .limit(batch_size).all()
+        if not rows:
+            break
+        # One generation stores one request per outlet with the same brief
+        group_ids, group_key = [], None
+        for request_id, user_id, title, body in rows:
+            key = (user_id, title, body)
+            if key != group_key and group_ids:
+                index.add(group_ids, group_key[0], brief_text(group_key[1], group_key[2]))
+                group_ids = []
+            if not index.is_indexed(request_id):
+                group_ids.append(request_id)
+                added += 1
+            group_key = key
+        if group_ids:
+            index.add(group_ids, group_key[0], brief_text(group_key[1], group_key[2]))
+        index.advance_watermark(rows[-1][0])
+    return added
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_brief_index():
+    """Shared index: loaded from the snapshot on first use, then caught up from the database"""
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            index = BriefIndex()
+            try:
+                if index.load_snapshot():
+                    print(f"🧬 Loaded brief index snapshot ({index.stats()['requests_indexed']} requests)")
+            except Exception as e:
+                print(f"⚠️ Could not load brief index snapshot: {e}")
+            added = catch_up_from_database(index)
+            if added:
+                print(f"🧬 Indexed {added} requests stored since the last snapshot")
+                index.save_snapshot()
+            atexit.register(_save_on_exit, index)
+            _index = index
+    return _index
+
+
+def _save_on_exit(index):
+    try:
+        if index._dirty:
+            index.save_snapshot()
+    except Exception as e:
+        print(f"⚠️ Could not save brief index snapshot: {e}")
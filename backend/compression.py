@@ -0,0 +1,120 @@
+"""
+HTTP response compression for PR-Connect
+Negotiates gzip (and brotli when the package is installed) from Accept-Encoding and
+compresses large JSON/text responses, including streamed NDJSON/CSV/SSE bodies
+"""
+
+import gzip
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+RESPONSE_COMPRESSION = os.environ.get('RESPONSE_COMPRESSION', 'true').lower() in ('1', 'true', 'yes')
+# Below this many bytes the header overhead and CPU time outweigh the savings
+COMPRESSION_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', 6))
+# Brotli's top qualities are far too slow for dynamic responses
+BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', 5))
+
+COMPRESSIBLE_MIMETYPES = frozenset([
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/csv',
+    'text/event-stream',
+    'text/html',
+    'text/plain',
+])
+
+
+def supported_encodings():
+    """Encodings this process can produce, most preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts (respecting q-values), or None"""
+    for encoding in supported_encodings():
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress_body(data, encoding):
+    """Compress a complete body"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compress a streamed body chunk by chunk, flushing so clients see each record promptly"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _add_vary(response):
+    if 'accept-encoding' not in {value.lower() for value in response.vary}:
+        response.vary.add('Accept-Encoding')
+
+
+def compress_response(response):
+    """after_request hook: compress the response body when worthwhile"""
+    if not RESPONSE_COMPRESSION or request.method == 'HEAD':
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers:
+        return response
+
+    _add_vary(response)
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        # Passthrough file wrappers are left alone; generators are compressed lazily
+        if response.direct_passthrough:
+            return response
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(compress_body(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    # A compressed body is a different representation, so it needs its own strong ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
+
+
+def init_compression(app):
+    """Register response compression on a Flask app"""
+    app.after_request(compress_response)
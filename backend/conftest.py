@@ -0,0 +1,61 @@
+"""
+Shared pytest fixtures for the backend tests
+app: a Flask app bound to a fresh SQLite database with every table created (inside its context)
+statements: the SQL statements the app's engine runs during a test
+backend: the web app module (app.py), imported once against a temp SQLite database
+backend_app: the web app with every table created and an empty brief index (inside its context)
+"""
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from models import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def statements(app):
+    captured = []
+    listener = lambda conn, cursor, statement, *args: captured.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    yield captured
+    event.remove(db.engine, 'before_cursor_execute', listener)
+
+
+@pytest.fixture(scope='session')
+def backend(tmp_path_factory):
+    # app.py reads its settings at import; the environment is restored right after, so
+    # later tests and the subprocesses they start never see these values
+    workdir = tmp_path_factory.mktemp('backend')
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('DATABASE_URL', f"sqlite:///{workdir / 'app.db'}")
+        env.setenv('BRIEF_INDEX_PATH', str(workdir / 'brief_index.json'))
+        env.delenv('DATABASE_REPLICA_URL', raising=False)
+        import app as backend_module
+    return backend_module
+
+
+@pytest.fixture
+def backend_app(backend, monkeypatch):
+    import brief_index
+    from outlet_catalog import outlet_catalog
+
+    monkeypatch.setattr(brief_index, '_index', brief_index.BriefIndex())
+    with backend.app.app_context():
+        db.create_all(bind_key=None)
+        outlet_catalog.invalidate()
+        yield backend.app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+        outlet_catalog.invalidate()
@@ -0,0 +1,157 @@
+"""
+Cleanup of LLM output for PR-Connect
+One cleaner for the agent and the backend. It removes the \\boxed{...} and ```markdown
+wrappers, drops code fence lines, decodes literal \\uXXXX escapes and \\n sequences, trims
+trailing spaces and collapses runs of blank lines. After the O(1) wrapper checks, each step
+is one linear pass (str methods or a precompiled pattern); nothing rescans the text in a loop.
+StreamingCleaner gives the same result for text that arrives in chunks.
+"""
+
+import re
+
+BOXED_OPENER = '\\boxed{'
+WRAPPER_PREFIX_LENGTH = len(BOXED_OPENER + 'markdown')
+
+# \\ pairs are matched (and kept) so an escaped backslash never starts an escape, which
+# is how the raw_unicode_escape codec used for ASCII text reads them too
+_ESCAPE = re.compile(r'\\(?:(\\)|u([0-9a-fA-F]{4})|U([0-9a-fA-F]{8}))')
+_SURROGATE = re.compile('[\ud800-\udfff]')
+_FENCE_LINE = re.compile(r'[ \t]*```[\w+-]*')
+_BLANK_RUN = re.compile(r'\n\n\n+')
+
+
+def _decode_escape(match):
+    if match.group(1):
+        return match.group(0)
+    code = int(match.group(2) or match.group(3), 16)
+    return chr(code) if code <= 0x10FFFF else match.group(0)
+
+
+def _join_surrogates(text):
+    """
+    Combine surrogate pairs (emoji escaped as two JSON-style \\uXXXX halves) into one
+    character and replace unpaired halves with U+FFFD, so the text encodes as UTF-8
+    """
+    if not _SURROGATE.search(text):
+        return text
+    return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
+
+def _decode_escapes(text):
+    """Decode literal \\uXXXX / \\UXXXXXXXX escapes"""
+    if text.isascii():
+        try:
+            return _join_surrogates(text.encode('ascii').decode('raw_unicode_escape'))
+        except UnicodeDecodeError:
+            pass  # A malformed escape; the pattern leaves those as they are
+    return _join_surrogates(_ESCAPE.sub(_decode_escape, text))
+
+
+def _clean_lines(text):
+    """Lines of text with escapes decoded, trailing whitespace trimmed and fence lines blanked"""
+    if '\\' in text:
+        text = text.replace('\\n', '\n').replace(BOXED_OPENER, '')
+        if '\\u' in text or '\\U' in text:
+            text = _decode_escapes(text)
+    lines = [line.rstrip() for line in text.split('\n')]
+    if '```' in text:
+        lines = ['' if _FENCE_LINE.fullmatch(line) else line for line in lines]
+    return lines
+
+
+def _strip_leading_wrapper(text):
+    """(text without a leading \\boxed{ / \\boxed{markdown opener, whether one was removed)"""
+    text = text.lstrip()
+    if text.startswith(BOXED_OPENER):
+        text = text[len(BOXED_OPENER):]
+        if text.startswith('markdown'):
+            text = text[len('markdown'):]
+        return text, True
+    return text, False
+
+
+def _strip_trailing_wrapper(text, boxed):
+    """Drop the closing brace of a \\boxed{ wrapper (only that brace; others are content)"""
+    text = text.rstrip()
+    if boxed and text.endswith('}'):
+        text = text[:-1]
+    return text
+
+
+def clean_content(content):
+    """Clean a complete LLM response"""
+    if not content:
+        return content
+    text, boxed = _strip_leading_wrapper(content)
+    text = _strip_trailing_wrapper(text, boxed)
+    return _BLANK_RUN.sub('\n\n', '\n'.join(_clean_lines(text))).strip()
+
+
+def _last_line_break(text, start=0):
+    """Index of the last real or literal line break in text[start:], or -1"""
+    return max(text.rfind('\n', start), text.rfind('\\n', start))
+
+
+class StreamingCleaner:
+    """
+    Incremental clean_content: feed() chunks as they arrive and emit what it returns,
+    then emit finish(). The concatenated output equals clean_content(''.join(chunks)).
+
+    Text is released a complete line at a time; blank lines are only written out once the
+    next line with content arrives, so runs collapse the same way as in clean_content.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._started = False
+        self._boxed = False
+        self._emitted = False
+        self._blank = False
+        # Everything before this offset of _pending is known to hold no line break
+        self._scanned = 0
+
+    def _emit(self, text):
+        out = []
+        for line in _clean_lines(text):
+            if not line:
+                self._blank = True
+                continue
+            if self._emitted:
+                out.append(('\n\n' if self._blank else '\n') + line)
+            else:
+                out.append(line.lstrip())
+                self._emitted = True
+            self._blank = False
+        return ''.join(out)
+
+    def feed(self, chunk):
+        self._pending += chunk
+        if not self._started:
+            # The wrapper check needs the start of the first line
+            first = self._pending.lstrip()
+            if len(first) < WRAPPER_PREFIX_LENGTH and _last_line_break(first) < 0:
+                return ''
+            self._pending, self._boxed = _strip_leading_wrapper(self._pending)
+            self._started = True
+
+        # With a \\boxed{ wrapper the closing brace sits on the last line with content;
+        # hold that line back until finish()
+        text = self._pending.rstrip() if self._boxed else self._pending
+        cut = _last_line_break(text, self._scanned)
+        if cut < 0:
+            # A literal \\n may straddle the next chunk boundary
+            self._scanned = max(0, len(text) - 1)
+            return ''
+        head = self._pending[:cut]
+        self._pending = self._pending[cut + (2 if text.startswith('\\n', cut) else 1):]
+        self._scanned = 0
+        return self._emit(head)
+
+    def finish(self):
+        """Emit the remaining text with the closing wrapper removed"""
+        text = self._pending
+        self._pending = ''
+        if not self._started:
+            text, self._boxed = _strip_leading_wrapper(text)
+            self._started = True
+        return self._emit(_strip_trailing_wrapper(text, self._boxed))
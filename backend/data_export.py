@@ -0,0 +1,187 @@
+"""
+Admin data export for PR-Connect
+Streams requests with their responses in bounded batches from a server-side cursor,
+so memory use stays constant regardless of table size. The same batch loader backs
+the paginated admin request list.
+"""
+
+import csv
+import io
+import os
+from datetime import datetime, timedelta
+
+from json_provider import dumps
+from models import db, NewsOutlet, Request, Response, User
+
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 500))
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+CSV_COLUMNS = [
+    'request_id', 'created_at', 'user_id', 'user_email', 'company_name', 'category',
+    'newspaper', 'title', 'body', 'response_id', 'response_tone', 'response_word_count', 'response_body'
+]
+
+def _parse_date(value, end_of_range=False):
+    """Parse an ISO date or datetime; a bare end date includes the whole day"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_range and len(value) <= 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def parse_export_filters(args):
+    """
+    Read filters from request args
+    Supported: start, end (ISO dates), user_id, outlet (name) or outlet_id.
+    Raises ValueError on malformed values.
+    """
+    filters = {
+        "start": _parse_date(args.get('start')),
+        "end": _parse_date(args.get('end'), end_of_range=True),
+        "user_id": int(args['user_id']) if args.get('user_id') else None,
+        "outlet_id": int(args['outlet_id']) if args.get('outlet_id') else None,
+        "outlet": args.get('outlet') or None
+    }
+    return filters
+
+def _request_rows_query(filters, before_id=None):
+    """Column-only select of requests with their user and outlet (no ORM identity map)"""
+    query = db.select(
+        Request.id, Request.title, Request.body, Request.company_name, Request.category,
+        Request.contact_info, Request.additional_notes, Request.created_at,
+        Request.user_id, Request.news_outlet_id,
+        User.full_name.label('user_full_name'), User.email.label('user_email'),
+        User.company_name.label('user_company_name'),
+        NewsOutlet.name.label('outlet_name')
+    ).outerjoin(User, Request.user_id == User.id)\
+     .outerjoin(NewsOutlet, Request.news_outlet_id == NewsOutlet.id)
+
+    if filters.get("start"):
+        query = query.where(Request.created_at >= filters["start"])
+    if filters.get("end"):
+        query = query.where(Request.created_at < filters["end"])
+    if filters.get("user_id") is not None:
+        query = query.where(Request.user_id == filters["user_id"])
+    if filters.get("outlet_id") is not None:
+        query = query.where(Request.news_outlet_id == filters["outlet_id"])
+    if filters.get("outlet"):
+        query = query.where(NewsOutlet.name == filters["outlet"])
+    if before_id is not None:
+        query = query.where(Request.id < before_id)
+
+    return query.order_by(Request.id.desc())
+
+def count_requests(filters):
+    """Number of requests matching the filters"""
+    query = db.select(db.func.count()).select_from(
+        _request_rows_query(filters).order_by(None).subquery()
+    )
+    return db.session.execute(query).scalar() or 0
+
+def _load_responses(request_ids):
+    """Responses for one batch of requests, grouped by request id"""
+    grouped = {request_id: [] for request_id in request_ids}
+    if not request_ids:
+        return grouped
+    rows = db.session.execute(
+        db.select(Response.id, Response.body, Response.request_id, Response.tone,
+                  Response.word_count, Response.created_at)
+          .where(Response.request_id.in_(request_ids))
+          .order_by(Response.id)
+    )
+    for row in rows:
+        grouped[row.request_id].append({
+            'id': row.id,
+            'body': row.body,
+            'request_id': row.request_id,
+            'tone': row.tone,
+            'word_count': row.word_count,
+            'created_at': row.created_at  # Encoded to ISO 8601 by the JSON provider
+        })
+    return grouped
+
+def _build_records(rows):
+    """Turn a batch of request rows into export records with responses attached"""
+    responses = _load_responses([row.id for row in rows])
+    records = []
+    for row in rows:
+        request_responses = responses[row.id]
+        records.append({
+            'id': row.id,
+            'title': row.title,
+            'body': row.body,
+            'news_outlet_id': row.news_outlet_id,
+            'user_id': row.user_id,
+            'company_name': row.company_name,
+            'category': row.category,
+            'contact_info': row.contact_info,
+            'additional_notes': row.additional_notes,
+            'created_at': row.created_at,
+            'news_outlet': {'id': row.news_outlet_id, 'name': row.outlet_name} if row.outlet_name else None,
+            'user': {
+                'id': row.user_id,
+                'full_name': row.user_full_name,
+                'email': row.user_email,
+                'company_name': row.user_company_name
+            } if row.user_email else None,
+            'newspaper': row.outlet_name or 'Unknown',
+            'response_count': len(request_responses),
+            'responses': request_responses
+        })
+    return records
+
+def iter_request_batches(filters, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of export records, streaming from a server-side cursor"""
+    result = db.session.execute(
+        _request_rows_query(filters).execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        yield _build_records(rows)
+
+def fetch_request_page(filters, limit=DEFAULT_PAGE_SIZE, before_id=None):
+    """
+    One page of export records, newest first, using keyset pagination
+
+    Returns:
+        tuple: (records, next_cursor) - next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = db.session.execute(_request_rows_query(filters, before_id).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = rows[-1].id if has_more and rows else None
+    return _build_records(rows), next_cursor
+
+def iter_ndjson(filters, batch_size=EXPORT_BATCH_SIZE):
+    """Newline-delimited JSON, one request (with responses) per line"""
+    for records in iter_request_batches(filters, batch_size):
+        yield ''.join(dumps(record) + '\n' for record in records)
+
+def _isoformat(value):
+    return value.isoformat() if value else ''
+
+def iter_csv(filters, batch_size=EXPORT_BATCH_SIZE):
+    """CSV with one row per response (requests without responses get one empty-response row)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+
+    for records in iter_request_batches(filters, batch_size):
+        buffer.seek(0)
+        buffer.truncate(0)
+        for record in records:
+            base = [
+                record['id'], _isoformat(record['created_at']), record['user_id'],
+                record['user']['email'] if record['user'] else '',
+                record['company_name'], record['category'], record['newspaper'],
+                record['title'], record['body']
+            ]
+            for response in record['responses'] or [None]:
+                if response:
+                    writer.writerow(base + [response['id'], response['tone'], response['word_count'], response['body']])
+                else:
+                    writer.writerow(base + ['', '', '', ''])
+        yield buffer.getvalue()
@@ -0,0 +1,167 @@
+"""
+Database connection pooling for PR-Connect
+Builds SQLAlchemy engine options from the environment (pool size, overflow, recycle,
+pre-ping, PgBouncer mode) and records pool checkouts, wait time and connection churn
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool, QueuePool
+
+# "queue": SQLAlchemy keeps its own pool of server connections (default)
+# "pgbouncer": PgBouncer in transaction mode does the pooling; hold no idle
+#              connections here so a worker never pins a server connection
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'queue').lower()
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+# Render's Postgres drops idle connections; recycle well before that happens
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 300))
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+
+
+class PoolMetrics:
+    """Thread-safe counters for one engine's pool"""
+
+    def __init__(self, max_samples=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=max_samples)
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        # All-time totals; _waits only keeps the recent samples used for p95
+        self.wait_count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self._waits.append(seconds)
+            self.wait_count += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                # Connections opened per checkout; close to 0 means the pool is reused well
+                "churn_ratio": round(self.connects / self.checkouts, 4) if self.checkouts else 0.0,
+                "avg_wait_ms": round(self.total_wait / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 3) if waits else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3)
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait for a connection"""
+
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+pool_metrics = PoolMetrics()
+
+
+def engine_options(database_url):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured pool mode"""
+    if not database_url or database_url.startswith('sqlite'):
+        # SQLite picks its own pool class per database type
+        return {}
+
+    options = {"connect_args": {"connect_timeout": DB_CONNECT_TIMEOUT}}
+    if DB_POOL_MODE == 'pgbouncer':
+        # PgBouncer already multiplexes server connections; a client-side pool would
+        # hold them across transactions. psycopg2 never uses server-side prepared
+        # statements, so nothing else needs to change for transaction pooling.
+        options["poolclass"] = NullPool
+        return options
+
+    options.update({
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_use_lifo": True  # Keep the hot connections busy so idle ones can expire
+    })
+    options["connect_args"].update({
+        # Detect connections the network silently dropped
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 3
+    })
+    return options
+
+
+def instrument_engine(engine, metrics=pool_metrics):
+    """Attach pool event listeners that feed the metrics"""
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    event.listen(engine, 'connect', lambda *args: metrics.increment('connects'))
+    event.listen(engine, 'close', lambda *args: metrics.increment('closes'))
+    event.listen(engine, 'checkout', lambda *args: metrics.increment('checkouts'))
+    event.listen(engine, 'checkin', lambda *args: metrics.increment('checkins'))
+    event.listen(engine, 'invalidate', lambda *args: metrics.increment('invalidations'))
+    return engine
+
+
+def pool_status(engine, metrics=pool_metrics):
+    """Current pool configuration, occupancy and counters"""
+    pool = engine.pool
+    status = {
+        "mode": DB_POOL_MODE if not engine.url.drivername.startswith('sqlite') else 'sqlite',
+        "pool_class": type(pool).__name__,
+        "pre_ping": bool(getattr(pool, '_pre_ping', False)),
+        "recycle_seconds": getattr(pool, '_recycle', -1)
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        })
+    status["metrics"] = metrics.snapshot()
+    return status
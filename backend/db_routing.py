@@ -0,0 +1,112 @@
+"""
+Read-replica routing for PR-Connect
+Routes plain SELECTs issued by read-only endpoints to an optional replica database,
+while writes, locking reads and users who just wrote stay on the primary
+"""
+
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND_KEY = 'replica'
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+# How long a user's reads stay on the primary after they write (covers replica lag)
+READ_YOUR_WRITES_SECONDS = float(os.environ.get('READ_YOUR_WRITES_SECONDS', 10))
+
+# user_id -> monotonic time until which that user reads from the primary.
+# Per process: a write seen by another worker is covered by that worker only,
+# so keep the window comfortably above the replica's typical lag.
+_recent_writers = {}
+_recent_writers_lock = threading.Lock()
+
+
+def replica_binds(replica_url, engine_options=None):
+    """SQLALCHEMY_BINDS entry for the replica, or {} when none is configured"""
+    if not replica_url:
+        return {}
+    return {REPLICA_BIND_KEY: {"url": replica_url, **(engine_options or {})}}
+
+
+def mark_recent_write(user_id, now=None):
+    """Pin a user's reads to the primary for the read-your-writes window"""
+    now = time.monotonic() if now is None else now
+    with _recent_writers_lock:
+        _recent_writers[user_id] = now + READ_YOUR_WRITES_SECONDS
+        # Prune opportunistically so the map stays bounded by active writers
+        if len(_recent_writers) > 1024:
+            for stale in [uid for uid, until in _recent_writers.items() if until <= now]:
+                del _recent_writers[stale]
+
+
+def wrote_recently(user_id, now=None):
+    """True while a user is inside their read-your-writes window"""
+    now = time.monotonic() if now is None else now
+    with _recent_writers_lock:
+        until = _recent_writers.get(user_id)
+        return until is not None and until > now
+
+
+def _current_user_id():
+    if not has_request_context():
+        return None
+    current_user = getattr(request, 'current_user', None)
+    return current_user.get('user_id') if current_user else None
+
+
+def read_replica(f):
+    """
+    Route decorator: serve this endpoint's reads from the replica
+    Place below @require_auth / @require_admin so the user is known.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user_id = _current_user_id()
+        g.use_read_replica = user_id is None or not wrote_recently(user_id)
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends replica-safe reads to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if not has_app_context() or not g.get('use_read_replica'):
+            return False
+        # Anything this transaction wrote is only visible on the primary
+        if self._flushing or self.info.get('wrote'):
+            return False
+        if clause is None or not getattr(clause, 'is_select', False):
+            return False
+        if getattr(clause, '_for_update_arg', None) is not None:
+            return False
+        return REPLICA_BIND_KEY in self._db.engines
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_wrote(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_writer(session):
+    if session.info.get('wrote'):
+        user_id = _current_user_id()
+        if user_id is not None:
+            mark_recent_write(user_id)
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _reset_session_wrote(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('wrote', None)
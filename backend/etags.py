@@ -0,0 +1,125 @@
+"""
+Conditional GET support for PR-Connect
+Strong ETags computed from cheap data versions (counts, max ids, stored stats), so a
+poll that finds nothing changed gets a 304 without loading or serializing the data
+"""
+
+import hashlib
+import os
+from functools import wraps
+
+from flask import make_response, request
+
+from models import db, Request, Response, Transcript, User
+from outlet_catalog import outlet_catalog
+
+# Static catalog endpoints (outlets, categories) may be cached by browsers and CDNs
+CATALOG_MAX_AGE = int(os.environ.get('CATALOG_MAX_AGE', 300))
+CATALOG_CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}"
+# Per-user data: cache privately, but always revalidate with If-None-Match
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    """Strong ETag value (unquoted) from any reprs"""
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return digest[:32]
+
+
+def request_history_version(user_id):
+    """Changes whenever a user's requests, their responses or their profile change"""
+    requests_version = db.session.execute(
+        db.select(db.func.count(Request.id), db.func.max(Request.id))
+          .where(Request.user_id == user_id)
+    ).one()
+    responses_version = db.session.execute(
+        db.select(db.func.count(Response.id), db.func.max(Response.id))
+          .join(Request, Response.request_id == Request.id)
+          .where(Request.user_id == user_id)
+    ).one()
+    # Each request embeds the user's profile
+    updated_at = db.session.execute(
+        db.select(User.updated_at).where(User.id == user_id)
+    ).scalar()
+    return tuple(requests_version), tuple(responses_version), updated_at
+
+
+def transcript_list_version(user_id):
+    """Changes whenever a transcript summary (count, word count, preview) changes"""
+    return tuple(db.session.execute(
+        db.select(
+            db.func.count(Transcript.id),
+            db.func.max(Transcript.id),
+            db.func.coalesce(db.func.sum(Transcript.word_count), 0),
+            db.func.coalesce(db.func.sum(db.func.length(Transcript.preview)), 0)
+        ).where(Transcript.user_id == user_id)
+    ).one())
+
+
+def outlet_catalog_version():
+    """Changes when outlets or their public metadata change (served from the in-memory catalog)"""
+    return outlet_catalog.version()
+
+
+def content_version(get_content):
+    """Version function for small in-process data (e.g. the category list): a digest of the content itself"""
+    return lambda: make_etag(get_content())
+
+
+def _matching_tag(etag):
+    """The If-None-Match tag that matches etag, including its compressed variants"""
+    for tag in request.if_none_match.as_set():
+        # compression appends "-gzip"/"-br" to the tag of the identity representation
+        if tag == etag or tag.startswith(f"{etag}-"):
+            return tag
+    return None
+
+
+def _is_error_payload(response):
+    """Some views report errors as 200 with success: false; never tag those"""
+    payload = response.get_json(silent=True) if response.is_json else None
+    return isinstance(payload, dict) and payload.get('success') is False
+
+
+def conditional_get(version_func=None, cache_control=PRIVATE_CACHE_CONTROL, per_user=True):
+    """
+    Route decorator: answer If-None-Match with 304 when the data version is unchanged
+
+    Args:
+        version_func: Callable returning the current data version; called with the
+                      user id when per_user is True. None means the response is static.
+        cache_control: Cache-Control header for 200 and 304 responses
+        per_user: Whether the version depends on the authenticated user (place the
+                  decorator below @require_auth)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                user_id = request.current_user['user_id'] if per_user else None
+                version = None
+                if version_func is not None:
+                    version = version_func(user_id) if per_user else version_func()
+                etag = make_etag(request.path, request.query_string, user_id, version)
+            except Exception as e:
+                # Never fail a read because the version could not be computed
+                print(f"⚠️ ETag version error for {request.path}: {e}")
+                return f(*args, **kwargs)
+
+            matched = _matching_tag(etag)
+            if matched:
+                response = make_response('', 304)
+                response.set_etag(matched)
+                response.headers['Cache-Control'] = cache_control
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or _is_error_payload(response):
+                return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,94 @@
+"""
+JSON encoding for PR-Connect API responses
+Uses orjson when it is installed (datetimes, dates and UUIDs are encoded natively)
+and falls back to the standard library with the same output conventions
+"""
+
+import dataclasses
+import decimal
+import json
+import os
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+# "auto" uses orjson when available; "stdlib" forces the standard library encoder
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto').lower()
+USE_ORJSON = orjson is not None and JSON_ENCODER != 'stdlib'
+
+
+def _default(o):
+    """Types the encoders do not handle natively (datetimes as ISO 8601, like to_dict)"""
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj, indent, ensure_ascii):
+    if indent:
+        return json.dumps(obj, default=_default, ensure_ascii=ensure_ascii, indent=2)
+    return json.dumps(obj, default=_default, ensure_ascii=ensure_ascii, separators=(',', ':'))
+
+
+def dumps_bytes(obj, indent=False):
+    """Encode obj as UTF-8 JSON bytes"""
+    if USE_ORJSON:
+        try:
+            options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(obj, default=_default, option=options)
+        except TypeError:
+            # e.g. integers beyond 64 bits or strings with lone surrogates; the stdlib
+            # encoder handles both, escaping non-ASCII the way Flask's provider did
+            return _stdlib_dumps(obj, indent, ensure_ascii=True).encode('ascii')
+    try:
+        return _stdlib_dumps(obj, indent, ensure_ascii=False).encode('utf-8')
+    except UnicodeEncodeError:
+        # A lone surrogate has no UTF-8 form; \u escapes keep the response valid
+        return _stdlib_dumps(obj, indent, ensure_ascii=True).encode('ascii')
+
+
+def dumps(obj, indent=False):
+    """Encode obj as a JSON string"""
+    return dumps_bytes(obj, indent).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by dumps_bytes; keys are not sorted"""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for specific json.dumps options get the stdlib behaviour
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if USE_ORJSON and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def init_json(app):
+    """Install the fast provider on a Flask app"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    return 'orjson' if USE_ORJSON else 'stdlib'
@@ -0,0 +1,4 @@
+"""
+PR-Connect load testing
+OpenRouter stand-in and load driver, run from the backend directory: python loadtest/<script>.py
+"""
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Load driver for the PR-Connect backend
+Signs in a pool of test users, then replays a weighted mix of the traffic the frontend
+sends (history, dashboard, catalog, transcripts, search and /generate) from concurrent
+workers. Reports throughput and p50/p95/p99 latency per endpoint, plus how many /generate
+calls were answered by the agent rather than the local fallback.
+
+Usage: python loadtest/driver.py --base-url http://localhost:5001 [--users 5] [--concurrency 10]
+                                 [--duration 60 | --requests 2000]
+                                 [--mix generate=1,history=6,dashboard=3] [--json out.json]
+Start the agent against loadtest/openrouter_stub.py first to include LLM latency.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from common import percentile, print_table, write_results
+
+# Roughly what a dashboard session looks like: mostly reads, occasional generations
+DEFAULT_MIX = "generate=1,history=6,request_detail=3,dashboard=3,outlets=2,categories=1,transcripts=2,transcript_save=1,search=1"
+OUTLETS = ["TechCrunch", "The Verge", "Forbes", "General"]
+CATEGORIES = ["Product Launch", "Funding Round", "Partnership", "Company Milestone"]
+TOPICS = ["AI platform", "mobile banking app", "battery technology", "logistics network", "health tracker"]
+
+
+class UserSession:
+    """One signed-in test user and the ids it has seen"""
+
+    def __init__(self, base_url, email, password, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.request_ids = []
+        self.transcript_ids = []
+        self._sign_in(email, password)
+
+    def _sign_in(self, email, password):
+        response = self.http.post(f"{self.base_url}/api/auth/login",
+                                  json={"email": email, "password": password}, timeout=self.timeout)
+        if response.status_code != 200:
+            response = self.http.post(f"{self.base_url}/api/auth/register", json={
+                "fullName": "Load Test", "email": email, "companyName": "Load Test Co",
+                "password": password, "confirmPassword": password
+            }, timeout=self.timeout)
+        response.raise_for_status()
+        token = response.json()["data"]["token"]
+        self.http.headers["Authorization"] = f"Bearer {token}"
+
+    def call(self, method, path, **kwargs):
+        return self.http.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+
+
+def scenario_generate(session, rng):
+    topic = rng.choice(TOPICS)
+    response = session.call("POST", "/generate", json={
+        "title": f"Load Test Co launches {topic}",
+        "body": f"Load Test Co today announced its new {topic}, available to customers in 12 markets. " * 3,
+        "company_name": "Load Test Co",
+        "target_outlets": rng.sample(OUTLETS, rng.randint(1, len(OUTLETS))),
+        "category": rng.choice(CATEGORIES),
+        "contact_info": "press@loadtest.example"
+    })
+    extra = {}
+    if response.ok:
+        extra["agent_used"] = bool(response.json().get("debug", {}).get("agent_used"))
+    return response, extra
+
+
+def scenario_history(session, rng):
+    response = session.call("GET", "/api/requests")
+    if response.ok:
+        session.request_ids = [item["id"] for item in response.json().get("data", [])][:50]
+    return response, {}
+
+
+def scenario_request_detail(session, rng):
+    if not session.request_ids:
+        response, extra = scenario_history(session, rng)
+        return response, dict(extra, endpoint="GET /api/requests")
+    return session.call("GET", f"/api/requests/{rng.choice(session.request_ids)}"), {}
+
+
+def scenario_transcripts(session, rng):
+    response = session.call("GET", "/api/transcripts")
+    if response.ok:
+        session.transcript_ids = [item["id"] for item in response.json().get("data", [])][:50]
+    return response, {}
+
+
+def scenario_transcript_save(session, rng):
+    text = ' '.join(rng.choice(TOPICS) for _ in range(rng.randint(40, 200)))
+    return session.call("POST", "/api/transcripts", json={"text": text}), {}
+
+
+SCENARIOS = {
+    "generate": ("POST /generate", scenario_generate),
+    "history": ("GET /api/requests", scenario_history),
+    "request_detail": ("GET /api/requests/<id>", scenario_request_detail),
+    "dashboard": ("GET /api/dashboard/stats", lambda s, rng: (s.call("GET", "/api/dashboard/stats"), {})),
+    "outlets": ("GET /api/outlets", lambda s, rng: (s.call("GET", "/api/outlets"), {})),
+    "categories": ("GET /api/categories", lambda s, rng: (s.call("GET", "/api/categories"), {})),
+    "transcripts": ("GET /api/transcripts", scenario_transcripts),
+    "transcript_save": ("POST /api/transcripts", scenario_transcript_save),
+    "search": ("GET /api/search", lambda s, rng: (s.call("GET", "/api/search", params={"q": rng.choice(TOPICS)}), {})),
+}
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}'. Choose from: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Recorder:
+    """Latency samples and outcomes per endpoint (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.agent_used = defaultdict(int)
+
+    def record(self, endpoint, seconds, status, extra):
+        with self._lock:
+            self.latencies[endpoint].append(seconds * 1000)
+            self.statuses[endpoint][status] += 1
+            if status == 'exception' or (isinstance(status, int) and status >= 400):
+                self.errors[endpoint] += 1
+            if extra.get("agent_used"):
+                self.agent_used[endpoint] += 1
+
+    def report(self, elapsed):
+        rows = []
+        for endpoint, samples in sorted(self.latencies.items()):
+            row = {
+                "endpoint": endpoint,
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(percentile(samples, 50), 1),
+                "p95_ms": round(percentile(samples, 95), 1),
+                "p99_ms": round(percentile(samples, 99), 1),
+                "max_ms": round(max(samples), 1),
+                "statuses": dict(self.statuses[endpoint])
+            }
+            if endpoint == "POST /generate":
+                row["agent_answered"] = self.agent_used[endpoint]
+            rows.append(row)
+        every = [value for samples in self.latencies.values() for value in samples]
+        if every:
+            rows.append({
+                "endpoint": "ALL",
+                "requests": len(every),
+                "errors": sum(self.errors.values()),
+                "rps": round(len(every) / elapsed, 2),
+                "p50_ms": round(percentile(every, 50), 1),
+                "p95_ms": round(percentile(every, 95), 1),
+                "p99_ms": round(percentile(every, 99), 1),
+                "max_ms": round(max(every), 1)
+            })
+        return rows
+
+
+def worker(sessions, mix, recorder, deadline, budget, budget_lock, think, seed):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    while time.time() < deadline:
+        with budget_lock:
+            if budget[0] is not None:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+        name = rng.choices(names, weights)[0]
+        endpoint, scenario = SCENARIOS[name]
+        session = rng.choice(sessions)
+        start = time.perf_counter()
+        try:
+            response, extra = scenario(session, rng)
+            status = response.status_code
+        except requests.exceptions.RequestException:
+            status, extra = 'exception', {}
+        recorder.record(extra.get("endpoint", endpoint), time.perf_counter() - start, status, extra)
+        if think:
+            time.sleep(rng.expovariate(1 / think))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--base-url', default=os.environ.get('LOADTEST_BASE_URL', 'http://localhost:5001'))
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--password', default='loadtest-password')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run (upper bound with --requests)')
+    parser.add_argument('--requests', type=int, help='Stop after this many requests')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='name=weight pairs')
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between a worker\'s requests')
+    parser.add_argument('--timeout', type=float, default=90)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    print(f"👥 Signing in {args.users} test users at {args.base_url}")
+    sessions = [UserSession(args.base_url, f"loadtest-{i}@example.com", args.password, args.timeout)
+                for i in range(args.users)]
+
+    recorder = Recorder()
+    budget, budget_lock = [args.requests], threading.Lock()
+    deadline = time.time() + args.duration
+    print(f"🚦 {args.concurrency} workers, mix: {', '.join(f'{k}={v:g}' for k, v in mix.items())}")
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(sessions, mix, recorder, deadline, budget, budget_lock,
+                                                     args.think_ms / 1000, args.seed + i))
+               for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    rows = recorder.report(elapsed)
+    print()
+    print(f"📈 {sum(len(s) for s in recorder.latencies.values())} requests in {elapsed:.1f}s")
+    print_table(rows, ["endpoint", "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "agent_answered"])
+    write_results("loadtest", {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "mix": mix,
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": rows
+    }, args.json)
+
+
+if __name__ == '__main__':
+    main()
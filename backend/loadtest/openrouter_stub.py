@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter chat completions API
+Serves POST .../chat/completions (plain and "stream": true server-sent events) so the agent
+and /generate can be load-tested without spending quota. Three modes:
+
+  synthetic  Press-release-shaped markdown with configurable latency distribution,
+             error rate and output length (default)
+  record     Forward each call to the real API once and append it to a cassette file
+  replay     Serve cassette entries deterministically (matched on model + messages,
+             otherwise round-robin), with recorded or synthetic latency
+
+Usage: python loadtest/openrouter_stub.py [--port 8089] [--latency lognormal --latency-ms 1500]
+                                          [--error-rate 0.05] [--words 300:500]
+       python loadtest/openrouter_stub.py --mode record --cassette loadtest/cassette.jsonl
+       python loadtest/openrouter_stub.py --mode replay --cassette loadtest/cassette.jsonl
+Then run the agent with OPENROUTER_BASE_URL=http://localhost:8089/api/v1 (and any API_KEY_DS).
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+DEFAULT_UPSTREAM = 'https://openrouter.ai/api/v1'
+WORDS = ("announced platform customers growth partnership market product launch team innovation "
+         "investment technology global users feature industry strategy leadership expansion").split()
+
+
+class LatencyModel:
+    """Samples response latency in seconds from a named distribution"""
+
+    def __init__(self, kind, mean_ms, spread_ms, rng):
+        self.kind = kind
+        self.mean = mean_ms / 1000
+        self.spread = spread_ms / 1000
+        self.rng = rng
+
+    def sample(self):
+        if self.kind == 'fixed':
+            value = self.mean
+        elif self.kind == 'uniform':
+            value = self.rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == 'normal':
+            value = self.rng.gauss(self.mean, self.spread)
+        else:
+            # Log-normal with the given mean: LLM latencies have a long right tail
+            sigma = math.sqrt(math.log(1 + (self.spread / self.mean) ** 2)) if self.mean > 0 else 0
+            value = self.rng.lognormvariate(math.log(max(self.mean, 1e-6)) - sigma ** 2 / 2, sigma)
+        return max(0.0, value)
+
+
+def cassette_key(payload):
+    """Requests match a recording when model and messages are identical"""
+    material = json.dumps({"model": payload.get("model"), "messages": payload.get("messages")}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def synthetic_release(payload, words, rng):
+    """Markdown press release that echoes the company and title from the prompt"""
+    prompt = '\n'.join(m.get('content', '') for m in payload.get('messages', []) if isinstance(m, dict))
+    company = re.search(r'^Company:\s*(.+)$', prompt, re.M)
+    title = re.search(r'^Title:\s*(.+)$', prompt, re.M)
+    company = company.group(1).strip() if company else 'Acme Corp'
+    title = title.group(1).strip() if title else 'Company Announcement'
+    sections = [f"# {title}", f"**{company}** today announced a major milestone."]
+    written = 8
+    while written < words:
+        if len(sections) % 4 == 2:
+            sections.append(f"## {rng.choice(WORDS).title()} {rng.choice(WORDS).title()}")
+        length = min(rng.randint(30, 70), words - written)
+        sections.append(' '.join(rng.choice(WORDS) for _ in range(length)).capitalize() + '.')
+        written += length
+    sections.append(f"## About {company}\n\n{company} builds products for customers worldwide.")
+    return '\n\n'.join(sections)
+
+
+def completion_body(content, model, completion_id=None):
+    return {
+        "id": completion_id or f"gen-{uuid.uuid4().hex[:16]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": len(content.split())}
+    }
+
+
+def error_body(status):
+    messages = {429: "Rate limit exceeded", 500: "Internal server error", 502: "Upstream provider error",
+                503: "Service unavailable", 404: "No recording for this request"}
+    return {"error": {"code": status, "message": f"{messages.get(status, 'Error')} (stub)"}}
+
+
+class Cassette:
+    """Append-only JSONL recordings, indexed by cassette_key"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        self.by_key = {}
+        self._lock = threading.Lock()
+        self._cursor = Counter()
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def _index(self, entry):
+        self.entries.append(entry)
+        self.by_key.setdefault(entry["key"], []).append(entry)
+
+    def add(self, entry):
+        with self._lock:
+            self._index(entry)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def lookup(self, key, strict=False):
+        """Recording for this request; repeated calls cycle through its recordings in order"""
+        with self._lock:
+            matches = self.by_key.get(key)
+            if not matches:
+                if strict or not self.entries:
+                    return None
+                key, matches = '*', self.entries
+            entry = matches[self._cursor[key] % len(matches)]
+            self._cursor[key] += 1
+            return entry
+
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.latency = LatencyModel(args.latency, args.latency_ms, args.latency_spread_ms, self.rng)
+        self.words = tuple(int(part) for part in args.words.split(':')) if ':' in args.words else (int(args.words),) * 2
+        self.error_codes = [int(code) for code in args.error_codes.split(',') if code]
+        self.cassette = Cassette(args.cassette) if args.mode in ('record', 'replay') else None
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    def count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def draw(self):
+        """One latency sample, failure decision and output length (thread-safe)"""
+        with self.rng_lock:
+            latency = self.latency.sample()
+            roll = self.rng.random()
+            words = self.rng.randint(*self.words)
+            error = None
+            if roll < self.args.timeout_rate:
+                error = 'timeout'
+            elif roll < self.args.timeout_rate + self.args.error_rate and self.error_codes:
+                error = self.rng.choice(self.error_codes)
+            return latency, error, words, random.Random(self.rng.random())
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/') in ('/health', ''):
+            self._send_json(200, {"status": "ok", "mode": self.state.args.mode})
+        elif self.path == '/stats':
+            with self.state.stats_lock:
+                self._send_json(200, dict(self.state.stats))
+        else:
+            self._send_json(404, error_body(404))
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, error_body(404))
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON"}})
+            return
+
+        state = self.state
+        state.count('requests')
+        latency, error, words, rng = state.draw()
+        model = payload.get('model', 'stub/model')
+
+        if state.args.mode == 'record':
+            status, body, latency = self._forward(payload)
+            content = None
+        elif state.args.mode == 'replay':
+            entry = state.cassette.lookup(cassette_key(payload), strict=state.args.strict)
+            if entry is None:
+                status, body = 404, error_body(404)
+            else:
+                status, body = entry["status"], entry["body"]
+                if state.args.replay_latency == 'recorded':
+                    latency = entry.get("latency_ms", 0) / 1000
+                elif state.args.replay_latency == 'none':
+                    latency = 0.0
+            content = None
+        else:
+            if error == 'timeout':
+                state.count('timeouts')
+                time.sleep(state.args.timeout_ms / 1000)
+                error = 504
+            if error:
+                status, body = error, error_body(error)
+            else:
+                status, body = 200, None
+                content = synthetic_release(payload, words, rng)
+
+        if status == 200 and content is None:
+            content = body["choices"][0]["message"]["content"]
+        state.count(f"status_{status}")
+
+        if status != 200:
+            time.sleep(latency if state.args.mode != 'record' else 0)
+            self._send_json(status, body)
+        elif payload.get('stream'):
+            state.count('streamed')
+            self._stream(content, model, latency, rng)
+        else:
+            if state.args.mode != 'record':
+                time.sleep(latency)
+            self._send_json(200, body if body is not None else completion_body(content, model))
+
+    def _forward(self, payload):
+        """Call the real API (never streamed) and record the result"""
+        upstream_payload = dict(payload, stream=False)
+        headers = {key: value for key, value in self.headers.items()
+                   if key.lower() in ('authorization', 'http-referer', 'x-title')}
+        start = time.perf_counter()
+        try:
+            response = requests.post(f"{self.state.args.upstream.rstrip('/')}/chat/completions",
+                                     json=upstream_payload, headers=headers, timeout=120)
+            status = response.status_code
+            try:
+                body = response.json()
+            except ValueError:
+                status, body = 502, error_body(502)
+        except requests.exceptions.RequestException:
+            status, body = 502, error_body(502)
+        latency = time.perf_counter() - start
+        self.state.cassette.add({
+            "key": cassette_key(payload),
+            "model": payload.get("model"),
+            "status": status,
+            "latency_ms": round(latency * 1000, 1),
+            "body": body
+        })
+        self.state.count('recorded')
+        return status, body, latency
+
+    def _stream(self, content, model, latency, rng):
+        """Server-sent events in OpenAI chunk format; ~25% of the latency before the first token"""
+        tokens = re.findall(r'\S+\s*', content)
+        chunks = [''.join(tokens[i:i + 8]) for i in range(0, len(tokens), 8)] or ['']
+        completion_id = f"gen-{uuid.uuid4().hex[:16]}"
+        first_token = latency * 0.25
+        per_chunk = (latency - first_token) / len(chunks)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        time.sleep(first_token)
+        try:
+            for i, chunk in enumerate(chunks + [None]):
+                delta = {"content": chunk} if chunk is not None else {}
+                if i == 0:
+                    delta["role"] = "assistant"
+                event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None if chunk is not None else "stop"}]
+                }
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if chunk is not None:
+                    time.sleep(per_chunk)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.state.count('client_disconnects')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--mode', choices=('synthetic', 'record', 'replay'), default='synthetic')
+    parser.add_argument('--latency', choices=('fixed', 'uniform', 'normal', 'lognormal'), default='lognormal')
+    parser.add_argument('--latency-ms', type=float, default=1500, help='Mean response time')
+    parser.add_argument('--latency-spread-ms', type=float, default=800, help='Half-width (uniform) or standard deviation')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of calls answered with an error status')
+    parser.add_argument('--error-codes', default='429,500,503')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='Fraction of calls that hang for --timeout-ms')
+    parser.add_argument('--timeout-ms', type=float, default=35000, help='Longer than the agent\'s 30s client timeout')
+    parser.add_argument('--words', default='300:500', help='Output length, N or MIN:MAX words')
+    parser.add_argument('--cassette', default='loadtest/cassette.jsonl')
+    parser.add_argument('--upstream', default=DEFAULT_UPSTREAM, help='Real API for --mode record')
+    parser.add_argument('--replay-latency', choices=('recorded', 'synthetic', 'none'), default='recorded')
+    parser.add_argument('--strict', action='store_true', help='Replay: 404 for requests without an exact recording')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true')
+    return parser
+
+
+def make_server(args):
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'state': StubState(args)})
+    return ThreadingHTTPServer((args.host, args.port), handler)
+
+
+def main():
+    args = build_parser().parse_args()
+    server = make_server(args)
+    print(f"🧪 OpenRouter stand-in ({args.mode}) on http://{args.host}:{args.port}/api/v1")
+    if args.mode == 'synthetic':
+        print(f"⏱️ Latency: {args.latency} mean {args.latency_ms:.0f}ms, errors {args.error_rate:.0%}, "
+              f"timeouts {args.timeout_rate:.0%}, {args.words} words")
+    else:
+        print(f"📼 Cassette: {args.cassette} ({len(server.RequestHandlerClass.state.cassette.entries)} recordings)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopping stand-in")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+Local press release engine for PR-Connect
+Builds outlet-specific releases from the brief alone, with no LLM and no network call.
+analyze_content() pulls the facts out of the brief (amounts, percentages, dates, product
+and person names, locations, quotes) with precompiled patterns, and the generate_*_style
+functions lay them out in each outlet's structure. Nothing is invented: sections without
+facts to fill them are left out. Serves the fallback path when the agent is down or busy.
+"""
+
+import re
+from datetime import datetime
+
+MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+WEEKDAYS = "Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday"
+_MONTH = rf"(?:{MONTHS}|(?:Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\.?)"
+_NAME = r"[A-Z][a-z]+(?:\s[A-Z]\.)?\s(?:(?:de|van|von|da|del|le)\s)?[A-Z][a-zA-Z'’-]+"
+_TITLE = (r"(?:[Cc]o-?[Ff]ounder|[Ff]ounder|CEO|CTO|CFO|COO|CMO|CPO|President|Chairman|Chairwoman|Chair"
+          r"|Chief\s[A-Z][a-z]+\sOfficer|Head\sof\s[A-Z][a-z]+|Vice\sPresident|VP|Managing\sDirector"
+          r"|General\sManager|Director)")
+# A capitalised word that may contain dots (Node.js, v2.0) but doesn't end a sentence
+_ORG_WORD = r"[A-Z][\w&-]*(?:\.[\w&-]+)*"
+
+_AMOUNT = re.compile(
+    r"(?:[$€£]|\b(?:USD|EUR|GBP|RON)\s?)\d[\d,]*(?:\.\d+)?(?:\s?(?:million|billion|thousand|[MBK]n?)\b)?"
+    r"|\b\d[\d,]*(?:\.\d+)?\s?(?:million\s|billion\s|thousand\s)?(?:dollars|euros|pounds|lei|USD|EUR|GBP|RON)\b"
+)
+_PERCENT = re.compile(r"\b\d+(?:\.\d+)?\s?(?:%|percent\b)")
+_DATE = re.compile(
+    rf"\b{_MONTH}\s\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s\d{{4}})?\b"
+    rf"|\b\d{{1,2}}\s(?:{MONTHS})(?:\s\d{{4}})?\b"
+    rf"|\b(?:{MONTHS})\s\d{{4}}\b"
+    r"|\b\d{4}-\d{2}-\d{2}\b"
+    r"|\bQ[1-4]\s\d{4}\b"
+)
+_PERSON = re.compile(
+    rf"(?P<name>{_NAME}),\s(?:the\s)?(?:company's\s)?(?P<title>{_TITLE}(?:\s(?:and|&)\s{_TITLE})?(?:\s(?:of|at)\s{_ORG_WORD}(?:\s{_ORG_WORD}){{0,2}})?)"
+    rf"|(?P<title2>{_TITLE})\s(?P<name2>{_NAME})"
+)
+_QUOTE = re.compile(
+    rf"[“\"](?P<text>[^”\"]{{12,500}})[”\"],?\s(?:(?:said|says|added|noted|explained)\s(?P<after>{_NAME})"
+    rf"|(?P<before>{_NAME})\s(?:said|says|added|noted|explained))?"
+)
+_LOCATION = re.compile(
+    r"\b(?:in|from|across|throughout|based\sin|headquartered\sin)\s"
+    r"(?P<place>[A-Z][a-zA-Z]+(?:[\s-][A-Z][a-zA-Z]+)?(?:,\s[A-Z][a-zA-Z]+(?:\s[A-Z][a-zA-Z]+)?)?)"
+)
+_PRODUCT = re.compile(
+    r"\b(?:launch(?:es|ed|ing)?|introduc(?:es|ed|ing)|unveil(?:s|ed|ing)?|releas(?:es|ed|ing)|debut(?:s|ed)?"
+    r"|rolls?\sout|rolled\sout|announc(?:es|ed|ing))\s"
+    r"(?:(?:its|the|a|an|new|all-new|latest|next-generation)\s)*"
+    r"(?P<product>[A-Z][\w+-]*(?:\.[\w+-]+)*(?:\s(?:[A-Z0-9][\w+-]*(?:\.[\w+-]+)*|for|of|and|&)){0,5})"
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"“A-Z0-9])")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_TRAILING_CONNECTOR = re.compile(r"(?:\s(?:for|of|and|&))+$")
+
+# Capitalised words after "in"/"from" that aren't places
+_NOT_PLACES = set(MONTHS.split('|')) | set(WEEKDAYS.split('|')) | {
+    "The", "This", "That", "Our", "Its", "Series", "Q1", "Q2", "Q3", "Q4", "English", "Beta", "Early"
+}
+
+
+def _unique(values):
+    return list(dict.fromkeys(value.strip() for value in values if value and value.strip()))
+
+
+def analyze_content(text):
+    """
+    Facts found in a brief. Returns a dict with the lead sentence, all sentences, up to four
+    key points (the sentences carrying the most facts) and the amounts, percentages, dates,
+    products, people ({name, title}), locations and quotes ({text, speaker}) it mentions.
+    """
+    text = (text or "").strip()
+    sentences = [s.strip() for s in _SENTENCE_END.split(' '.join(text.split())) if s.strip()]
+
+    amounts = _unique(m.group() for m in _AMOUNT.finditer(text))
+    percentages = _unique(m.group() for m in _PERCENT.finditer(text))
+    dates = _unique(m.group() for m in _DATE.finditer(text))
+    products = _unique(_TRAILING_CONNECTOR.sub('', m.group('product')) for m in _PRODUCT.finditer(text))
+
+    people = {}
+    for m in _PERSON.finditer(text):
+        name = m.group('name') or m.group('name2')
+        people.setdefault(name, m.group('title') or m.group('title2'))
+    quotes = []
+    for m in _QUOTE.finditer(text):
+        speaker = m.group('after') or m.group('before')
+        quotes.append({"text": m.group('text').strip().rstrip(','), "speaker": speaker, "title": people.get(speaker)})
+
+    people_names = set(people)
+    locations = _unique(
+        m.group('place') for m in _LOCATION.finditer(text)
+        if m.group('place').split(',')[0].split()[0] not in _NOT_PLACES
+        and m.group('place') not in people_names and m.group('place') not in products
+    )
+
+    figures = amounts + percentages + dates + products
+    scored = [(sum(figure in sentence for figure in figures), i) for i, sentence in enumerate(sentences[1:], 1)]
+    key_points = [sentences[i] for score, i in sorted(scored, key=lambda item: (-item[0], item[1]))[:4] if score]
+    if not key_points:
+        key_points = sentences[1:4]
+
+    return {
+        "lead": sentences[0] if sentences else "",
+        "sentences": sentences,
+        "paragraphs": [p.strip() for p in _PARAGRAPH_BREAK.split(text) if p.strip()],
+        "key_points": key_points,
+        "amounts": amounts,
+        "percentages": percentages,
+        "dates": dates,
+        "products": products,
+        "people": [{"name": name, "title": title} for name, title in people.items()],
+        "locations": locations,
+        "quotes": quotes,
+        "word_count": len(text.split())
+    }
+
+
+def _fields(request):
+    """Brief fields with the same defaults the backend uses"""
+    company = request.company_name or "The company"
+    return {
+        "title": request.title or f"Announcement from {company}",
+        "company": company,
+        "category": request.category or "Company Milestone",
+        "contact": request.contact_info or f"Media inquiries: {company} press office",
+        "notes": request.additional_notes or ""
+    }
+
+
+def _dateline(analysis, today=None):
+    today = today or datetime.now()
+    place = analysis["locations"][0].upper() if analysis["locations"] else ""
+    date = f"{today:%B} {today.day}, {today.year}"
+    return f"**{place}, {date}** – " if place else f"**{date}** – "
+
+
+def _body(analysis, fields):
+    """The brief's own paragraphs (case and wording untouched)"""
+    return analysis["paragraphs"] or [f"{fields['company']} today announced a {fields['category'].lower()}."]
+
+
+def _figure_bullets(analysis, limit=4):
+    """One bullet per sentence that carries an amount, percentage or date, figures in bold"""
+    bullets = []
+    for figure in analysis["amounts"] + analysis["percentages"] + analysis["dates"]:
+        sentence = next((s for s in analysis["sentences"] if figure in s), None)
+        if sentence and not any(sentence in bullet for bullet in bullets):
+            bullets.append(sentence)
+        if len(bullets) == limit:
+            break
+    figures = analysis["amounts"] + analysis["percentages"]
+    return [f"- {_bold_figures(sentence, figures)}" for sentence in bullets]
+
+
+def _bold_figures(sentence, figures):
+    for figure in sorted(figures, key=len, reverse=True):
+        if f"**{figure}" not in sentence:
+            sentence = sentence.replace(figure, f"**{figure}**", 1)
+    return sentence
+
+
+def _quote_lines(analysis, limit=2):
+    lines = []
+    for quote in analysis["quotes"][:limit]:
+        attribution = ""
+        if quote["speaker"]:
+            attribution = f" — {quote['speaker']}" + (f", {quote['title']}" if quote["title"] else "")
+        lines.append(f"> “{quote['text']}”{attribution}")
+    return lines
+
+
+def _section(heading, lines, paragraphs=False):
+    if not lines:
+        return []
+    if paragraphs:
+        lines = [line for paragraph in lines for line in (paragraph, "")][:-1]
+    return [heading, "", *lines, ""]
+
+
+def _join(parts):
+    return "\n".join(parts).strip() + "\n"
+
+
+def generate_techcrunch_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    subhead = analysis["products"][0] if analysis["products"] else fields["category"]
+    if analysis["amounts"]:
+        subhead = f"{subhead} · {analysis['amounts'][0]}"
+    parts = [f"# {fields['title']}", "", f"*{subhead}*", "", _dateline(analysis) + body[0], ""]
+    for paragraph in body[1:]:
+        parts += [paragraph, ""]
+    parts += _section("## The numbers", _figure_bullets(analysis))
+    parts += _section("## What's launching", [f"- **{product}**" for product in analysis["products"][:4]])
+    parts += _section("## From the team", _quote_lines(analysis))
+    if fields["notes"]:
+        parts += ["## Details", "", fields["notes"], ""]
+    parts += ["## Contact", "", fields["contact"]]
+    return _join(parts)
+
+
+def generate_theverge_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    parts = [f"# {fields['title']}", "", _dateline(analysis) + body[0], ""]
+    for paragraph in body[1:]:
+        parts += [paragraph, ""]
+    parts += _section("## The short version", [f"- {point}" for point in analysis["key_points"]])
+    parts += _section("## In their words", _quote_lines(analysis))
+    when_where = []
+    if analysis["dates"]:
+        when_where.append(f"- **When:** {', '.join(analysis['dates'][:3])}")
+    if analysis["locations"]:
+        when_where.append(f"- **Where:** {', '.join(analysis['locations'][:3])}")
+    if analysis["amounts"]:
+        when_where.append(f"- **Price / scale:** {', '.join(analysis['amounts'][:3])}")
+    parts += _section("## When and where", when_where)
+    if fields["notes"]:
+        parts += ["## Good to know", "", fields["notes"], ""]
+    parts += [f"**Press contact:** {fields['contact']}"]
+    return _join(parts)
+
+
+def generate_forbes_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    parts = [f"**{fields['title']}**", f"*{fields['company']} — {fields['category']}*", "",
+             "**Executive Summary**", "", _dateline(analysis) + body[0], ""]
+    parts += _section("**By the Numbers**", _figure_bullets(analysis))
+    parts += _section("**Strategic Context**", body[1:], paragraphs=True)
+    leadership = _quote_lines(analysis)
+    if not leadership and analysis["people"]:
+        leadership = [f"- {p['name']}" + (f", {p['title']}" if p["title"] else "") for p in analysis["people"][:3]]
+    parts += _section("**Leadership**", leadership)
+    if fields["notes"]:
+        parts += ["**Additional Context**", "", fields["notes"], ""]
+    parts += [f"**Investor & Media Relations:** {fields['contact']}"]
+    return _join(parts)
+
+
+def generate_adevarul_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    parts = [f"# {fields['title']}", "", _dateline(analysis) + body[0], ""]
+    facts = [f"- **Who:** {fields['company']}" + (
+        f" ({', '.join(p['name'] for p in analysis['people'][:2])})" if analysis["people"] else "")]
+    facts.append(f"- **What:** {analysis['products'][0] if analysis['products'] else fields['category']}")
+    if analysis["dates"]:
+        facts.append(f"- **When:** {analysis['dates'][0]}")
+    if analysis["locations"]:
+        facts.append(f"- **Where:** {', '.join(analysis['locations'][:3])}")
+    if analysis["amounts"] or analysis["percentages"]:
+        facts.append(f"- **Figures:** {', '.join((analysis['amounts'] + analysis['percentages'])[:4])}")
+    parts += _section("## Key facts", facts)
+    parts += _section("## Details", body[1:], paragraphs=True)
+    parts += _section("## Statements", _quote_lines(analysis))
+    if fields["notes"]:
+        parts += ["## Context", "", fields["notes"], ""]
+    parts += ["## Contact", "", fields["contact"]]
+    return _join(parts)
+
+
+def generate_cnn_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    lead = analysis["lead"] or body[0]
+    if fields["company"] in lead:
+        lead = lead.replace(fields["company"], f"**{fields['company']}**", 1)
+    else:
+        lead = f"**{fields['company']}** — {lead}"
+    parts = [f"# {fields['title']}", "", lead, ""]
+    parts += _section("## What we know", [f"- {point}" for point in analysis["key_points"]])
+    parts += _section("## The details", body[1:], paragraphs=True)
+    parts += _section("## What they're saying", _quote_lines(analysis))
+    if analysis["dates"]:
+        parts += _section("## What's next", [f"- {date}" for date in analysis["dates"][:3]])
+    if fields["notes"]:
+        parts += [fields["notes"], ""]
+    parts += [f"**Media contact:** {fields['contact']}"]
+    return _join(parts)
+
+
+def generate_general_style(request, analysis):
+    fields = _fields(request)
+    body = _body(analysis, fields)
+    parts = ["FOR IMMEDIATE RELEASE", "", f"# {fields['title']}", "", _dateline(analysis) + body[0], ""]
+    for paragraph in body[1:]:
+        parts += [paragraph, ""]
+    parts += _section("## Highlights", _figure_bullets(analysis) or [f"- {p}" for p in analysis["key_points"]])
+    parts += _section("## Quotes", _quote_lines(analysis))
+    if fields["notes"]:
+        parts += ["## Additional Information", "", fields["notes"], ""]
+    parts += ["## Media Contact", "", fields["contact"], "", "###"]
+    return _join(parts)
+
+
+STYLE_GENERATORS = {
+    "TechCrunch": generate_techcrunch_style,
+    "The Verge": generate_theverge_style,
+    "Forbes": generate_forbes_style,
+    "Adevarul": generate_adevarul_style,
+    "CNN": generate_cnn_style,
+    "General": generate_general_style,
+}
+
+
+def generate_release(request, outlet, analysis=None):
+    """Markdown release for one outlet; pass analysis to reuse it across outlets"""
+    if analysis is None:
+        analysis = analyze_content(request.body)
+    return STYLE_GENERATORS.get(outlet, generate_general_style)(request, analysis)
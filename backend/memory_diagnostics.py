@@ -0,0 +1,176 @@
+"""
+Memory diagnostics for PR-Connect
+Process RSS, garbage collector state and live object counts by type, plus tracemalloc
+allocation snapshots that can be diffed by file and line. Tracing is off until an admin
+starts it (it slows allocations down), and only a few snapshots are kept at once.
+"""
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+MEMORY_MAX_SNAPSHOTS = int(os.environ.get('MEMORY_MAX_SNAPSHOTS', 5))
+DEFAULT_TRACE_FRAMES = 10
+GROUP_BY = ('lineno', 'filename', 'traceback')
+
+
+def process_memory():
+    """Current and peak resident set size in MB (Linux /proc, getrusage elsewhere)"""
+    usage = {"rss_mb": None, "peak_rss_mb": None}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    usage["rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+                elif line.startswith('VmHWM:'):
+                    usage["peak_rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Kilobytes on Linux, bytes on macOS
+            usage["peak_rss_mb"] = round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+        except ImportError:
+            pass
+    return usage
+
+
+def object_counts(limit=25):
+    """Live objects tracked by the garbage collector, by type name"""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return [{"type": name, "count": count} for name, count in counts.most_common(limit)]
+
+
+def gc_stats():
+    return {
+        "counts": gc.get_count(),
+        "thresholds": gc.get_threshold(),
+        "collections": [s["collections"] for s in gc.get_stats()],
+        "uncollectable": len(gc.garbage)
+    }
+
+
+def _stat_dict(stat, group_by):
+    frame = stat.traceback[0]
+    entry = {
+        "file": frame.filename,
+        "line": frame.lineno if group_by != 'filename' else None,
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count
+    }
+    if group_by == 'traceback':
+        entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+    return entry
+
+
+def _diff_dict(stat, group_by):
+    entry = _stat_dict(stat, group_by)
+    entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+    entry["count_diff"] = stat.count_diff
+    return entry
+
+
+class SnapshotStore:
+    """tracemalloc control plus the few most recent snapshots"""
+
+    def __init__(self, max_snapshots=MEMORY_MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, frames=DEFAULT_TRACE_FRAMES):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, min(int(frames), 50)))
+        return self.status()
+
+    def stop(self):
+        """Stop tracing; stored snapshots stay until cleared"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return self.status()
+
+    def status(self):
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [{"id": sid, "created_at": meta["created_at"], "label": meta["label"]}
+                         for sid, meta in self._snapshots.items()]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_mb": round(current / (1024 * 1024), 2),
+            "traced_peak_mb": round(peak / (1024 * 1024), 2),
+            "tracemalloc_overhead_mb": round(tracemalloc.get_tracemalloc_memory() / (1024 * 1024), 2),
+            "snapshots": snapshots
+        }
+
+    def take(self, label=None, group_by='lineno', limit=25):
+        """
+        Snapshot current allocations; raises RuntimeError if tracing is off
+
+        Returns:
+            dict: the new snapshot's top allocations (as top()), computed before the
+                  snapshot can be evicted by later ones
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Allocation tracing is not running; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+        snapshot_id = uuid.uuid4().hex[:8]
+        with self._lock:
+            self._snapshots[snapshot_id] = {
+                "snapshot": snapshot,
+                "label": label,
+                "created_at": datetime.utcnow().isoformat()
+            }
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return self._top(snapshot_id, snapshot, group_by, limit)
+
+    def _get(self, snapshot_id):
+        with self._lock:
+            meta = self._snapshots.get(snapshot_id)
+        if meta is None:
+            raise KeyError(snapshot_id)
+        return meta["snapshot"]
+
+    def top(self, snapshot_id, group_by='lineno', limit=25):
+        return self._top(snapshot_id, self._get(snapshot_id), group_by, limit)
+
+    @staticmethod
+    def _top(snapshot_id, snapshot, group_by, limit):
+        stats = snapshot.statistics(group_by)
+        return {
+            "id": snapshot_id,
+            "group_by": group_by,
+            "total_kb": round(sum(s.size for s in stats) / 1024, 1),
+            "top": [_stat_dict(s, group_by) for s in stats[:limit]]
+        }
+
+    def diff(self, old_id, new_id, group_by='lineno', limit=25):
+        """Largest allocation changes between two snapshots (growth first)"""
+        stats = self._get(new_id).compare_to(self._get(old_id), group_by)
+        return {
+            "from": old_id,
+            "to": new_id,
+            "group_by": group_by,
+            "size_diff_kb": round(sum(s.size_diff for s in stats) / 1024, 1),
+            "top": [_diff_dict(s, group_by) for s in stats[:limit]]
+        }
+
+    def clear(self):
+        with self._lock:
+            cleared = len(self._snapshots)
+            self._snapshots.clear()
+        return cleared
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,262 @@
+"""
+Prometheus metrics for PR-Connect
+Counters, gauges and histograms rendered in the Prometheus text format. Each metric
+takes one uncontended lock per update, cheap enough to leave on in production. Used by
+both the web app (/metrics) and the agent process (its own small metrics server).
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if tuple(sorted(labels)) != tuple(sorted(self.labelnames)):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(self._render_samples(items))
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=HTTP_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, plus sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block; labels may be updated inside it"""
+        start = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(round(total, 6))}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Named collection of metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=HTTP_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Web app
+http_request_duration = registry.histogram(
+    'prconnect_http_request_duration_seconds', 'HTTP request latency by route', ('route', 'method'))
+http_requests_total = registry.counter(
+    'prconnect_http_requests_total', 'HTTP responses by route and status', ('route', 'method', 'status'))
+agent_round_trip = registry.histogram(
+    'prconnect_agent_round_trip_seconds', 'Web app to agent round trip for /generate', ('outcome',), LLM_BUCKETS)
+generations_in_flight = registry.gauge(
+    'prconnect_generations_in_flight', 'Press release generations currently running')
+db_commit_duration = registry.histogram(
+    'prconnect_db_commit_seconds', 'Database session commit time', (), DB_BUCKETS)
+
+# Shared by the web app's local generation and the agent's template fallback
+fallback_releases_total = registry.counter(
+    'prconnect_fallback_releases_total', 'Releases served from templates instead of the LLM',
+    ('source', 'outlet', 'reason'))
+
+# Agent
+llm_request_duration = registry.histogram(
+    'prconnect_llm_request_duration_seconds', 'OpenRouter call latency per outlet', ('outlet', 'outcome'), LLM_BUCKETS)
+llm_releases_total = registry.counter(
+    'prconnect_llm_releases_total', 'Releases generated per outlet by outcome', ('outlet', 'outcome'))
+
+
+def authorized(authorization_header):
+    """True when no METRICS_TOKEN is set or the bearer token matches"""
+    if not METRICS_TOKEN:
+        return True
+    return authorization_header == f"Bearer {METRICS_TOKEN}"
+
+
+def init_request_metrics(app):
+    """Per-route latency histogram and status counter for a Flask app"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            # Route templates, not raw paths, keep label cardinality bounded
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            http_request_duration.observe(time.perf_counter() - started, route=route, method=request.method)
+            http_requests_total.inc(route=route, method=request.method, status=response.status_code)
+        return response
+
+
+def instrument_commits(session_class):
+    """Time every commit of a SQLAlchemy session class"""
+    from sqlalchemy import event
+
+    @event.listens_for(session_class, 'before_commit')
+    def _commit_started(session):
+        session.info['metrics_commit_started'] = time.perf_counter()
+
+    @event.listens_for(session_class, 'after_commit')
+    def _commit_finished(session):
+        started = session.info.pop('metrics_commit_started', None)
+        if started is not None:
+            db_commit_duration.observe(time.perf_counter() - started)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        if not authorized(self.headers.get('Authorization')):
+            self.send_error(401)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host='0.0.0.0'):
+    """Serve /metrics from a daemon thread (for processes without a web framework)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
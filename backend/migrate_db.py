@@ -3,7 +3,10 @@
 Comprehensive Database Migration Script for PR-Connect
 Creates all database tables and initializes default data
 Can be run standalone or called from the API
-Supports both fresh table creation and incremental updates
+Migrations are ordered, versioned steps (MIGRATIONS) recorded in the schema_version table,
+so the web app's boot check is a single query when the schema is current
+
+Usage: python migrate_db.py [--status | --force | --drop]
 """
 
 import os
@@ -11,6 +14,8 @@ import sys
 import psycopg2
 from flask import Flask
 from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 # Load environment variables
 load_dotenv()
@@ -20,30 +25,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import models
 from models import db, NewsOutlet, Request, Response, Transcript, User
-
-# Available outlets and categories (same as in app.py)
-AVAILABLE_OUTLETS = {
-    "TechCrunch": {
-        "description": "Tech-focused, startup-friendly coverage",
-        "audience": "Developers, entrepreneurs, tech industry",
-        "icon": "⚡"
-    },
-    "The Verge": {
-        "description": "Consumer tech and digital lifestyle",
-        "audience": "Tech consumers, early adopters",
-        "icon": "📱"
-    },
-    "Forbes": {
-        "description": "Business and financial perspective",
-        "audience": "Executives, investors, business leaders",
-        "icon": "💼"
-    },
-    "General": {
-        "description": "Broad appeal, standard format",
-        "audience": "General public, all media outlets",
-        "icon": "📰"
-    }
-}
+from text_storage import encode_text, decode_text
+from search_index import rebuild_search_index, search_document_count
+from outlet_catalog import outlet_catalog
 
 def create_app_for_migration():
     """Create Flask app for database operations"""
@@ -160,6 +144,7 @@ def check_and_update_table_structure(database_url, verbose=True):
                 ("location", "VARCHAR(100)"),
                 ("is_admin", "BOOLEAN DEFAULT FALSE"),
                 ("is_active", "BOOLEAN DEFAULT TRUE"),
+                ("token_version", "INTEGER NOT NULL DEFAULT 0"),
                 ("updated_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
             ]
             
@@ -212,9 +197,283 @@ def check_and_update_table_structure(database_url, verbose=True):
         
     except Exception as e:
         log(f"❌ Error checking table structure: {e}")
+        raise
+
+# Columns moved to (optionally compressed) byte storage, see text_storage.py
+COMPRESSED_TEXT_COLUMNS = [
+    ("responses", "body"),
+    ("transcripts", "text")
+]
+
+def migrate_text_storage(database_url, verbose=True, batch_size=500):
+    """
+    Convert large text columns to BYTEA and re-encode existing rows
+    Columns already converted and rows already carrying a storage header are skipped,
+    so this is safe to run repeatedly
+    """
+    
+    def log(message):
+        if verbose:
+            print(message)
+    
+    try:
+        conn = psycopg2.connect(database_url)
+        cur = conn.cursor()
+        
+        log("🗜️ Checking large text column storage...")
+        updates_made = []
+        
+        for table_name, column_name in COMPRESSED_TEXT_COLUMNS:
+            cur.execute("""
+                SELECT data_type 
+                FROM information_schema.columns 
+                WHERE table_name = %s AND column_name = %s
+            """, (table_name, column_name))
+            row = cur.fetchone()
+            if not row:
+                continue
+            
+            if row[0] != 'bytea':
+                log(f"🔄 Converting {table_name}.{column_name} from {row[0]} to BYTEA")
+                cur.execute(f"""
+                    ALTER TABLE {table_name} 
+                    ALTER COLUMN {column_name} TYPE BYTEA USING convert_to({column_name}, 'UTF8');
+                """)
+                conn.commit()
+                updates_made.append(f"Converted {table_name}.{column_name} to BYTEA")
+            
+            # Legacy rows have no storage header byte - re-encode them in batches
+            reencoded = 0
+            while True:
+                cur.execute(f"""
+                    SELECT id, {column_name} 
+                    FROM {table_name} 
+                    WHERE CASE WHEN length({column_name}) = 0 THEN TRUE 
+                               ELSE get_byte({column_name}, 0) > 1 END
+                    ORDER BY id 
+                    LIMIT %s
+                """, (batch_size,))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                cur.executemany(
+                    f"UPDATE {table_name} SET {column_name} = %s WHERE id = %s",
+                    [(psycopg2.Binary(encode_text(decode_text(value))), row_id) for row_id, value in rows]
+                )
+                conn.commit()
+                reencoded += len(rows)
+            
+            if reencoded:
+                log(f"🗜️ Re-encoded {reencoded} rows in {table_name}.{column_name}")
+                updates_made.append(f"Re-encoded {reencoded} rows in {table_name}.{column_name}")
+        
+        cur.close()
+        conn.close()
+        
+        if not updates_made:
+            log("✅ Large text storage is up to date")
+        
+        return updates_made
+        
+    except Exception as e:
+        log(f"❌ Error migrating text storage: {e}")
+        raise
+
+def ensure_unique_outlet_names(database_url, verbose=True):
+    """
+    Merge duplicate news_outlets rows (requests move to the oldest row) and add the unique
+    index on name that the outlet catalog's upsert relies on. Safe to run repeatedly.
+    """
+    
+    def log(message):
+        if verbose:
+            print(message)
+    
+    try:
+        conn = psycopg2.connect(database_url)
+        cur = conn.cursor()
+        
+        cur.execute("SELECT to_regclass('public.news_outlets'), to_regclass('public.uq_news_outlets_name')")
+        table_exists, index_exists = cur.fetchone()
+        if not table_exists or index_exists:
+            cur.close()
+            conn.close()
+            return []
+        
+        log("📰 Merging duplicate outlets and adding a unique index on news_outlets.name...")
+        cur.execute("""
+            WITH keep AS (
+                SELECT name, MIN(id) AS id FROM news_outlets GROUP BY name HAVING COUNT(*) > 1
+            )
+            UPDATE requests SET news_outlet_id = keep.id
+            FROM news_outlets, keep
+            WHERE requests.news_outlet_id = news_outlets.id
+              AND news_outlets.name = keep.name AND news_outlets.id <> keep.id
+        """)
+        moved = cur.rowcount
+        cur.execute("""
+            DELETE FROM news_outlets
+            WHERE id NOT IN (SELECT MIN(id) FROM news_outlets GROUP BY name)
+        """)
+        removed = cur.rowcount
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_news_outlets_name ON news_outlets (name)")
+        conn.commit()
+        cur.close()
+        conn.close()
+        
+        updates_made = ["Added unique index on news_outlets.name"]
+        if removed:
+            updates_made.append(f"Merged {removed} duplicate outlets ({moved} requests moved)")
+        for update in updates_made:
+            log(f"  • {update}")
+        return updates_made
+        
+    except Exception as e:
+        log(f"❌ Error making outlet names unique: {e}")
+        raise
+
+def backfill_transcript_stats(batch_size=200, verbose=True):
+    """Fill word_count/preview for transcripts written before they were computed at write time"""
+    backfilled = 0
+    while True:
+        batch = Transcript.query.filter(Transcript.word_count.is_(None)).order_by(Transcript.id).limit(batch_size).all()
+        if not batch:
+            break
+        for transcript in batch:
+            transcript.set_text(transcript.text or '')
+        db.session.commit()
+        backfilled += len(batch)
+    if backfilled and verbose:
+        print(f"📝 Backfilled word count and preview for {backfilled} transcripts")
+    return backfilled
+
+def create_tables(database_url, results, verbose=True):
+    """Create any missing tables from the models (existing tables are left alone)"""
+    # Primary only: a read replica gets its schema through replication
+    db.create_all(bind_key=None)
+    results["tables_created"] = ['users', 'news_outlets', 'requests', 'responses', 'transcripts', 'transcript_chunks']
+    return []
+
+def add_missing_columns(database_url, results, verbose=True):
+    return check_and_update_table_structure(database_url, verbose)
+
+def compress_text_columns(database_url, results, verbose=True):
+    return migrate_text_storage(database_url, verbose)
+
+def unique_outlet_names(database_url, results, verbose=True):
+    return ensure_unique_outlet_names(database_url, verbose)
+
+def seed_outlets(database_url, results, verbose=True):
+    outlet_catalog.invalidate()
+    results["outlets_added"] = outlet_catalog.seed()
+    for outlet_name in results["outlets_added"]:
+        if verbose:
+            print(f"  ✅ Added outlet: {outlet_name}")
+    return []
+
+def backfill_transcripts(database_url, results, verbose=True):
+    results["transcripts_backfilled"] = backfill_transcript_stats(verbose=verbose)
+    return []
+
+def build_search_index(database_url, results, verbose=True):
+    """Backfill the full-text search index from existing rows (once, while it's empty)"""
+    if search_document_count(db.session) == 0:
+        indexed = rebuild_search_index(db.session)
+        results["search_indexed"] = indexed
+        if verbose:
+            print(f"  ✅ Indexed {sum(indexed.values())} documents: {indexed}")
+    db.session.commit()
+    return []
+
+def rekey_sqlite_search_index(database_url, results, verbose=True):
+    """SQLite search rows are keyed by rowid now; re-index rows written under the old scheme"""
+    if db.engine.dialect.name == 'postgresql':
         return []
+    indexed = rebuild_search_index(db.session)
+    db.session.commit()
+    return [f"Re-indexed {sum(indexed.values())} search documents by rowid"]
+
+# Ordered schema migrations: (version, description, step, PostgreSQL only). Every step is safe
+# to re-run, so databases created before versioning simply replay them once. Append new steps
+# with the next version; never renumber or remove applied ones.
+MIGRATIONS = [
+    (1, "Create tables", create_tables, False),
+    (2, "Add columns missing from older tables", add_missing_columns, True),
+    (3, "Compressed storage for large text columns", compress_text_columns, True),
+    (4, "Unique outlet names", unique_outlet_names, True),
+    (5, "Seed default news outlets", seed_outlets, False),
+    (6, "Backfill transcript word counts and previews", backfill_transcripts, False),
+    (7, "Backfill the full-text search index", build_search_index, False),
+    (8, "Key SQLite search documents by rowid", rekey_sqlite_search_index, False),
+    (9, "Pending dictation chunks table", create_tables, False),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+SCHEMA_VERSION_TABLE = 'schema_version'
+# Arbitrary key for the advisory lock that keeps two processes from migrating at once
+MIGRATION_LOCK_KEY = 7230148
+# Boot only reports a schema that is behind; `python migrate_db.py` (the pre-deploy step) migrates.
+# true lets the web app apply pending migrations itself before it binds the port
+MIGRATE_ON_BOOT = os.environ.get('MIGRATE_ON_BOOT', 'false').lower() in ('1', 'true', 'yes')
+
+def current_schema_version(engine=None):
+    """Highest applied migration (0 if none or the table doesn't exist yet): one query"""
+    engine = engine or db.engine
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar() or 0
+    except (ProgrammingError, OperationalError):
+        return 0
+
+def pending_migrations(version):
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+def apply_migrations(verbose=True, force=False):
+    """
+    Apply pending migrations in order, recording each one in schema_version as it succeeds.
+    A failing step raises and leaves the version at the last step that worked.
+    force re-runs every step. Needs an app context.
+    """
+    
+    def log(message):
+        if verbose:
+            print(message)
+    
+    database_url = os.environ.get('DATABASE_URL') or db.engine.url.render_as_string(hide_password=False)
+    is_postgres = db.engine.dialect.name == 'postgresql'
+    results = {"tables_created": [], "outlets_added": [], "structural_updates": [], "migrations_applied": []}
+    
+    # A transaction-level lock held by a transaction that stays open for the whole run: unlike a
+    # session lock it can't outlive its server connection when PgBouncer (transaction mode)
+    # hands that connection to another client, and it is released on commit or on a crash
+    with db.engine.begin() as lock_conn:
+        if is_postgres:
+            lock_conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        with db.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+                    version INTEGER PRIMARY KEY,
+                    description VARCHAR(200) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+        # Read again under the lock: another process may have just migrated
+        version = 0 if force else current_schema_version()
+        for step_version, description, step, postgres_only in pending_migrations(version):
+            if postgres_only and not is_postgres:
+                log(f"⏭️ {step_version}. {description} (PostgreSQL only, skipped)")
+            else:
+                log(f"🔧 {step_version}. {description}...")
+                results["structural_updates"] += step(database_url, results, verbose)
+            with db.engine.begin() as conn:
+                conn.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE} WHERE version = :version"), {"version": step_version})
+                conn.execute(text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (:version, :description)"),
+                             {"version": step_version, "description": description})
+            results["migrations_applied"].append(step_version)
+    
+    results["schema_version"] = current_schema_version()
+    return results
 
-def run_migration(app_context=None, drop_existing=False, verbose=True):
+def run_migration(app_context=None, drop_existing=False, verbose=True, force=False):
     """
     Run database migration
     
@@ -222,6 +481,7 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
         app_context: Flask app context (if called from API)
         drop_existing: Whether to drop existing tables (dangerous in production!)
         verbose: Whether to print detailed output
+        force: Re-run every migration step, even ones already recorded
     
     Returns:
         dict: Migration results
@@ -237,6 +497,7 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
         "tables_created": [],
         "outlets_added": [],
         "structural_updates": [],
+        "migrations_applied": [],
         "counts": {}
     }
     
@@ -245,48 +506,18 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
         if app_context is None:
             app = create_app_for_migration()
             with app.app_context():
-                return run_migration(app, drop_existing, verbose)
-        
-        # Get database URL for raw SQL operations
-        database_url = os.environ.get('DATABASE_URL')
-        
-        # First, check for structural updates needed (only if not dropping)
-        if not drop_existing:
-            log("🔧 Checking for required structural updates...")
-            structural_updates = check_and_update_table_structure(database_url, verbose)
-            results["structural_updates"] = structural_updates
+                return run_migration(app, drop_existing, verbose, force)
         
         if drop_existing:
             log("🗑️ Dropping existing tables...")
-            db.drop_all()
+            db.drop_all(bind_key=None)
+            with db.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {SCHEMA_VERSION_TABLE}"))
             log("✅ Existing tables dropped")
         
-        # Create all tables using SQLAlchemy
-        log("📊 Creating/verifying database tables...")
-        db.create_all()
-        
-        # Track created tables
-        tables_created = ['users', 'news_outlets', 'requests', 'responses', 'transcripts']
-        results["tables_created"] = tables_created
-        log(f"✅ Created/verified tables: {', '.join(tables_created)}")
-        
-        # Initialize default news outlets
-        log("📰 Adding default news outlets...")
-        outlets_added = []
-        
-        for outlet_name, outlet_info in AVAILABLE_OUTLETS.items():
-            existing = NewsOutlet.query.filter_by(name=outlet_name).first()
-            if not existing:
-                outlet = NewsOutlet(name=outlet_name)
-                db.session.add(outlet)
-                outlets_added.append(outlet_name)
-                log(f"  ✅ Added outlet: {outlet_name}")
-            else:
-                log(f"  ℹ️ Outlet already exists: {outlet_name}")
-        
-        # Commit changes
-        db.session.commit()
-        log("💾 Changes committed to database")
+        version = current_schema_version()
+        log(f"📐 Schema version {version}, latest {LATEST_SCHEMA_VERSION}")
+        results.update(apply_migrations(verbose, force))
         
         # Get final counts
         counts = {
@@ -297,7 +528,6 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
             "transcripts": Transcript.query.count()
         }
         results["counts"] = counts
-        results["outlets_added"] = outlets_added
         
         log("\n✅ Database migration completed successfully!")
         log(f"📊 Final table counts:")
@@ -306,15 +536,15 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
         
         # Create summary message
         message_parts = []
-        if results["tables_created"]:
-            message_parts.append(f"Verified {len(results['tables_created'])} tables")
+        if results["migrations_applied"]:
+            message_parts.append(f"applied {len(results['migrations_applied'])} migrations (schema version {results['schema_version']})")
         if results["outlets_added"]:
             message_parts.append(f"added {len(results['outlets_added'])} outlets")
         if results["structural_updates"]:
-            message_parts.append(f"applied {len(results['structural_updates'])} structural updates")
+            message_parts.append(f"made {len(results['structural_updates'])} structural updates")
         
         results["success"] = True
-        results["message"] = f"Migration completed successfully. {', '.join(message_parts) if message_parts else 'No changes needed'}."
+        results["message"] = f"Migration completed successfully. {', '.join(message_parts) if message_parts else 'Schema is current'}."
         
         return results
         
@@ -332,6 +562,28 @@ def run_migration(app_context=None, drop_existing=False, verbose=True):
         results["message"] = error_msg
         return results
 
+def check_schema_on_boot(app, migrate=MIGRATE_ON_BOOT):
+    """
+    Web app startup: a single schema version query, and nothing else when the schema is current.
+    Behind it either migrates (MIGRATE_ON_BOOT) or only reports, leaving it to `python migrate_db.py`.
+    """
+    with app.app_context():
+        version = current_schema_version()
+        status = {"version": version, "latest": LATEST_SCHEMA_VERSION, "current": version >= LATEST_SCHEMA_VERSION, "migration": None}
+        if not status["current"] and migrate:
+            status["migration"] = run_migration(app, drop_existing=False, verbose=False)
+        return status
+
+def show_status():
+    app = create_app_for_migration()
+    with app.app_context():
+        version = current_schema_version()
+    print(f"📐 Schema version: {version} (latest {LATEST_SCHEMA_VERSION})")
+    for step_version, description, _, postgres_only in MIGRATIONS:
+        mark = "✅" if step_version <= version else "⏳"
+        print(f"  {mark} {step_version}. {description}{' (PostgreSQL only)' if postgres_only else ''}")
+    return version
+
 def migrate_database_standalone():
     """Run migration as standalone script"""
     print("🚀 Starting PR-Connect Database Migration")
@@ -339,7 +591,11 @@ def migrate_database_standalone():
     
     # Parse command line arguments
     drop_existing = '--drop' in sys.argv
-    incremental_only = '--incremental' in sys.argv
+    force = '--force' in sys.argv
+    
+    if '--status' in sys.argv:
+        version = show_status()
+        exit(0 if version >= LATEST_SCHEMA_VERSION else 1)
     
     if drop_existing:
         print("⚠️ WARNING: Will drop existing tables!")
@@ -347,51 +603,36 @@ def migrate_database_standalone():
         if response.lower() != 'yes':
             print("Migration cancelled.")
             exit(0)
-    elif incremental_only:
-        print("🔧 Running incremental updates only (table structure fixes)")
+    elif force:
+        print("🔁 Re-running every migration step (--force)")
     else:
-        print("ℹ️ Running safe migration (will not drop existing tables)")
+        print("ℹ️ Applying pending migrations (will not drop existing tables)")
+        print("   Use --status to list migrations, --force to re-run all of them")
         print("   Use --drop flag to drop existing tables")
-        print("   Use --incremental flag for structure updates only")
     
     print("=" * 70)
     
-    if incremental_only:
-        # Run only structural updates
-        database_url = os.environ.get('DATABASE_URL')
-        if not database_url:
-            print("❌ ERROR: DATABASE_URL environment variable not found!")
-            exit(1)
-        
-        updates = check_and_update_table_structure(database_url, verbose=True)
-        print("=" * 70)
-        if updates:
-            print(f"🎉 Applied {len(updates)} structural updates!")
-        else:
-            print("✅ No structural updates needed!")
+    results = run_migration(drop_existing=drop_existing, verbose=True, force=force)
+    print("=" * 70)
+    
+    if results["success"]:
+        print("🎉 Migration completed successfully!")
+        print(f"📈 Summary: {results['message']}")
+        if results["structural_updates"]:
+            print(f"🔧 Structural updates: {len(results['structural_updates'])}")
+        exit(0)
     else:
-        # Run full migration
-        results = run_migration(drop_existing=drop_existing, verbose=True)
-        print("=" * 70)
-        
-        if results["success"]:
-            print("🎉 Migration completed successfully!")
-            print(f"📈 Summary: {results['message']}")
-            if results["structural_updates"]:
-                print(f"🔧 Structural updates: {len(results['structural_updates'])}")
-            exit(0)
-        else:
-            print("💥 Migration failed!")
-            print(f"❌ Error: {results['message']}")
-            exit(1)
+        print("💥 Migration failed!")
+        print(f"❌ Error: {results['message']}")
+        exit(1)
 
 def initialize_database_for_api(app):
     """
     Initialize database from API endpoint
-    (Safe version - doesn't drop existing tables)
+    (Safe version - doesn't drop existing tables, applies pending migrations)
     """
     with app.app_context():
         return run_migration(app, drop_existing=False, verbose=False)
 
 if __name__ == '__main__':
-    migrate_database_standalone() 
\ No newline at end of file
+    migrate_database_standalone()
@@ -5,13 +5,18 @@ Matches the PostgreSQL schema on Render
 
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from password_hashing import hash_password, verify_password, needs_rehash
+from text_storage import CompressedText
+from db_routing import RoutingSession
 
-db = SQLAlchemy()
+# Read-only endpoints may route SELECTs to a replica (see db_routing)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 class NewsOutlet(db.Model):
     """News outlets table - stores available media outlets"""
     __tablename__ = 'news_outlets'
+    # Named so migrate_db can tell whether older databases already have it
+    __table_args__ = (db.UniqueConstraint('name', name='uq_news_outlets_name'),)
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -74,7 +79,7 @@ class Response(db.Model):
     __tablename__ = 'responses'
     
     id = db.Column(db.Integer, primary_key=True)
-    body = db.Column(db.String(2000), nullable=False)
+    body = db.Column(CompressedText, nullable=False)  # Unbounded, compressed above threshold
     request_id = db.Column(db.Integer, db.ForeignKey('requests.id'), nullable=False)
     
     # Additional fields for our application
@@ -100,7 +105,7 @@ class Transcript(db.Model):
     __tablename__ = 'transcripts'
     
     id = db.Column(db.Integer, primary_key=True)
-    text = db.Column(db.Text, nullable=False)
+    text = db.Column(CompressedText, nullable=False)  # Unbounded, compressed above threshold
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Made nullable for existing data
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     word_count = db.Column(db.Integer)
@@ -108,20 +113,102 @@ class Transcript(db.Model):
     
     # Relationship to user
     user = db.relationship('User', backref='transcripts', lazy=True)
+    # Dictation chunks appended since the text was last folded (see fold_chunks)
+    chunks = db.relationship('TranscriptChunk', lazy=True, order_by='TranscriptChunk.id',
+                             cascade='all, delete-orphan')
+    
+    PREVIEW_LENGTH = 100
     
     def __repr__(self):
         return f'<Transcript {self.id}>'
     
-    def to_dict(self):
+    @classmethod
+    def make_preview(cls, text):
+        """Preview shown in transcript listings"""
+        if not text:
+            return ''
+        return text[:cls.PREVIEW_LENGTH] + '...' if len(text) > cls.PREVIEW_LENGTH else text
+    
+    @staticmethod
+    def join_chunk(existing, chunk):
+        """Chunks are separate phrases; join with a space unless one side already has it"""
+        if not existing:
+            return chunk or ''
+        if not chunk:
+            return existing
+        separator = '' if existing[-1].isspace() or chunk[0].isspace() else ' '
+        return existing + separator + chunk
+    
+    def set_text(self, text):
+        """Set the full text and compute the stored word count and preview"""
+        self.text = text
+        self.word_count = len(text.split()) if text else 0
+        self.preview = self.make_preview(text)
+    
+    def append_text(self, chunk):
+        """
+        Append a dictation chunk as a pending row, updating the stats incrementally
+        The stored text is not loaded or rewritten; fold_chunks merges pending chunks later.
+        """
+        if not chunk:
+            return
+        if self.word_count is None:
+            # Rows written before stats were computed at write time
+            self.set_text(self.full_text())
+        self.chunks.append(TranscriptChunk(text=chunk))
+        self.word_count = (self.word_count or 0) + len(chunk.split())
+        # A preview no longer than PREVIEW_LENGTH is the whole text so far
+        preview = self.preview or ''
+        if len(preview) <= self.PREVIEW_LENGTH:
+            self.preview = self.make_preview(self.join_chunk(preview, chunk))
+    
+    def full_text(self):
+        """Stored text followed by any chunks not folded into it yet"""
+        text = self.text or ''
+        for chunk in self.chunks:
+            text = self.join_chunk(text, chunk.text)
+        return text
+    
+    def fold_chunks(self):
+        """Merge pending chunks into the stored text; returns False when there were none"""
+        if not self.chunks:
+            return False
+        self.set_text(self.full_text())
+        self.chunks.clear()
+        return True
+    
+    def to_summary_dict(self):
+        """Listing representation built from stored columns only (never touches text)"""
         return {
             'id': self.id,
-            'text': self.text,
             'user_id': self.user_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'word_count': len(self.text.split()) if self.text else 0,
-            'preview': self.text[:100] + '...' if len(self.text) > 100 else self.text,
-            'user': self.user.to_dict() if self.user else None
+            'word_count': self.word_count or 0,
+            'preview': self.preview or ''
         }
+    
+    def to_dict(self):
+        data = self.to_summary_dict()
+        text = self.full_text()
+        data['text'] = text
+        if self.word_count is None:
+            # Rows written before stats were computed at write time
+            data['word_count'] = len(text.split()) if text else 0
+            data['preview'] = self.make_preview(text)
+        data['user'] = self.user.to_dict() if self.user else None
+        return data
+
+class TranscriptChunk(db.Model):
+    """Dictation chunks appended to a transcript and not yet folded into its text"""
+    __tablename__ = 'transcript_chunks'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    transcript_id = db.Column(db.Integer, db.ForeignKey('transcripts.id'), nullable=False, index=True)
+    text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TranscriptChunk {self.id} of transcript {self.transcript_id}>'
 
 class User(db.Model):
     """Users table for authentication and profile management"""
@@ -134,6 +221,8 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     is_admin = db.Column(db.Boolean, default=False)
+    # Bumped to revoke every token issued before (deactivation, demotion, password change)
+    token_version = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -145,12 +234,16 @@ class User(db.Model):
         return f'<User {self.email}>'
     
     def set_password(self, password):
-        """Hash and set the user's password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set the user's password (runs on the password hashing pool)"""
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Check if provided password matches the hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Whether the stored hash predates the configured algorithm/cost"""
+        return needs_rehash(self.password_hash)
     
     def to_dict(self, include_sensitive=False):
         data = {
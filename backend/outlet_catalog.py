@@ -0,0 +1,129 @@
+"""
+Outlet catalog for PR-Connect
+An in-memory index of the news_outlets rows by name and id, next to the outlet metadata
+from outlet_styles. The index is loaded once and updated when an outlet is created, so /generate
+and /api/outlets only touch the table for outlets they have never seen. Outlets are created
+with an insert that ignores the unique name conflict, so concurrent requests for a new
+outlet end up with the same row instead of duplicates.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, NewsOutlet
+# Static outlet metadata, re-exported for the web app
+from outlet_styles import OUTLETS, AVAILABLE_OUTLETS, DEFAULT_OUTLET, PUBLIC_FIELDS, outlet_info, public_outlet_info
+
+# Seconds before another worker's new outlets are picked up by this one
+OUTLET_CATALOG_TTL = float(os.environ.get('OUTLET_CATALOG_TTL', 300))
+
+
+def _insert_ignoring_conflict(conn, name):
+    """INSERT ... ON CONFLICT DO NOTHING where the dialect has it, else insert and catch the conflict"""
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        try:
+            with conn.begin_nested():
+                conn.execute(db.insert(NewsOutlet).values(name=name))
+        except IntegrityError:
+            pass
+        return
+    conn.execute(insert(NewsOutlet).values(name=name).on_conflict_do_nothing())
+
+
+class OutletCatalog:
+    """news_outlets rows indexed by name and id (thread-safe)"""
+
+    def __init__(self, ttl=OUTLET_CATALOG_TTL):
+        self.ttl = ttl
+        self._by_name = {}
+        self._by_id = {}
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+    def load(self):
+        """(Re)load every outlet row; needs an app context"""
+        rows = db.session.execute(db.select(NewsOutlet.id, NewsOutlet.name).order_by(NewsOutlet.id)).all()
+        by_name, by_id = {}, {}
+        for outlet_id, name in rows:
+            # Rows duplicated before names were unique: the oldest one wins
+            by_name.setdefault(name, outlet_id)
+            by_id[outlet_id] = name
+        with self._lock:
+            self._by_name, self._by_id = by_name, by_id
+            self._loaded_at = time.monotonic()
+        return len(by_id)
+
+    def _current(self):
+        with self._lock:
+            stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+        if stale:
+            self.load()
+
+    def id_for(self, name):
+        """Row id for an outlet name, creating the row if it doesn't exist yet"""
+        self._current()
+        outlet_id = self._by_name.get(name)
+        if outlet_id is not None:
+            return outlet_id
+        # On its own connection so the row exists even if the caller's transaction rolls back
+        with db.engine.begin() as conn:
+            _insert_ignoring_conflict(conn, name)
+            outlet_id = conn.execute(
+                db.select(NewsOutlet.id).where(NewsOutlet.name == name).order_by(NewsOutlet.id).limit(1)
+            ).scalar_one()
+        with self._lock:
+            self._by_name.setdefault(name, outlet_id)
+            self._by_id[outlet_id] = name
+        return self._by_name[name]
+
+    def ids_for(self, names):
+        """{name: id} for several outlets. Resolve before writing: creating one uses a second connection"""
+        return {name: self.id_for(name) for name in dict.fromkeys(names)}
+
+    def name_for(self, outlet_id):
+        self._current()
+        return self._by_id.get(outlet_id)
+
+    def names(self):
+        """Outlet names in row order"""
+        self._current()
+        with self._lock:
+            return [self._by_id[outlet_id] for outlet_id in sorted(self._by_id)
+                    if self._by_name.get(self._by_id[outlet_id]) == outlet_id]
+
+    def version(self):
+        """Changes whenever the /api/outlets body does: outlets added or renamed, or their metadata edited"""
+        return tuple(
+            (name, tuple(info[field] for field in PUBLIC_FIELDS))
+            for name, info in self.payload().items()
+        )
+
+    def payload(self):
+        """/api/outlets body: every stored outlet, or the built-in ones before any are stored"""
+        names = self.names()
+        if not names:
+            return dict(AVAILABLE_OUTLETS)
+        return {name: public_outlet_info(name) for name in names}
+
+    def seed(self, names=OUTLETS):
+        """Create any missing built-in outlets; returns the names that were added"""
+        self._current()
+        missing = [name for name in names if name not in self._by_name]
+        for name in missing:
+            self.id_for(name)
+        return missing
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+
+outlet_catalog = OutletCatalog()
@@ -0,0 +1,75 @@
+"""
+Outlet styles for PR-Connect
+Metadata for the built-in outlets: what /api/outlets shows, the tone stored with each release
+and the agent's writing instructions. Kept apart from the outlet catalog so the agent and the
+local engine can use it without importing the database layer.
+"""
+
+DEFAULT_OUTLET = "General"
+PUBLIC_FIELDS = ("description", "audience", "icon")
+
+OUTLETS = {
+    "TechCrunch": {
+        "description": "Tech-focused, startup-friendly coverage",
+        "audience": "Developers, entrepreneurs, tech industry",
+        "icon": "⚡",
+        "tone": "Direct, tech-focused, startup-friendly",
+        "style": "Bold headlines, focus on innovation and market disruption",
+        "instructions": "Write a professional press release in TechCrunch style: tech-focused, startup-friendly, emphasize innovation and market disruption. Use markdown formatting with bold headings (##) and bullet points. Target 300-500 words. Focus on technical achievements and business impact."
+    },
+    "The Verge": {
+        "description": "Consumer tech and digital lifestyle",
+        "audience": "Tech consumers, early adopters",
+        "icon": "📱",
+        "tone": "Consumer-focused, accessible tech coverage",
+        "style": "Engaging, lifestyle-oriented tech angle",
+        "instructions": "Write a professional press release in The Verge style: consumer-focused, accessible tech coverage with engaging narrative. Use markdown formatting with clear headings (##) and focus on human aspects of technology. Target 400-600 words. Make it engaging and relatable."
+    },
+    "Forbes": {
+        "description": "Business and financial perspective",
+        "audience": "Executives, investors, business leaders",
+        "icon": "💼",
+        "tone": "Business-focused, executive perspective",
+        "style": "Professional, market impact, financial implications",
+        "instructions": "Write a professional press release in Forbes style: business-focused, executive perspective, emphasize market impact and financial implications. Use markdown formatting with professional headings (##). Target 500-800 words. Focus on business strategy and market positioning."
+    },
+    "General": {
+        "description": "Broad appeal, standard format",
+        "audience": "General public, all media outlets",
+        "icon": "📰",
+        "tone": "Balanced, broad appeal",
+        "style": "Standard press release format, accessible to all audiences",
+        "instructions": "Write a professional press release in standard format: balanced tone, broad appeal, accessible to all audiences. Use markdown formatting with clear headings (##) and bullet points. Follow traditional PR structure with headline, dateline, body paragraphs, and contact info. Target 400-600 words."
+    },
+    "Adevarul": {
+        "description": "Romanian news perspective, factual reporting",
+        "audience": "Romanian readers, local news consumers",
+        "icon": "🇷🇴",
+        "tone": "Romanian news perspective, factual reporting",
+        "style": "Straightforward news reporting, local angle",
+        "instructions": "Write a professional press release in Romanian news style: factual reporting, straightforward news format with local perspective. Use markdown formatting with clear headings (##). Target 300-500 words. Objective and informative tone."
+    },
+    "CNN": {
+        "description": "Breaking news format, broad appeal",
+        "audience": "Global news consumers, current events followers",
+        "icon": "📺",
+        "tone": "News-focused, broad appeal",
+        "style": "Breaking news format, impact-focused",
+        "instructions": "Write a professional press release in CNN news style: breaking news format, broad appeal, focus on impact and implications. Use markdown formatting with bold headings (##). Target 400-600 words. Clear, authoritative reporting tone."
+    }
+}
+
+# What /api/outlets shows for the built-in outlets
+AVAILABLE_OUTLETS = {name: {field: info[field] for field in PUBLIC_FIELDS} for name, info in OUTLETS.items()}
+
+
+def outlet_info(name):
+    """Metadata for an outlet; outlets added by users get General's style under their own name"""
+    info = OUTLETS.get(name)
+    if info is None:
+        info = dict(OUTLETS[DEFAULT_OUTLET], description=f"Coverage for {name}", audience="General audience")
+    return info
+
+
+def public_outlet_info(name):
+    return AVAILABLE_OUTLETS.get(name) or {field: outlet_info(name)[field] for field in PUBLIC_FIELDS}
@@ -0,0 +1,75 @@
+"""
+Password hashing for PR-Connect
+Runs Werkzeug's hash functions on a bounded worker pool with a configurable algorithm
+and cost, and tells callers when a stored hash should be upgraded
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# Werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000"
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+# hashlib's scrypt/pbkdf2 release the GIL, so threads give real parallelism; the pool
+# size caps how many hashes can burn CPU at once regardless of web worker threads
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR', 'thread')  # "thread" or "process"
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 30))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def normalize_method(method):
+    """Expand a method to Werkzeug's fully parameterized form so hashes can be compared"""
+    parts = method.split(':')
+    if parts[0] == 'scrypt':
+        n, r, p = (parts[1:] + ['32768', '8', '1'][len(parts) - 1:])[:3]
+        return f"scrypt:{n}:{r}:{p}"
+    if parts[0] == 'pbkdf2':
+        hash_name = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = parts[2] if len(parts) > 2 else str(DEFAULT_PBKDF2_ITERATIONS)
+        return f"pbkdf2:{hash_name}:{iterations}"
+    return method
+
+
+def get_executor():
+    """Shared worker pool, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if PASSWORD_HASH_EXECUTOR == 'process':
+                    _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS,
+                                                   thread_name_prefix='password-hash')
+    return _executor
+
+
+def hash_password(password, method=None):
+    """Hash a password on the worker pool with the configured (or given) method"""
+    future = get_executor().submit(
+        generate_password_hash, password,
+        normalize_method(method or PASSWORD_HASH_METHOD), PASSWORD_SALT_LENGTH
+    )
+    return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+
+
+def verify_password(pwhash, password):
+    """Check a password against a stored hash on the worker pool"""
+    if not pwhash:
+        return False
+    future = get_executor().submit(check_password_hash, pwhash, password)
+    return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+
+
+def needs_rehash(pwhash, method=None):
+    """True if a stored hash was made with a different algorithm or cost than configured"""
+    if not pwhash or pwhash.count('$') < 2:
+        return True
+    stored_method = pwhash.split('$', 1)[0]
+    return normalize_method(stored_method) != normalize_method(method or PASSWORD_HASH_METHOD)
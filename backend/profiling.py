@@ -0,0 +1,270 @@
+"""
+On-demand request profiling for PR-Connect
+An admin flags a single request (X-Profile header or ?profile=...) to run it under cProfile
+("cprofile", the default) or a low-overhead stack sampler ("sample"). SQL statements issued
+by the request's thread are captured alongside. Profiles are kept in memory (and optionally
+as .prof files) for the /api/admin/profiles endpoints. Unflagged requests only pay for one
+header/argument lookup: no profiler or SQL listener is installed unless a request asks.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_PARAM = 'profile'
+PROFILE_MODES = ('cprofile', 'sample')
+PROFILE_STORE_SIZE = int(os.environ.get('PROFILE_STORE_SIZE', 50))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5))
+# Also dump cProfile stats here (open with snakeviz / pstats); unset keeps profiles in memory only
+PROFILE_DIR = os.environ.get('PROFILE_DIR')
+MAX_SQL_STATEMENTS = 500
+TOP_FUNCTIONS = 30
+
+
+def requested_profile_mode():
+    """Profiler mode asked for by the current request, or None"""
+    value = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_PARAM)
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in ('0', 'false', 'no', 'off'):
+        return None
+    return value if value in PROFILE_MODES else 'cprofile'
+
+
+class SQLCapture:
+    """Records statements executed on the current thread while installed"""
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.statements = []
+        self.truncated = 0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self.thread_id:
+            conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != self.thread_id:
+            return
+        starts = conn.info.get('profile_query_start')
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        if len(self.statements) >= MAX_SQL_STATEMENTS:
+            self.truncated += 1
+            return
+        self.statements.append({
+            "statement": statement,
+            "parameters": repr(parameters)[:300],
+            "duration_ms": round(duration_ms, 3),
+            "rows": cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None,
+            "executemany": executemany
+        })
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self._before)
+        event.listen(Engine, 'after_cursor_execute', self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'before_cursor_execute', self._before)
+        event.remove(Engine, 'after_cursor_execute', self._after)
+        return False
+
+    def summary(self):
+        return {
+            "count": len(self.statements) + self.truncated,
+            "total_ms": round(sum(s["duration_ms"] for s in self.statements), 3),
+            "truncated": self.truncated,
+            "statements": self.statements
+        }
+
+
+def _frame_key(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})", code.co_filename
+
+
+class StackSampler:
+    """Samples one thread's stack from a helper thread; cost is independent of call count"""
+
+    def __init__(self, thread_id, interval_ms=PROFILE_SAMPLE_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.self_samples = Counter()
+        self.total_samples = Counter()
+        self.samples = 0
+        self.files = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            seen = set()
+            leaf = True
+            while frame is not None:
+                key, filename = _frame_key(frame.f_code)
+                self.files[key] = filename
+                if leaf:
+                    self.self_samples[key] += 1
+                    leaf = False
+                if key not in seen:
+                    # Recursive frames count once per sample
+                    self.total_samples[key] += 1
+                    seen.add(key)
+                frame = frame.f_back
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def top_functions(self, sort='cumulative', limit=TOP_FUNCTIONS):
+        counts = self.total_samples if sort == 'cumulative' else self.self_samples
+        return [{
+            "function": key,
+            "file": self.files.get(key),
+            "calls": None,
+            "self_ms": round(self.self_samples[key] * self.interval * 1000, 1),
+            "cumulative_ms": round(self.total_samples[key] * self.interval * 1000, 1),
+            "samples": self.total_samples[key]
+        } for key, _ in counts.most_common(limit)]
+
+
+def _cprofile_top_functions(profiler, sort='cumulative', limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats('cumulative' if sort == 'cumulative' else 'tottime')
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, calls, self_time, cumulative_time, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            "function": f"{name} ({os.path.basename(filename)}:{line})",
+            "file": filename,
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3)
+        })
+    return rows
+
+
+class ProfileStore:
+    """Bounded, thread-safe store of the most recent profiles"""
+
+    def __init__(self, max_size=PROFILE_STORE_SIZE):
+        self.max_size = max_size
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles[profile["id"]] = profile
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def summaries(self):
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [{key: p[key] for key in ("id", "mode", "method", "path", "user_id", "status",
+                                        "duration_ms", "sql_count", "sql_ms", "created_at")}
+                for p in reversed(profiles)]
+
+
+profile_store = ProfileStore()
+# One deterministic profiler per process at a time (Python 3.12+ refuses a second one)
+_cprofile_lock = threading.Lock()
+
+
+def _response_status(result):
+    if isinstance(result, tuple) and len(result) > 1 and isinstance(result[1], int):
+        return result[1]
+    return getattr(result, 'status_code', 200)
+
+
+def run_profiled(mode, view, *args, **kwargs):
+    """Call a view under the requested profiler and store the result; returns the view's result"""
+    profile_id = uuid.uuid4().hex[:12]
+    if mode == 'cprofile' and not _cprofile_lock.acquire(blocking=False):
+        mode = 'sample'
+    sampler = StackSampler(threading.get_ident()) if mode == 'sample' else None
+    profiler = cProfile.Profile() if mode == 'cprofile' else None
+
+    start = time.perf_counter()
+    try:
+        with SQLCapture() as sql:
+            if profiler is not None:
+                result = profiler.runcall(view, *args, **kwargs)
+            else:
+                with sampler:
+                    result = view(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            _cprofile_lock.release()
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    if profiler is not None:
+        top_by_cumulative = _cprofile_top_functions(profiler, 'cumulative')
+        top_by_self = _cprofile_top_functions(profiler, 'self')
+        if PROFILE_DIR:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f"{profile_id}.prof"))
+    else:
+        top_by_cumulative = sampler.top_functions('cumulative')
+        top_by_self = sampler.top_functions('self')
+
+    sql_summary = sql.summary()
+    current_user = getattr(request, 'current_user', None) or {}
+    profile_store.add({
+        "id": profile_id,
+        "mode": mode,
+        "method": request.method,
+        "path": request.full_path.rstrip('?'),
+        "user_id": current_user.get('user_id'),
+        "request_id": g.get('request_id'),
+        "status": _response_status(result),
+        "duration_ms": round(duration_ms, 3),
+        "sql_count": sql_summary["count"],
+        "sql_ms": sql_summary["total_ms"],
+        "created_at": datetime.utcnow().isoformat(),
+        "samples": sampler.samples if sampler is not None else None,
+        "top_cumulative": top_by_cumulative,
+        "top_self": top_by_self,
+        "sql": sql_summary
+    })
+    g.profile_id = profile_id
+    return result
+
+
+def init_profiling(app):
+    """Expose the id of a stored profile on the profiled response"""
+
+    @app.after_request
+    def add_profile_header(response):
+        profile_id = g.get('profile_id')
+        if profile_id:
+            response.headers['X-Profile-ID'] = profile_id
+        return response
@@ -0,0 +1,284 @@
+"""
+Full-text search index for PR-Connect
+Indexes briefs (requests), generated releases (responses) and transcripts.
+PostgreSQL uses a tsvector column with a GIN index, SQLite uses an FTS5 table.
+The index is maintained by the application in the same transaction as the rows it mirrors.
+"""
+
+import html
+import re
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from models import Request, Transcript
+from outlet_catalog import outlet_catalog
+
+SEARCH_TABLE = 'search_documents'
+SEARCH_LANGUAGE = 'english'
+# Order is part of the SQLite rowid scheme (_fts_rowid): append new types, never reorder
+DOC_TYPES = ('request', 'response', 'transcript')
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+# The database marks matches with private-use sentinels; snippets are HTML-escaped before
+# they become <mark> tags, so indexed text can never inject markup into a results page
+_SENTINEL_START = '\ue000'
+_SENTINEL_STOP = '\ue001'
+_SENTINELS = str.maketrans('', '', _SENTINEL_START + _SENTINEL_STOP)
+
+# Binds whose search table is known to exist. A CREATE only counts once its transaction
+# commits; until then it is pending in session.info
+_ensured_binds = set()
+_PENDING_KEY = 'search_index_pending_binds'
+
+@event.listens_for(Session, 'after_commit')
+def _remember_created_binds(session):
+    _ensured_binds.update(session.info.pop(_PENDING_KEY, ()))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_pending_binds(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+def _dialect_name(session):
+    return session.get_bind().dialect.name
+
+def _fts_rowid(doc_type, doc_id):
+    """SQLite rowid for a document: replacing or removing it is a rowid lookup, not a table scan"""
+    return int(doc_id) * len(DOC_TYPES) + DOC_TYPES.index(doc_type)
+
+def ensure_search_index(session):
+    """Create the search table and indexes if they don't exist yet"""
+    bind = session.get_bind()
+    if bind.url in _ensured_binds:
+        return
+
+    if bind.dialect.name == 'postgresql':
+        session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+                doc_type VARCHAR(20) NOT NULL,
+                doc_id INTEGER NOT NULL,
+                parent_id INTEGER,
+                user_id INTEGER,
+                title TEXT,
+                body TEXT,
+                created_at TIMESTAMP,
+                document TSVECTOR,
+                PRIMARY KEY (doc_type, doc_id)
+            )
+        """))
+        session.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document
+            ON {SEARCH_TABLE} USING GIN (document)
+        """))
+        session.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_user_id
+            ON {SEARCH_TABLE} (user_id)
+        """))
+    else:
+        session.execute(text(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+                title, body,
+                doc_type UNINDEXED, doc_id UNINDEXED, parent_id UNINDEXED,
+                user_id UNINDEXED, created_at UNINDEXED,
+                tokenize = 'porter unicode61'
+            )
+        """))
+
+    session.info.setdefault(_PENDING_KEY, set()).add(bind.url)
+
+def index_document(session, doc_type, doc_id, user_id, title, body, created_at=None, parent_id=None):
+    """Insert or replace a single document in the search index"""
+    ensure_search_index(session)
+    params = {
+        "doc_type": doc_type,
+        "doc_id": doc_id,
+        "parent_id": parent_id,
+        "user_id": user_id,
+        "title": title or '',
+        "body": (body or '').translate(_SENTINELS),
+        "created_at": created_at,
+        "language": SEARCH_LANGUAGE
+    }
+
+    if _dialect_name(session) == 'postgresql':
+        session.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (doc_type, doc_id, parent_id, user_id, title, body, created_at, document)
+            VALUES (:doc_type, :doc_id, :parent_id, :user_id, :title, :body, :created_at,
+                    setweight(to_tsvector(CAST(:language AS regconfig), :title), 'A') ||
+                    setweight(to_tsvector(CAST(:language AS regconfig), :body), 'B'))
+            ON CONFLICT (doc_type, doc_id) DO UPDATE SET
+                parent_id = EXCLUDED.parent_id,
+                user_id = EXCLUDED.user_id,
+                title = EXCLUDED.title,
+                body = EXCLUDED.body,
+                created_at = EXCLUDED.created_at,
+                document = EXCLUDED.document
+        """), params)
+    else:
+        # FTS5 tables have no unique constraint: rows are keyed by rowid and replaced by delete + insert
+        params["rowid"] = _fts_rowid(doc_type, doc_id)
+        session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), params)
+        params["created_at"] = created_at.isoformat() if created_at else None
+        session.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (rowid, title, body, doc_type, doc_id, parent_id, user_id, created_at)
+            VALUES (:rowid, :title, :body, :doc_type, :doc_id, :parent_id, :user_id, :created_at)
+        """), params)
+
+def remove_documents(session, doc_type, doc_ids):
+    """Remove documents of one type from the search index"""
+    doc_ids = [doc_id for doc_id in doc_ids if doc_id is not None]
+    if not doc_ids:
+        return
+    ensure_search_index(session)
+
+    placeholders = ', '.join(f':id_{i}' for i in range(len(doc_ids)))
+    if _dialect_name(session) == 'postgresql':
+        params = {f'id_{i}': doc_id for i, doc_id in enumerate(doc_ids)}
+        params["doc_type"] = doc_type
+        session.execute(text(f"""
+            DELETE FROM {SEARCH_TABLE}
+            WHERE doc_type = :doc_type AND doc_id IN ({placeholders})
+        """), params)
+    else:
+        params = {f'id_{i}': _fts_rowid(doc_type, doc_id) for i, doc_id in enumerate(doc_ids)}
+        session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})"), params)
+
+def index_request(session, req):
+    """Index a press release brief"""
+    body = '\n'.join(part for part in [req.body, req.company_name, req.category, req.additional_notes] if part)
+    index_document(session, 'request', req.id, req.user_id, req.title, body, req.created_at)
+
+def index_response(session, resp, req):
+    """Index a generated release under its parent request"""
+    outlet_name = outlet_catalog.name_for(req.news_outlet_id)
+    title = f"{req.title} ({outlet_name})" if outlet_name else req.title
+    index_document(session, 'response', resp.id, req.user_id, title, resp.body,
+                   resp.created_at or req.created_at, parent_id=req.id)
+
+def index_transcript(session, transcript):
+    """Index a speech transcript"""
+    index_document(session, 'transcript', transcript.id, transcript.user_id,
+                   f"Transcript #{transcript.id}", transcript.full_text(), transcript.created_at)
+
+def _fts5_query(query):
+    """Turn free text into a safe FTS5 query (implicit AND, prefix match on the last term)"""
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def _highlight(snippet):
+    """HTML-escaped snippet with the sentinel-marked matches wrapped in <mark> tags"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_SENTINEL_START, HIGHLIGHT_START).replace(_SENTINEL_STOP, HIGHLIGHT_STOP)
+
+def search(session, query, user_id=None, doc_types=None, limit=20, offset=0):
+    """
+    Search the index and return ranked results with highlighted snippets
+
+    Args:
+        query: Free-text search string
+        user_id: Restrict results to one user (None searches all users)
+        doc_types: Optional list of document types to include
+        limit, offset: Paging
+
+    Returns:
+        list: Result dicts ordered by relevance; 'snippet' is escaped HTML, 'title' plain text
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    ensure_search_index(session)
+
+    params = {"limit": limit, "offset": offset, "language": SEARCH_LANGUAGE}
+    filters = []
+    if user_id is not None:
+        filters.append("user_id = :user_id")
+        params["user_id"] = user_id
+    if doc_types:
+        placeholders = ', '.join(f':type_{i}' for i in range(len(doc_types)))
+        filters.append(f"doc_type IN ({placeholders})")
+        params.update({f'type_{i}': doc_type for i, doc_type in enumerate(doc_types)})
+    extra_where = ''.join(f" AND {condition}" for condition in filters)
+
+    if _dialect_name(session) == 'postgresql':
+        params["query"] = query
+        rows = session.execute(text(f"""
+            SELECT doc_type, doc_id, parent_id, user_id, title, created_at,
+                   ts_rank_cd(document, q) AS rank,
+                   ts_headline(CAST(:language AS regconfig), body, q,
+                               'StartSel={_SENTINEL_START}, StopSel={_SENTINEL_STOP}, MaxFragments=2, MaxWords=30, MinWords=10') AS snippet
+            FROM {SEARCH_TABLE}, websearch_to_tsquery(CAST(:language AS regconfig), :query) q
+            WHERE document @@ q{extra_where}
+            ORDER BY rank DESC, created_at DESC
+            LIMIT :limit OFFSET :offset
+        """), params).fetchall()
+    else:
+        fts_query = _fts5_query(query)
+        if not fts_query:
+            return []
+        params["query"] = fts_query
+        # bm25() is lower-is-better; the title column is weighted above the body
+        rows = session.execute(text(f"""
+            SELECT doc_type, doc_id, parent_id, user_id, title, created_at,
+                   -bm25({SEARCH_TABLE}, 10.0, 1.0) AS rank,
+                   snippet({SEARCH_TABLE}, 1, '{_SENTINEL_START}', '{_SENTINEL_STOP}', '…', 24) AS snippet
+            FROM {SEARCH_TABLE}
+            WHERE {SEARCH_TABLE} MATCH :query{extra_where}
+            ORDER BY rank DESC
+            LIMIT :limit OFFSET :offset
+        """), params).fetchall()
+
+    results = []
+    for row in rows:
+        created_at = row.created_at
+        results.append({
+            'type': row.doc_type,
+            'id': int(row.doc_id),
+            'request_id': int(row.parent_id) if row.parent_id is not None else None,
+            'user_id': int(row.user_id) if row.user_id is not None else None,
+            'title': row.title,
+            'snippet': _highlight(row.snippet),
+            'rank': float(row.rank),
+            'created_at': created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
+        })
+    return results
+
+def search_document_count(session):
+    """Number of documents currently in the index"""
+    ensure_search_index(session)
+    return session.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar() or 0
+
+def rebuild_search_index(session, batch_size=500):
+    """Re-index every request, response and transcript (used by migrations)"""
+    ensure_search_index(session)
+    session.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    counts = {doc_type: 0 for doc_type in DOC_TYPES}
+
+    last_id = 0
+    while True:
+        batch = Request.query.filter(Request.id > last_id).order_by(Request.id).limit(batch_size).all()
+        if not batch:
+            break
+        for req in batch:
+            index_request(session, req)
+            counts['request'] += 1
+            for resp in req.responses:
+                index_response(session, resp, req)
+                counts['response'] += 1
+        last_id = batch[-1].id
+
+    last_id = 0
+    while True:
+        batch = Transcript.query.filter(Transcript.id > last_id).order_by(Transcript.id).limit(batch_size).all()
+        if not batch:
+            break
+        for transcript in batch:
+            index_transcript(session, transcript)
+            counts['transcript'] += 1
+        last_id = batch[-1].id
+
+    return counts
@@ -0,0 +1,44 @@
+"""
+Startup timing for PR-Connect
+Splits the web app's boot into phases (imports, Flask setup, database engine, routes, ...)
+and logs how long each took, so slow cold starts on Render show where the time goes.
+The clock starts when this module is imported, which app.py does first.
+"""
+
+import threading
+import time
+
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Consecutive boot phases and their durations (thread-safe)"""
+
+    def __init__(self, started=PROCESS_STARTED):
+        self.started = started
+        self._last = started
+        self._phases = []
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        """End the current phase: everything since the previous mark is attributed to it"""
+        now = time.perf_counter()
+        with self._lock:
+            self._phases.append((phase, (now - self._last) * 1000))
+            self._last = now
+
+    def phases(self):
+        with self._lock:
+            return [{"phase": phase, "ms": round(ms, 1)} for phase, ms in self._phases]
+
+    def total_ms(self):
+        with self._lock:
+            return round((self._last - self.started) * 1000, 1)
+
+    def summary(self):
+        """One log line: 'imports 412ms, flask 9ms, ... (total 450ms)'"""
+        parts = ', '.join(f"{p['phase']} {p['ms']:.0f}ms" for p in self.phases())
+        return f"{parts} (total {self.total_ms():.0f}ms)"
+
+
+startup_timer = StartupTimer()
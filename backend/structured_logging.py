@@ -0,0 +1,236 @@
+"""
+Structured logging for PR-Connect
+Log calls on the request path only enqueue a record; a background listener formats and
+writes it. Every record carries the request's correlation id, DEBUG/INFO can be sampled,
+and the most recent entries are kept in a lock-safe ring buffer for /api/debug/logs.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()  # "text" or "json"
+# Fraction of DEBUG/INFO records kept; warnings and errors are never sampled out
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_BUFFER_SIZE = int(os.environ.get('LOG_BUFFER_SIZE', 500))
+LOG_ACCESS = os.environ.get('LOG_ACCESS', 'true').lower() in ('1', 'true', 'yes')
+
+ROOT_LOGGER = 'prconnect'
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+# Agent round trips were historically logged as "SUCCESS"
+SUCCESS = 25
+logging.addLevelName(SUCCESS, 'SUCCESS')
+
+ENVIRONMENT = os.environ.get('RENDER_SERVICE_NAME', 'local')
+
+
+class LogRingBuffer:
+    """Fixed-size, thread-safe buffer of recent log entries"""
+
+    def __init__(self, max_size=LOG_BUFFER_SIZE):
+        self._entries = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            self.total += 1
+
+    def snapshot(self, level=None, request_id=None, limit=50):
+        """Newest-last entries, optionally at or above a level and for one request"""
+        min_level = logging.getLevelName(level.upper()) if level else None
+        if not isinstance(min_level, int):
+            min_level = None
+        with self._lock:
+            entries = list(self._entries)
+        if min_level is not None:
+            entries = [e for e in entries if e["levelno"] >= min_level]
+        if request_id:
+            entries = [e for e in entries if e["request_id"] == request_id]
+        return entries[-limit:] if limit else entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class ContextFilter(logging.Filter):
+    """Adds the request id and applies sampling (decided once per record)"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id') if has_request_context() else None
+        if not hasattr(record, 'sampled'):
+            rate = getattr(record, 'sample_rate', LOG_SAMPLE_RATE)
+            record.sampled = record.levelno >= logging.WARNING or rate >= 1 or random.random() < rate
+        return record.sampled
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps a dict per record in a LogRingBuffer (cheap; runs in the calling thread)"""
+
+    def __init__(self, buffer):
+        super().__init__()
+        self.buffer = buffer
+
+    def emit(self, record):
+        self.buffer.append({
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
+            "level": record.levelname,
+            "levelno": record.levelno,
+            "message": record.getMessage(),
+            "details": getattr(record, 'details', None),
+            "request_id": record.request_id,
+            "logger": record.name,
+            "environment": ENVIRONMENT
+        })
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records without formatting them; drops (and counts) when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only resolve what cannot cross threads safely: the message args and traceback
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, 'request_id', None)
+        }
+        details = getattr(record, 'details', None)
+        if details is not None:
+            entry["details"] = details
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+
+    def format(self, record):
+        line = f"[{record.levelname}] {record.getMessage()}"
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            line += f" (req={request_id})"
+        details = getattr(record, 'details', None)
+        if details is not None:
+            line += f"\nDetails: {details}"
+        if record.exc_text:
+            line += f"\n{record.exc_text}"
+        return line
+
+
+debug_log_buffer = LogRingBuffer()
+_queue_handler = None
+_listener = None
+
+
+def get_logger(name=None):
+    """Logger under the PR-Connect hierarchy"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}" if name else ROOT_LOGGER)
+
+
+def configure_logging():
+    """Install the queue and ring buffer handlers once per process"""
+    global _queue_handler, _listener
+    if _listener is not None:
+        return get_logger()
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    output = logging.StreamHandler()
+    output.setFormatter(JSONFormatter() if LOG_FORMAT == 'json' else TextFormatter())
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    context = ContextFilter()
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(context)
+    ring_handler = RingBufferHandler(debug_log_buffer)
+    ring_handler.addFilter(context)
+
+    logger = get_logger()
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(ring_handler)
+    logger.addHandler(_queue_handler)
+    logger.propagate = False
+    return logger
+
+
+def logging_stats():
+    """Queue depth and drop counts for diagnostics"""
+    return {
+        "queue_size": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "buffered": len(debug_log_buffer),
+        "total_logged": debug_log_buffer.total,
+        "sample_rate": LOG_SAMPLE_RATE,
+        "level": LOG_LEVEL
+    }
+
+
+def current_request_id():
+    return g.get('request_id') if has_request_context() else None
+
+
+def init_request_logging(app):
+    """Assign a correlation id to every request and log one access line per response"""
+    access_log = get_logger('access')
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = incoming if _REQUEST_ID_PATTERN.fullmatch(incoming) else uuid.uuid4().hex[:16]
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_access(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+        if LOG_ACCESS and request.method != 'OPTIONS':
+            duration_ms = (time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000
+            access_log.info("%s %s %s %.1fms", request.method, request.path, response.status_code, duration_ms)
+        return response
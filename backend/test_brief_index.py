@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test near-duplicate brief detection and reuse of earlier generations
+Covers MinHash grouping, catching up on requests stored by other workers and
+reuse_previous_generation against a SQLite database.
+
+Run: python -m pytest test_brief_index.py
+"""
+
+import brief_index
+from brief_index import BriefIndex, brief_text, catch_up_from_database
+from models import db, NewsOutlet, Request, Response, User
+from outlet_catalog import outlet_catalog
+
+TITLE = "Acme launches Orbit Pro"
+BODY = ("Acme Robotics today launched Orbit Pro, its next-generation warehouse robot. "
+        "The robot costs $49,000 and cuts picking time by 35% for mid-sized warehouses.")
+EDITED_BODY = BODY.replace("mid-sized warehouses", "mid-sized warehouses in Europe")
+
+
+def test_near_duplicates_group_per_user():
+    index = BriefIndex()
+    index.add([1, 2], 1, brief_text(TITLE, BODY))
+    index.add([3], 1, brief_text(TITLE, BODY))
+    index.add([4], 2, brief_text(TITLE, BODY))
+    index.add([5], 1, brief_text("Beta opens a bakery", "Beta Foods opened its first bakery in Cluj."))
+
+    assert index.group_for(2) == [1, 2, 3]
+    matches = index.query(brief_text(TITLE, EDITED_BODY), user_id=1)
+    assert [match["request_ids"] for match in matches] == [[1, 2, 3]]
+    assert matches[0]["similarity"] >= index.threshold
+    assert [match["request_ids"] for match in index.query(brief_text(TITLE, BODY), user_id=2)] == [[4]]
+
+    index.remove(4)
+    assert index.query(brief_text(TITLE, BODY), user_id=2) == []
+
+
+def test_catch_up_reads_other_workers_lower_ids(app):
+    outlet = NewsOutlet(name="CNN")
+    db.session.add(outlet)
+    db.session.flush()
+    rows = [Request(id=request_id, title=TITLE, body=BODY, news_outlet_id=outlet.id, user_id=1) for request_id in (1, 2, 3)]
+    db.session.add_all(rows)
+    db.session.commit()
+
+    index = BriefIndex()
+    assert catch_up_from_database(index) == 3
+    assert index.db_watermark == 3
+
+    # This worker stores request 10 while another worker's request 7 is not read yet
+    db.session.add(Request(id=10, title="Own brief", body="Stored here", news_outlet_id=outlet.id, user_id=1))
+    db.session.add(Request(id=7, title=TITLE, body=EDITED_BODY, news_outlet_id=outlet.id, user_id=2))
+    db.session.commit()
+    index.add([10], 1, brief_text("Own brief", "Stored here"))
+    assert index.db_watermark == 3
+
+    assert catch_up_from_database(index) == 1
+    assert index.is_indexed(7)
+    assert index.db_watermark == 10
+    assert catch_up_from_database(index) == 0
+
+
+def store_generation(backend, user, outlet_name, content):
+    req = Request(title=TITLE, body=BODY, news_outlet_id=outlet_catalog.id_for(outlet_name), user_id=user.id, company_name="Acme")
+    db.session.add(req)
+    db.session.flush()
+    db.session.add(Response(body=content, request_id=req.id, tone="News-focused", word_count=len(content.split())))
+    db.session.commit()
+    backend.remember_brief(user.id, [req])
+    return req
+
+
+def make_user(email):
+    user = User(full_name="Test User", email=email, company_name="Acme", password_hash="unused")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_reuse_previous_generation(backend, backend_app):
+    user = make_user("reuse@example.com")
+    previous = store_generation(backend, user, "CNN", f"# {TITLE}\n\nAcme Robotics today launched Orbit Pro.")
+    pr_request = backend.PressReleaseRequest(title="Beta launches Orbit Pro", body=EDITED_BODY, company_name="Beta",
+                                             target_outlets=["CNN", "TechCrunch"], category="Product Launch")
+
+    with backend_app.test_request_context():
+        response = backend.reuse_previous_generation(user.id, previous.id, pr_request)
+    data = response.get_json()
+    releases = {release["outlet"]: release for release in data["data"]["generated_releases"]}
+
+    assert data["reused_from"] == [previous.id]
+    assert releases["CNN"]["content"].startswith("# Beta launches Orbit Pro")
+    assert releases["TechCrunch"]["content"].strip()
+    assert Request.query.filter_by(user_id=user.id).count() == 3
+    assert brief_index._index.stats()["reuses"] == 1
+
+    other = make_user("other@example.com")
+    with backend_app.test_request_context():
+        assert backend.reuse_previous_generation(other.id, previous.id, pr_request) is None
+
+
+def test_non_numeric_reuse_request_id_is_rejected(backend, backend_app):
+    user = make_user("bad-reuse@example.com")
+    token = backend.generate_token(user.id, user.email)
+    response = backend_app.test_client().post('/generate', headers={'Authorization': f'Bearer {token}'}, json={
+        "title": TITLE, "body": BODY, "target_outlets": ["CNN"], "reuse_request_id": "latest"
+    })
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the shared content cleaner against the golden corpus in testdata/cleaner
+Each <name>.input.md is a raw model output and <name>.expected.md the cleaned release.
+
+Run: python -m pytest test_content_cleaner.py
+"""
+
+import os
+import random
+
+import pytest
+
+from content_cleaner import StreamingCleaner, clean_content
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'cleaner')
+CASES = sorted(name[:-len('.input.md')] for name in os.listdir(CORPUS_DIR) if name.endswith('.input.md'))
+
+
+def read_case(name):
+    with open(os.path.join(CORPUS_DIR, f"{name}.input.md"), encoding='utf-8') as f:
+        raw = f.read()
+    with open(os.path.join(CORPUS_DIR, f"{name}.expected.md"), encoding='utf-8') as f:
+        expected = f.read()
+    return raw, expected
+
+
+def clean_in_chunks(raw, sizes):
+    cleaner = StreamingCleaner()
+    out, start = [], 0
+    for size in sizes:
+        out.append(cleaner.feed(raw[start:start + size]))
+        start += size
+    out.append(cleaner.feed(raw[start:]))
+    out.append(cleaner.finish())
+    return ''.join(out)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_golden_corpus(name):
+    raw, expected = read_case(name)
+    assert clean_content(raw) + "\n" == expected
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_streaming_matches_full_clean(name, chunk_size):
+    raw, _ = read_case(name)
+    sizes = [chunk_size] * (len(raw) // chunk_size + 1)
+    assert clean_in_chunks(raw, sizes) == clean_content(raw)
+
+
+def test_streaming_matches_random_chunks():
+    rng = random.Random(3)
+    pieces = ['word', '  ', '\n', '\\n', '```', '```markdown', '\r\n', '\\u00e9', '\\boxed{', '}', '\t', '{']
+    for _ in range(500):
+        raw = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 40)))
+        sizes = [rng.randint(1, 6) for _ in range(len(raw))]
+        assert clean_in_chunks(raw, sizes) == clean_content(raw), raw
+
+
+def test_braces_and_empty_input_are_kept():
+    assert clean_content("Use {name} in {{ templates }}") == "Use {name} in {{ templates }}"
+    assert clean_content("\\boxed{Set {x}}") == "Set {x}"
+    assert clean_content("") == ""
+    assert clean_content(None) is None
+
+
+def test_escaped_surrogate_pairs_encode_as_utf8():
+    # Text that already holds non-ASCII characters takes the pattern path instead of the codec
+    cleaned = clean_content("Café launch \\ud83d\\ude80, stray \\ude80")
+    assert cleaned == "Café launch 🚀, stray \ufffd"
+    cleaned.encode('utf-8')
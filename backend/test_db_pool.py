@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test the pool metrics reported by /api/admin/pool
+Averages cover every recorded wait; p95 covers the recent sample window.
+
+Run: python -m pytest test_db_pool.py
+"""
+
+from db_pool import PoolMetrics
+
+
+def test_snapshot_of_empty_metrics():
+    snapshot = PoolMetrics().snapshot()
+    assert snapshot["avg_wait_ms"] == 0.0
+    assert snapshot["p95_wait_ms"] == 0.0
+    assert snapshot["churn_ratio"] == 0.0
+
+
+def test_average_wait_stays_correct_past_the_sample_window():
+    metrics = PoolMetrics(max_samples=1000)
+    for _ in range(5000):
+        metrics.record_wait(0.001)
+    snapshot = metrics.snapshot()
+    assert snapshot["avg_wait_ms"] == 1.0
+    assert snapshot["p95_wait_ms"] == 1.0
+    assert snapshot["max_wait_ms"] == 1.0
+
+
+def test_p95_uses_recent_waits_and_counters_accumulate():
+    metrics = PoolMetrics(max_samples=100)
+    for _ in range(100):
+        metrics.record_wait(0.050)
+    for i in range(100):
+        metrics.record_wait(0.001 * (i + 1), timed_out=i == 99)
+    for counter in ('checkouts', 'checkouts', 'checkouts', 'checkouts', 'connects'):
+        metrics.increment(counter)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["p95_wait_ms"] == 96.0
+    assert snapshot["avg_wait_ms"] == 50.25
+    assert snapshot["max_wait_ms"] == 100.0
+    assert snapshot["timeouts"] == 1
+    assert snapshot["churn_ratio"] == 0.25
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Test the JSON encoding of API responses
+Values orjson rejects fall back to the standard library without failing the response.
+
+Run: python -m pytest test_json_provider.py
+"""
+
+import json
+
+import pytest
+
+import json_provider
+from json_provider import dumps, dumps_bytes
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param and json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(json_provider, 'USE_ORJSON', request.param)
+    return request.param
+
+
+def test_lone_surrogates_are_escaped(encoder):
+    data = {"content": "Launch \ud83d", "title": "Café 🚀"}
+    encoded = dumps_bytes(data)
+    assert b'\\ud83d' in encoded
+    assert json.loads(encoded) == data
+    assert json.loads(dumps(data, indent=True)) == data
+
+
+def test_large_integers_and_utf8(encoder):
+    assert json.loads(dumps_bytes({"id": 2 ** 70})) == {"id": 2 ** 70}
+    assert dumps_bytes({"title": "Café"}) == '{"title":"Café"}'.encode('utf-8')
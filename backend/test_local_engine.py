@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test the local press release engine used when the agent is unavailable
+Releases must be built from the brief's own facts, keep its wording and work for any outlet.
+
+Run: python -m pytest test_local_engine.py
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from local_engine import STYLE_GENERATORS, analyze_content, generate_release
+
+BODY = (
+    "Acme Robotics today launched Orbit Pro, its next-generation warehouse robot, in Bucharest. "
+    "The robot costs $49,000 and cuts picking time by 35%.\n\n"
+    "\"Orbit Pro is the robot our customers asked for,\" said Jane Doe, CEO of Acme Robotics. "
+    "Deliveries start on March 3, 2026 from the plant in Cluj-Napoca. CTO Mihai Popescu leads the team."
+)
+
+
+def brief(**fields):
+    values = dict(title="Acme Robotics Launches Orbit Pro", body=BODY, company_name="Acme Robotics",
+                  category="Product Launch", contact_info="press@acme.example", additional_notes=None)
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def test_extracts_facts_from_brief():
+    analysis = analyze_content(BODY)
+    assert analysis["lead"].startswith("Acme Robotics today launched Orbit Pro")
+    assert analysis["amounts"] == ["$49,000"]
+    assert analysis["percentages"] == ["35%"]
+    assert analysis["dates"] == ["March 3, 2026"]
+    assert analysis["products"] == ["Orbit Pro"]
+    assert {"name": "Jane Doe", "title": "CEO of Acme Robotics"} in analysis["people"]
+    assert {"name": "Mihai Popescu", "title": "CTO"} in analysis["people"]
+    assert analysis["locations"] == ["Bucharest", "Cluj-Napoca"]
+    assert analysis["quotes"][0]["speaker"] == "Jane Doe"
+    assert len(analysis["paragraphs"]) == 2
+
+
+@pytest.mark.parametrize("outlet", list(STYLE_GENERATORS))
+def test_release_keeps_brief_wording_and_facts(outlet):
+    release = generate_release(brief(), outlet)
+    assert "today launched Orbit Pro, its next-generation warehouse robot" in release
+    assert "$49,000" in release and "35%" in release
+    assert "press@acme.example" in release
+    assert "acme robotics today" not in release
+
+
+def test_unknown_outlet_uses_general_style():
+    request = brief()
+    analysis = analyze_content(request.body)
+    assert generate_release(request, "Local Gazette", analysis) == generate_release(request, "General", analysis)
+
+
+@pytest.mark.parametrize("outlet", list(STYLE_GENERATORS))
+def test_missing_fields_do_not_fail(outlet):
+    release = generate_release(brief(body=None, title=None, company_name=None, category=None, contact_info=None), outlet)
+    assert release.strip()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test allocation tracing, snapshots and diffs behind /api/admin/memory
+The store keeps only the newest snapshots; the admin routes reject bad input with 400s.
+
+Run: python -m pytest test_memory_diagnostics.py
+"""
+
+import tracemalloc
+
+import pytest
+
+from memory_diagnostics import SnapshotStore, snapshot_store
+from models import User
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore(max_snapshots=2)
+    yield store
+    store.stop()
+    store.clear()
+
+
+def test_start_take_diff_and_clear(store):
+    with pytest.raises(RuntimeError):
+        store.take()
+
+    status = store.start(frames=5)
+    assert status["tracing"] and status["frames"] == 5
+    first = store.take("before")
+    retained = [bytearray(1024) for _ in range(200)]
+    second = store.take("after", group_by='filename', limit=5)
+    assert second["group_by"] == 'filename' and len(second["top"]) <= 5
+
+    diff = store.diff(first["id"], second["id"])
+    assert diff["size_diff_kb"] > 150
+    assert any(entry["file"] == __file__ and entry["size_diff_kb"] > 150 for entry in diff["top"])
+    del retained
+
+    # Only the newest max_snapshots are kept
+    third = store.take("latest")
+    assert [s["id"] for s in store.status()["snapshots"]] == [second["id"], third["id"]]
+    with pytest.raises(KeyError):
+        store.top(first["id"])
+
+    assert store.clear() == 2
+    assert store.status()["snapshots"] == []
+    assert not store.stop()["tracing"]
+
+
+def test_take_returns_stats_even_when_nothing_is_kept():
+    store = SnapshotStore(max_snapshots=0)
+    try:
+        store.start()
+        top = store.take()
+        assert top["id"] and top["total_kb"] >= 0
+        assert store.status()["snapshots"] == []
+    finally:
+        store.stop()
+
+
+@pytest.fixture
+def admin_client(backend, backend_app):
+    admin = User(full_name="Admin", email="memory-admin@example.com", company_name="Acme",
+                 password_hash="unused", is_admin=True)
+    backend.db.session.add(admin)
+    backend.db.session.commit()
+    token = backend.generate_token(admin.id, admin.email, is_admin=True)
+    yield backend_app.test_client(), {'Authorization': f'Bearer {token}'}
+    snapshot_store.stop()
+    snapshot_store.clear()
+
+
+@pytest.mark.parametrize("frames", ["abc", None, [3]])
+def test_invalid_frames_are_rejected(admin_client, frames):
+    client, headers = admin_client
+    response = client.post('/api/admin/memory/tracing', headers=headers, json={"action": "start", "frames": frames})
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    assert not tracemalloc.is_tracing()
+
+
+def test_snapshot_route_with_no_snapshots_kept(admin_client, monkeypatch):
+    client, headers = admin_client
+    monkeypatch.setattr(snapshot_store, 'max_snapshots', 0)
+    assert client.post('/api/admin/memory/tracing', headers=headers, json={"frames": "3"}).status_code == 200
+    response = client.post('/api/admin/memory/snapshots', headers=headers, json={"label": "gone"})
+    assert response.status_code == 200
+    assert response.get_json()["data"]["id"]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory outlet catalog against a SQLite database
+Known outlets must resolve without queries; new ones are created exactly once.
+
+Run: python -m pytest test_outlet_catalog.py
+"""
+
+import threading
+
+import outlet_styles
+from models import db, NewsOutlet
+from outlet_catalog import AVAILABLE_OUTLETS, OUTLETS, OutletCatalog, outlet_info, public_outlet_info
+
+
+def test_seed_and_lookup_without_queries(app, statements):
+    catalog = OutletCatalog()
+    assert catalog.seed() == list(OUTLETS)
+    assert catalog.seed() == []
+    statements.clear()
+
+    ids = catalog.ids_for(["Forbes", "CNN", "Forbes"])
+    assert list(ids) == ["Forbes", "CNN"]
+    assert catalog.name_for(ids["CNN"]) == "CNN"
+    assert catalog.payload()["Forbes"]["icon"] == OUTLETS["Forbes"]["icon"]
+    assert statements == []
+
+
+def test_new_outlet_created_once_under_concurrency(app):
+    catalogs = [OutletCatalog() for _ in range(8)]
+    ids, errors = [], []
+
+    def resolve(catalog):
+        try:
+            with app.app_context():
+                ids.append(catalog.id_for("Reuters"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=resolve, args=(catalog,)) for catalog in catalogs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(ids)) == 1
+    assert NewsOutlet.query.filter_by(name="Reuters").count() == 1
+
+
+def test_catalog_picks_up_rows_from_other_workers_after_ttl(app):
+    catalog = OutletCatalog(ttl=0)
+    assert catalog.names() == []
+    db.session.add(NewsOutlet(name="Bloomberg"))
+    db.session.commit()
+    assert catalog.names() == ["Bloomberg"]
+    assert catalog.version() == (("Bloomberg", tuple(public_outlet_info("Bloomberg").values())),)
+
+
+def test_version_changes_with_outlet_metadata(app, monkeypatch):
+    catalog = OutletCatalog(ttl=0)
+    db.session.add(NewsOutlet(name="TechCrunch"))
+    db.session.commit()
+    before = catalog.version()
+    edited = dict(AVAILABLE_OUTLETS, TechCrunch=dict(AVAILABLE_OUTLETS["TechCrunch"], icon="🚀"))
+    monkeypatch.setattr(outlet_styles, 'AVAILABLE_OUTLETS', edited)
+    assert catalog.payload()["TechCrunch"]["icon"] == "🚀"
+    assert catalog.version() != before
+
+
+def test_unknown_outlet_uses_general_style():
+    info = outlet_info("Local Gazette")
+    assert info["instructions"] == OUTLETS["General"]["instructions"]
+    assert info["description"] == "Coverage for Local Gazette"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test read-replica routing against two SQLite databases
+The "primary" and "replica" hold different rows, so each read shows where it went.
+
+Run: python -m pytest test_replica_routing.py
+"""
+
+import pytest
+from flask import Flask, g, request
+
+import db_routing
+from db_routing import REPLICA_BIND_KEY, read_replica, replica_binds
+from models import db, NewsOutlet
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['SQLALCHEMY_BINDS'] = replica_binds(f"sqlite:///{tmp_path / 'replica.db'}")
+    db.init_app(app)
+
+    with app.app_context():
+        replica = db.engines[REPLICA_BIND_KEY]
+        db.create_all(bind_key=None)
+        db.metadata.create_all(bind=replica)
+        with db.engine.begin() as conn:
+            conn.execute(NewsOutlet.__table__.insert(), [{"name": "Primary Outlet"}])
+        with replica.begin() as conn:
+            conn.execute(NewsOutlet.__table__.insert(), [{"name": "Replica Outlet"}])
+
+    db_routing._recent_writers.clear()
+    yield app
+    db_routing._recent_writers.clear()
+
+
+def outlet_names():
+    return [outlet.name for outlet in NewsOutlet.query.order_by(NewsOutlet.id).all()]
+
+
+def run_as_user(app, view, user_id=1):
+    """Run a view the way an authenticated endpoint would"""
+    with app.test_request_context():
+        request.current_user = {'user_id': user_id}
+        try:
+            return view()
+        finally:
+            db.session.remove()
+
+
+def test_reads_default_to_primary(app):
+    assert run_as_user(app, outlet_names) == ["Primary Outlet"]
+
+
+def test_read_only_route_uses_replica(app):
+    assert run_as_user(app, read_replica(outlet_names)) == ["Replica Outlet"]
+
+
+def test_writes_go_to_primary_within_read_only_route(app):
+    @read_replica
+    def add_then_read():
+        assert outlet_names() == ["Replica Outlet"]
+        db.session.add(NewsOutlet(name="New Outlet"))
+        db.session.flush()
+        # Once this transaction has written, its reads must see the write
+        return outlet_names()
+
+    assert run_as_user(app, add_then_read) == ["Primary Outlet", "New Outlet"]
+
+
+def test_read_your_writes_window(app, monkeypatch):
+    def write():
+        db.session.add(NewsOutlet(name="Fresh Outlet"))
+        db.session.commit()
+
+    run_as_user(app, write, user_id=7)
+
+    # The writer is pinned to the primary; other users still read the replica
+    assert run_as_user(app, read_replica(outlet_names), user_id=7) == ["Primary Outlet", "Fresh Outlet"]
+    assert run_as_user(app, read_replica(outlet_names), user_id=8) == ["Replica Outlet"]
+
+    monkeypatch.setattr(db_routing, 'READ_YOUR_WRITES_SECONDS', 0)
+    db_routing.mark_recent_write(7)
+    assert run_as_user(app, read_replica(outlet_names), user_id=7) == ["Replica Outlet"]
+
+
+def test_no_replica_configured(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'only.db'}"
+    app.config['SQLALCHEMY_BINDS'] = replica_binds(None)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.session.add(NewsOutlet(name="Only Outlet"))
+        db.session.commit()
+        db.session.remove()
+
+    with app.test_request_context():
+        request.current_user = {'user_id': 1}
+        assert read_replica(outlet_names)() == ["Only Outlet"]
+        assert g.use_read_replica
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test the versioned schema migrations against a SQLite database
+Pending steps run in order and are recorded; a current schema costs the boot check one query.
+
+Run: python -m pytest test_schema_migrations.py
+"""
+
+import pytest
+
+import migrate_db
+from migrate_db import LATEST_SCHEMA_VERSION, apply_migrations, check_schema_on_boot, current_schema_version
+from models import NewsOutlet
+from outlet_catalog import OUTLETS
+
+
+def test_fresh_database_is_migrated_to_latest(app):
+    assert current_schema_version() == 0
+    results = apply_migrations(verbose=False)
+    assert results["migrations_applied"] == list(range(1, LATEST_SCHEMA_VERSION + 1))
+    assert results["schema_version"] == LATEST_SCHEMA_VERSION
+    assert sorted(results["outlets_added"]) == sorted(OUTLETS)
+    assert NewsOutlet.query.count() == len(OUTLETS)
+
+    assert apply_migrations(verbose=False)["migrations_applied"] == []
+
+
+def test_boot_check_is_one_query_when_current(app, statements):
+    apply_migrations(verbose=False)
+    statements.clear()
+    status = check_schema_on_boot(app)
+    assert status["current"] and status["migration"] is None
+    assert len(statements) == 1
+
+
+def test_boot_check_only_reports_by_default(app):
+    # Web startup never migrates unless MIGRATE_ON_BOOT asks it to
+    status = check_schema_on_boot(app)
+    assert not status["current"]
+    assert status["migration"] is None
+    assert current_schema_version() == 0
+
+    status = check_schema_on_boot(app, migrate=True)
+    assert status["migration"]["success"]
+    assert current_schema_version() == LATEST_SCHEMA_VERSION
+
+
+def test_failed_step_keeps_version_at_last_success(app, monkeypatch):
+    apply_migrations(verbose=False)
+
+    def broken(database_url, results, verbose=True):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrate_db, 'MIGRATIONS', migrate_db.MIGRATIONS + [
+        (LATEST_SCHEMA_VERSION + 1, "Broken step", broken, False),
+        (LATEST_SCHEMA_VERSION + 2, "Never reached", broken, False),
+    ])
+    with pytest.raises(RuntimeError):
+        apply_migrations(verbose=False)
+    assert current_schema_version() == LATEST_SCHEMA_VERSION
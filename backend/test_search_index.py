@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the full-text search index on SQLite (FTS5)
+Results are scoped per user and by document type; re-indexing replaces a document in place.
+
+Run: python -m pytest test_search_index.py
+"""
+
+from datetime import datetime
+
+import search_index
+from models import db
+from search_index import index_document, remove_documents, search, search_document_count
+
+
+def index_sample_documents():
+    created_at = datetime(2026, 3, 3, 9, 0)
+    index_document(db.session, 'request', 1, 1, "Orbit Pro launch", "Acme launches the Orbit Pro robot", created_at)
+    index_document(db.session, 'response', 1, 1, "Orbit Pro launch (CNN)", "Orbit Pro ships in Q3", created_at, parent_id=1)
+    index_document(db.session, 'transcript', 1, 1, "Transcript #1", "We talked about the orbit roadmap", created_at)
+    index_document(db.session, 'request', 2, 2, "Orbit satellite funding", "Beta raises money for an orbit satellite", created_at)
+    db.session.commit()
+
+
+def found(results):
+    return sorted((result['type'], result['id']) for result in results)
+
+
+def test_results_are_scoped_to_the_user(app):
+    index_sample_documents()
+    assert found(search(db.session, "orbit", user_id=1)) == [('request', 1), ('response', 1), ('transcript', 1)]
+    assert found(search(db.session, "orbit", user_id=2)) == [('request', 2)]
+    assert found(search(db.session, "satellite", user_id=1)) == []
+    assert len(search(db.session, "orbit")) == 4
+
+
+def test_doc_type_filter(app):
+    index_sample_documents()
+    assert found(search(db.session, "orbit", user_id=1, doc_types=['transcript'])) == [('transcript', 1)]
+    results = search(db.session, "orbit", user_id=1, doc_types=['request', 'response'])
+    assert found(results) == [('request', 1), ('response', 1)]
+    assert [r['request_id'] for r in results if r['type'] == 'response'] == [1]
+
+
+def test_reindex_replaces_and_remove_deletes_by_rowid(app, statements):
+    index_sample_documents()
+    statements.clear()
+    index_document(db.session, 'request', 1, 1, "Orbit Max launch", "Acme launches the Orbit Max robot")
+    db.session.commit()
+    assert search_document_count(db.session) == 4
+    assert found(search(db.session, "max", user_id=1)) == [('request', 1)]
+    assert search(db.session, "pro", user_id=1, doc_types=['request']) == []
+    # Replacing a document is a rowid lookup, never a filter on the unindexed columns
+    assert not any('doc_id =' in statement for statement in statements)
+
+    remove_documents(db.session, 'response', [1])
+    db.session.commit()
+    assert found(search(db.session, "orbit", user_id=1)) == [('request', 1), ('transcript', 1)]
+
+
+def test_snippets_escape_indexed_markup(app):
+    index_document(db.session, 'request', 5, 1, "Launch", '<img src=x onerror="alert(1)"> Orbit launch \ue000 </mark>')
+    db.session.commit()
+    [result] = search(db.session, "orbit", user_id=1)
+    assert '<img' not in result['snippet']
+    assert '&lt;img src=x onerror=&quot;alert(1)&quot;&gt;' in result['snippet']
+    assert '<mark>Orbit</mark>' in result['snippet']
+    assert result['snippet'].count('<mark>') == result['snippet'].count('</mark>') == 1
+
+
+def test_search_table_is_remembered_only_after_commit(app):
+    url = db.session.get_bind().url
+    search_index._ensured_binds.discard(url)
+    search_document_count(db.session)
+    db.session.rollback()
+    assert url not in search_index._ensured_binds
+
+    search_document_count(db.session)
+    db.session.commit()
+    assert url in search_index._ensured_binds
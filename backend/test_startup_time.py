@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test that the web app and the agent module import quickly
+Each import runs in a fresh interpreter; the heavy modules (uagents' Agent and messaging, openai)
+must not load until first use, and the import must fit in STARTUP_IMPORT_BUDGET_MS.
+
+Run: python -m pytest test_startup_time.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# `import app` took about 1.3s with uagents and openai loaded eagerly, and about 0.65s without
+IMPORT_BUDGET_MS = float(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1000))
+LAZY_MODULES = ['uagents.agent', 'uagents.communication', 'openai']
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def import_in_fresh_process(module, tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}", LOG_LEVEL='WARNING', PYTHONPATH=BACKEND_DIR)
+    env.pop('API_KEY_DS', None)
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module, lazy=LAZY_MODULES)],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["app", "agent"])
+def test_import_defers_heavy_modules(module, tmp_path):
+    probe = import_in_fresh_process(module, tmp_path)
+    assert probe["loaded"] == []
+
+
+@pytest.mark.parametrize("module", ["app", "agent"])
+def test_import_time_within_budget(module, tmp_path):
+    # Best of three: the first run also pays for cold .pyc and disk caches
+    best = min(import_in_fresh_process(module, tmp_path)["ms"] for _ in range(3))
+    assert best < IMPORT_BUDGET_MS, f"import {module} took {best:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+
+def test_agent_is_built_on_first_use():
+    import agent
+    assert agent.agent is None
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test the span exporter's trace file
+The file is rotated once it reaches its size cap and the viewer reads across the rotation;
+readers wait for the background writer instead of writing themselves.
+
+Run: python -m pytest test_tracing.py
+"""
+
+import os
+
+import tracing
+from tracing import Span, SpanExporter, find_trace
+
+
+def finished_span(name, trace_id=None, parent_id=None, **attributes):
+    span = Span(name, 'backend', trace_id, parent_id, attributes=attributes)
+    span.duration_ms = 1.0
+    return span
+
+
+def test_file_is_rotated_at_the_size_cap(tmp_path):
+    path = str(tmp_path / 'traces.jsonl')
+    exporter = SpanExporter(path=path, otlp_endpoint=None, max_bytes=2000)
+    root = finished_span("GET /api/history", request_id="req-1")
+    exporter._write([root.to_dict()])
+    exporter._write([finished_span(f"db.commit {i}", root.trace_id, root.span_id).to_dict() for i in range(20)])
+    exporter._write([finished_span("GET /health").to_dict()])
+
+    assert os.path.exists(f"{path}.1")
+    assert os.path.getsize(path) < 2000
+    # The root span now lives in the rotated file; the trace is still found whole
+    trace = find_trace(request_id="req-1", path=path)
+    assert trace["trace_id"] == root.trace_id
+    assert len(trace["spans"]) == 21
+
+
+def test_readers_wait_for_the_background_writer(tmp_path, monkeypatch):
+    exporter = SpanExporter(path=str(tmp_path / 'traces.jsonl'), otlp_endpoint=None)
+    monkeypatch.setattr(tracing, 'exporter', exporter)
+    span = finished_span("POST /generate", request_id="req-2")
+    exporter.export(span)
+
+    assert exporter.wait_until_written(timeout=5)
+    assert find_trace(request_id="req-2", path=exporter.path)["trace_id"] == span.trace_id
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test chunked dictation transcripts
+Appends store pending chunk rows without rewriting the text; finishing folds them in and re-indexes.
+
+Run: python -m pytest test_transcripts.py
+"""
+
+import pytest
+
+from models import db, Transcript, TranscriptChunk, User
+from search_index import search
+
+
+def test_append_does_not_rewrite_text(app, statements):
+    transcript = Transcript(user_id=1)
+    transcript.set_text("Acme launches")
+    db.session.add(transcript)
+    db.session.commit()
+    transcript_id = transcript.id
+    db.session.expunge_all()
+
+    statements.clear()
+    transcript = Transcript.query.options(db.defer(Transcript.text)).filter_by(id=transcript_id).one()
+    transcript.append_text("Orbit Pro today")
+    transcript.append_text("in Europe")
+    db.session.commit()
+
+    updates = [s for s in statements if s.startswith('UPDATE transcripts')]
+    assert updates and not any('text=' in s for s in updates)
+    assert not any('transcripts.text' in s for s in statements)
+    assert transcript.full_text() == "Acme launches Orbit Pro today in Europe"
+    assert transcript.word_count == 7
+    assert transcript.preview == "Acme launches Orbit Pro today in Europe"
+
+
+def test_preview_stops_at_preview_length(app):
+    transcript = Transcript(user_id=1)
+    transcript.set_text("")
+    db.session.add(transcript)
+    for _ in range(30):
+        transcript.append_text("one more phrase")
+    db.session.commit()
+
+    assert transcript.preview == Transcript.make_preview(transcript.full_text())
+    assert transcript.fold_chunks()
+    db.session.commit()
+    assert transcript.text == " ".join(["one more phrase"] * 30)
+    assert transcript.word_count == 90
+    assert TranscriptChunk.query.count() == 0
+
+
+@pytest.fixture
+def client(backend, backend_app):
+    user = User(full_name="Test User", email="dictation@example.com", company_name="Acme", password_hash="unused")
+    db.session.add(user)
+    db.session.commit()
+    token = backend.generate_token(user.id, user.email)
+    return backend_app.test_client(), {'Authorization': f'Bearer {token}'}, user.id
+
+
+def test_finish_folds_chunks_and_reindexes(client):
+    client, headers, user_id = client
+    started = client.post('/api/transcripts', headers=headers, json={"text": "", "streaming": True}).get_json()
+    transcript_id = started["data"]["id"]
+    for chunk in ("We are launching", "the Orbit satellite"):
+        appended = client.post(f'/api/transcripts/{transcript_id}/append', headers=headers, json={"text": chunk})
+        assert appended.status_code == 200
+    assert appended.get_json()["data"]["word_count"] == 6
+
+    # Not re-indexed per chunk, but readers already see the pending text
+    assert search(db.session, "satellite", user_id=user_id) == []
+    loaded = client.get(f'/api/transcripts/{transcript_id}', headers=headers).get_json()
+    assert loaded["data"]["text"] == "We are launching the Orbit satellite"
+
+    finished = client.post(f'/api/transcripts/{transcript_id}/finish', headers=headers).get_json()
+    assert finished["data"]["text"] == "We are launching the Orbit satellite"
+    assert [r['id'] for r in search(db.session, "satellite", user_id=user_id)] == [transcript_id]
+    assert TranscriptChunk.query.count() == 0
+
+
+def test_append_reindexes_after_debounce(backend, client, monkeypatch):
+    client, headers, user_id = client
+    monkeypatch.setattr(backend, 'TRANSCRIPT_REINDEX_SECONDS', 0)
+    transcript_id = client.post('/api/transcripts', headers=headers, json={"text": "", "streaming": True}).get_json()["data"]["id"]
+    client.post(f'/api/transcripts/{transcript_id}/append', headers=headers, json={"text": "first phrase"})
+    client.post(f'/api/transcripts/{transcript_id}/append', headers=headers, json={"text": "Orbit satellite"})
+
+    # The second append found a pending chunk past the window and folded it in
+    assert [r['id'] for r in search(db.session, "first", user_id=user_id)] == [transcript_id]
@@ -0,0 +1,88 @@
+"""
+Large text storage for PR-Connect
+Stores arbitrarily long strings as bytes and compresses them transparently
+once they cross a size threshold
+"""
+
+import os
+import zlib
+
+from sqlalchemy import func, literal
+from sqlalchemy.types import Integer, LargeBinary, TypeDecorator
+
+# Texts shorter than this (in UTF-8 bytes) are stored as-is; compression
+# overhead is not worth it for short previews and briefs
+COMPRESSION_THRESHOLD = int(os.environ.get('TEXT_COMPRESSION_THRESHOLD', 1024))
+COMPRESSION_LEVEL = int(os.environ.get('TEXT_COMPRESSION_LEVEL', 6))
+
+# One-byte header in front of every stored value. Rows converted from the
+# old VARCHAR/TEXT columns carry no header; stored text does not start with
+# either control byte, so anything else is read back as plain UTF-8.
+RAW_MARKER = b'\x00'
+ZLIB_MARKER = b'\x01'
+
+
+def encode_text(text):
+    """Encode a string into its stored byte representation"""
+    if text is None:
+        return None
+    data = text.encode('utf-8')
+    if len(data) >= COMPRESSION_THRESHOLD:
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        # Incompressible text (already short, or random) stays raw
+        if len(compressed) < len(data):
+            return ZLIB_MARKER + compressed
+    return RAW_MARKER + data
+
+
+def decode_text(value):
+    """Decode a stored value (new or legacy format) back into a string"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Legacy TEXT column that has not been migrated yet
+        return value
+    value = bytes(value)
+    if not value:
+        return ''
+    marker = value[:1]
+    if marker == ZLIB_MARKER:
+        return zlib.decompress(value[1:]).decode('utf-8')
+    if marker == RAW_MARKER:
+        return value[1:].decode('utf-8')
+    return value.decode('utf-8')
+
+
+def is_compressed(value):
+    """Check whether a stored value holds compressed data"""
+    return value is not None and bytes(value[:1]) == ZLIB_MARKER
+
+
+class CompressedText(TypeDecorator):
+    """Unbounded string column stored as (optionally compressed) bytes"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return encode_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decode_text(value)
+
+
+def column_storage_stats(session, column):
+    """Row count, stored bytes and compressed row count for a CompressedText column"""
+    marker = literal(ZLIB_MARKER, LargeBinary)
+    rows, stored_bytes, compressed_rows = session.query(
+        func.count(),
+        func.coalesce(func.sum(func.length(column)), 0),
+        func.coalesce(func.sum(
+            (func.substr(column, 1, 1) == marker).cast(Integer)
+        ), 0)
+    ).one()
+    return {
+        "rows": rows,
+        "stored_bytes": int(stored_bytes),
+        "compressed_rows": int(compressed_rows)
+    }
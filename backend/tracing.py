@@ -0,0 +1,414 @@
+"""
+Request tracing for PR-Connect
+Lightweight spans propagated with W3C traceparent values: from the Flask request, through
+the PressReleaseRequest message to the agent, and into each outlet's OpenRouter call.
+Finished spans are appended to a size-capped JSONL file on a background thread and can also
+be sent to an OpenTelemetry collector (OTLP/HTTP JSON).
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0.1))
+TRACE_EXPORT_PATH = os.environ.get('TRACE_EXPORT_PATH', os.path.join(tempfile.gettempdir(), 'prconnect-traces.jsonl'))
+# Past this size the export file is rotated to <path>.1 (replacing the previous one)
+TRACE_EXPORT_MAX_BYTES = int(os.environ.get('TRACE_EXPORT_MAX_BYTES', 32 * 1024 * 1024))
+# e.g. http://localhost:4318/v1/traces
+TRACE_OTLP_ENDPOINT = os.environ.get('TRACE_OTLP_ENDPOINT')
+# The viewer only scans the tail of the export file
+TRACE_VIEWER_SCAN_BYTES = int(os.environ.get('TRACE_VIEWER_SCAN_BYTES', 8 * 1024 * 1024))
+
+_current_span = contextvars.ContextVar('prconnect_current_span', default=None)
+
+
+def _random_hex(length):
+    return f"{random.getrandbits(length * 4):0{length}x}"
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'service', 'sampled',
+                 'start_time', '_start_perf', 'duration_ms', 'attributes', 'status')
+
+    def __init__(self, name, service, trace_id=None, parent_id=None, sampled=True, attributes=None):
+        self.trace_id = trace_id or _random_hex(32)
+        self.span_id = _random_hex(16)
+        self.parent_id = parent_id
+        self.name = name
+        self.service = service
+        self.sampled = sampled
+        self.start_time = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration_ms = None
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def traceparent(self):
+        """W3C traceparent header value for calls made inside this span"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+        if self.sampled and TRACING_ENABLED:
+            exporter.export(self)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": self.service,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+def parse_traceparent(value):
+    """(trace_id, parent_span_id, sampled) from a traceparent value, or None if invalid"""
+    if not value:
+        return None
+    parts = value.strip().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def current_span():
+    return _current_span.get()
+
+
+def current_traceparent():
+    """traceparent for outgoing calls, or '' when not tracing"""
+    span = _current_span.get()
+    return span.traceparent() if span else ''
+
+
+def begin_span(name, service='backend', traceparent=None, **attributes):
+    """
+    Start a span and make it current; pair with end_span(span, token)
+    A traceparent continues a remote trace; otherwise the current span (if any) is the parent.
+    """
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent)
+    if remote:
+        trace_id, parent_id, sampled = remote
+    elif parent:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    else:
+        trace_id, parent_id = None, None
+        sampled = TRACING_ENABLED and (TRACE_SAMPLE_RATE >= 1 or random.random() < TRACE_SAMPLE_RATE)
+    span = Span(name, service, trace_id, parent_id, sampled, attributes)
+    return span, _current_span.set(span)
+
+
+def end_span(span, token, error=None):
+    if error is not None:
+        span.status = 'error'
+        span.attributes['error'] = str(error)[:500]
+    span.finish()
+    _current_span.reset(token)
+
+
+@contextmanager
+def start_span(name, service='backend', traceparent=None, **attributes):
+    """Context manager around begin_span/end_span; yields the span"""
+    span, token = begin_span(name, service, traceparent, **attributes)
+    try:
+        yield span
+    except BaseException as e:
+        end_span(span, token, error=e)
+        raise
+    end_span(span, token)
+
+
+class SpanExporter:
+    """Writes finished spans from a background thread (JSONL file, optional OTLP collector)"""
+
+    def __init__(self, path=TRACE_EXPORT_PATH, otlp_endpoint=TRACE_OTLP_ENDPOINT, max_queue=10000,
+                 max_bytes=TRACE_EXPORT_MAX_BYTES):
+        self.path = path
+        self.otlp_endpoint = otlp_endpoint
+        self.max_bytes = max_bytes
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        # Serializes file writes and rotation between the background thread and the exit flush
+        self._write_lock = threading.Lock()
+        # Spans queued vs. written to the file, so readers can wait for the writer to catch up
+        self._progress = threading.Condition()
+        self._queued = 0
+        self._written = 0
+        self.dropped = 0
+
+    def export(self, span):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+            return
+        with self._progress:
+            self._queued += 1
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='span-exporter', daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def _drain(self, first=None, max_batch=500):
+        batch = [first] if first is not None else []
+        while len(batch) < max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._write(self._drain(self._queue.get()))
+
+    def flush(self):
+        """Write whatever is queued (called at exit)"""
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+
+    def wait_until_written(self, timeout=1.0):
+        """
+        Wait for spans queued so far to reach the file (used by the trace viewer)
+        Readers never write themselves, so a slow collector can't block a request.
+        """
+        with self._progress:
+            target = self._queued
+            return self._progress.wait_for(lambda: self._written >= target, timeout)
+
+    def _rotate_if_full(self):
+        try:
+            if os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+
+    def _write(self, batch):
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                self._rotate_if_full()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(span, default=str) + '\n' for span in batch))
+            except Exception as e:
+                print(f"⚠️ Could not write spans to {self.path}: {e}")
+        with self._progress:
+            self._written += len(batch)
+            self._progress.notify_all()
+        if self.otlp_endpoint:
+            try:
+                import requests
+                requests.post(self.otlp_endpoint, json=to_otlp(batch), timeout=5)
+            except Exception as e:
+                print(f"⚠️ Could not send spans to {self.otlp_endpoint}: {e}")
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans):
+    """OTLP/HTTP JSON payload for a batch of span dicts, grouped by service"""
+    by_service = {}
+    for span in spans:
+        start_ns = int(span["start_time"] * 1e9)
+        by_service.setdefault(span["service"], []).append({
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "parentSpanId": span["parent_id"] or "",
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int((span["duration_ms"] or 0) * 1e6)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span["attributes"].items()],
+            "status": {"code": 2 if span["status"] == 'error' else 1}
+        })
+    return {"resourceSpans": [
+        {
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": f"pr-connect-{service}"}}]},
+            "scopeSpans": [{"scope": {"name": "prconnect.tracing"}, "spans": service_spans}]
+        }
+        for service, service_spans in by_service.items()
+    ]}
+
+
+exporter = SpanExporter()
+
+
+def _read_tail(path, scan_bytes):
+    """Complete lines in the last scan_bytes of a file, and the bytes read"""
+    if scan_bytes <= 0 or not os.path.exists(path):
+        return [], 0
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - scan_bytes))
+        data = f.read()
+    lines = data.split(b'\n')
+    if size > scan_bytes:
+        lines = lines[1:]  # First line may be partial
+    return lines, len(data)
+
+
+def _read_recent_spans(path=TRACE_EXPORT_PATH, scan_bytes=TRACE_VIEWER_SCAN_BYTES):
+    lines, read = _read_tail(path, scan_bytes)
+    # Right after a rotation the current file is short: fill up from the rotated one
+    older, _ = _read_tail(f"{path}.1", scan_bytes - read)
+    spans = []
+    for line in older + lines:
+        if line.strip():
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def find_trace(request_id=None, trace_id=None, path=TRACE_EXPORT_PATH):
+    """
+    Spans of one trace, located by trace id or by the request id on its root span
+
+    Returns:
+        dict: trace_id, total_ms and spans (start order, with offset_ms and depth), or None
+    """
+    exporter.wait_until_written()
+    spans = _read_recent_spans(path)
+    if trace_id is None:
+        roots = [s for s in spans if s["attributes"].get("request_id") == request_id]
+        if not roots:
+            return None
+        trace_id = roots[-1]["trace_id"]
+    spans = [s for s in spans if s["trace_id"] == trace_id]
+    if not spans:
+        return None
+
+    spans.sort(key=lambda s: s["start_time"])
+    start = spans[0]["start_time"]
+    end = max(s["start_time"] + (s["duration_ms"] or 0) / 1000 for s in spans)
+    by_id = {s["span_id"]: s for s in spans}
+    for span in spans:
+        depth, parent = 0, by_id.get(span["parent_id"])
+        while parent is not None and depth < 50:
+            depth += 1
+            parent = by_id.get(parent["parent_id"])
+        span["depth"] = depth
+        span["offset_ms"] = round((span["start_time"] - start) * 1000, 3)
+    return {"trace_id": trace_id, "total_ms": round((end - start) * 1000, 3), "spans": spans}
+
+
+def recent_traces(limit=20, path=TRACE_EXPORT_PATH):
+    """Most recent root request spans (for picking a trace in the viewer)"""
+    exporter.wait_until_written()
+    roots = [s for s in _read_recent_spans(path) if s["attributes"].get("request_id") and s["parent_id"] is None]
+    roots.sort(key=lambda s: s["start_time"], reverse=True)
+    return [{
+        "trace_id": s["trace_id"],
+        "request_id": s["attributes"]["request_id"],
+        "name": s["name"],
+        "start_time": s["start_time"],
+        "duration_ms": s["duration_ms"],
+        "status": s["status"]
+    } for s in roots[:limit]]
+
+
+def init_request_tracing(app, skip_paths=('/metrics', '/health')):
+    """Root span per Flask request, continuing an incoming traceparent header"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_span():
+        if request.method == 'OPTIONS' or request.path in skip_paths:
+            return
+        span, token = begin_span(
+            f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+            traceparent=request.headers.get('traceparent'),
+            request_id=g.get('request_id'),
+            http_method=request.method,
+            http_path=request.path
+        )
+        g.trace_span, g.trace_token = span, token
+
+    @app.teardown_request
+    def finish_request_span(error=None):
+        span = g.pop('trace_span', None)
+        if span is not None:
+            token = g.pop('trace_token')
+            try:
+                end_span(span, token, error=error)
+            except ValueError:
+                # Token created in another context (e.g. streamed responses); just finish
+                span.finish()
+
+    @app.after_request
+    def record_status(response):
+        span = g.get('trace_span')
+        if span is not None:
+            span.set_attribute('http_status', response.status_code)
+            if response.status_code >= 500:
+                span.status = 'error'
+            response.headers['traceparent'] = span.traceparent()
+        return response
+
+
+def instrument_commit_spans(session_class):
+    """Record a db.commit span under the current span for every commit of a session class"""
+    from sqlalchemy import event
+
+    @event.listens_for(session_class, 'before_commit')
+    def _commit_span_started(session):
+        parent = _current_span.get()
+        if parent is not None and parent.sampled:
+            name = 'db.savepoint' if session.in_nested_transaction() else 'db.commit'
+            session.info['trace_commit_span'] = Span(name, parent.service, parent.trace_id, parent.span_id)
+
+    @event.listens_for(session_class, 'after_commit')
+    def _commit_span_finished(session):
+        span = session.info.pop('trace_commit_span', None)
+        if span is not None:
+            span.finish()
+
+    @event.listens_for(session_class, 'after_soft_rollback')
+    def _commit_span_failed(session, previous_transaction):
+        span = session.info.pop('trace_commit_span', None)
+        if span is not None:
+            span.status = 'error'
+            span.finish()
@@ -0,0 +1,160 @@
+"use client";
+
+import { useState, useEffect } from 'react';
+import { api, Trace, TraceSpan, TraceSummary } from '../../../lib/api';
+import DashboardLayout from '../../dashboard/layout';
+
+const SERVICE_COLORS: Record<string, string> = {
+  backend: 'bg-indigo-500',
+  agent: 'bg-purple-500',
+};
+
+function SpanRow({ span, totalMs }: { span: TraceSpan; totalMs: number }) {
+  const left = totalMs > 0 ? (span.offset_ms / totalMs) * 100 : 0;
+  // Keep very short spans visible
+  const width = totalMs > 0 ? Math.max((span.duration_ms / totalMs) * 100, 0.5) : 100;
+  const color = span.status === 'error' ? 'bg-red-500' : (SERVICE_COLORS[span.service] || 'bg-gray-500');
+  const details = Object.entries(span.attributes)
+    .map(([key, value]) => `${key}=${value}`)
+    .join('  ');
+
+  return (
+    <div className="grid grid-cols-12 gap-2 items-center py-1 border-b border-gray-100 text-sm" title={details}>
+      <div className="col-span-4 truncate text-gray-800" style={{ paddingLeft: `${span.depth * 16}px` }}>
+        <span className="text-xs text-gray-500 mr-2">{span.service}</span>
+        {span.name}
+      </div>
+      <div className="col-span-6 relative h-4 bg-gray-50 rounded">
+        <div
+          className={`absolute h-4 rounded ${color}`}
+          style={{ left: `${left}%`, width: `${Math.min(width, 100 - left)}%` }}
+        />
+      </div>
+      <div className="col-span-2 text-right text-gray-600 tabular-nums">
+        {span.duration_ms.toFixed(1)} ms
+      </div>
+    </div>
+  );
+}
+
+function TraceViewer() {
+  const [requestId, setRequestId] = useState('');
+  const [recent, setRecent] = useState<TraceSummary[]>([]);
+  const [trace, setTrace] = useState<Trace | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    api.getRecentTraces()
+      .then(setRecent)
+      .catch(err => setError(err instanceof Error ? err.message : 'Failed to load traces'));
+  }, []);
+
+  const loadTrace = async (id: string) => {
+    if (!id.trim()) return;
+    try {
+      setLoading(true);
+      setError(null);
+      setRequestId(id);
+      const data = await api.getTrace(id.trim());
+      setTrace(data);
+      if (!data) {
+        setError(`No trace recorded for request ${id}`);
+      }
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load trace');
+      console.error('Trace loading error:', err);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  return (
+    <div className="max-w-6xl mx-auto">
+      <form
+        className="flex gap-3 mb-6"
+        onSubmit={(e) => {
+          e.preventDefault();
+          loadTrace(requestId);
+        }}
+      >
+        <input
+          type="text"
+          value={requestId}
+          onChange={(e) => setRequestId(e.target.value)}
+          placeholder="Request ID (X-Request-ID or debug.request_id from /generate)"
+          className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-indigo-500 focus:border-transparent"
+        />
+        <button
+          type="submit"
+          disabled={loading}
+          className="px-4 py-2 bg-indigo-600 text-white rounded-lg hover:bg-indigo-700 transition-colors disabled:opacity-50"
+        >
+          {loading ? 'Loading...' : 'Show trace'}
+        </button>
+      </form>
+
+      {error && (
+        <div className="mb-6 bg-red-50 border-l-4 border-red-400 text-red-700 px-4 py-3 rounded-lg">
+          {error}
+        </div>
+      )}
+
+      {trace && (
+        <div className="bg-white rounded-xl shadow-lg border border-gray-200 p-6 mb-8">
+          <div className="flex justify-between items-center mb-4">
+            <h2 className="text-xl font-bold text-gray-900">Waterfall</h2>
+            <div className="text-sm text-gray-600">
+              {trace.spans.length} spans · {trace.total_ms.toFixed(1)} ms · trace {trace.trace_id}
+            </div>
+          </div>
+          {trace.spans.map(span => (
+            <SpanRow key={span.span_id} span={span} totalMs={trace.total_ms} />
+          ))}
+        </div>
+      )}
+
+      <div className="bg-white rounded-xl shadow-lg border border-gray-200 p-6">
+        <h2 className="text-xl font-bold text-gray-900 mb-4">Recent requests</h2>
+        {recent.length === 0 ? (
+          <p className="text-gray-600">No traced requests yet.</p>
+        ) : (
+          <div className="divide-y divide-gray-100">
+            {recent.map(item => (
+              <button
+                key={item.trace_id}
+                onClick={() => loadTrace(item.request_id)}
+                className="w-full flex justify-between items-center py-2 text-left text-sm hover:bg-gray-50"
+              >
+                <span className={item.status === 'error' ? 'text-red-600' : 'text-gray-800'}>{item.name}</span>
+                <span className="text-gray-500 tabular-nums">
+                  {item.request_id} · {item.duration_ms?.toFixed(1)} ms · {new Date(item.start_time * 1000).toLocaleTimeString()}
+                </span>
+              </button>
+            ))}
+          </div>
+        )}
+      </div>
+    </div>
+  );
+}
+
+export default function TracesPage() {
+  return (
+    <DashboardLayout>
+      <div className="bg-gradient-to-br from-indigo-50 via-white to-purple-50 py-6 md:py-12 px-2 md:px-4">
+        <div className="max-w-full md:max-w-6xl mx-auto">
+          <div className="text-center mb-6 md:mb-12">
+            <h1 className="text-2xl md:text-5xl font-bold bg-gradient-to-r from-indigo-600 via-purple-600 to-pink-600 bg-clip-text text-transparent mb-4">
+              🧭 Request Traces
+            </h1>
+            <p className="text-base md:text-xl text-gray-600 max-w-full md:max-w-2xl mx-auto leading-relaxed px-2">
+              Follow a request from the API through the agent to each outlet&apos;s AI call
+            </p>
+          </div>
+          <TraceViewer />
+        </div>
+      </div>
+    </DashboardLayout>
+  );
+}
@@ -31,6 +31,9 @@ interface User {
 interface AdminData {
   allUsers: User[];
   allRequests: any[];
+  requestsTotal: number;
+  // Cursor for the next page of /api/admin/requests (null once every request is loaded)
+  nextRequestsCursor: number | null;
   systemStats: {
     total_users: number;
     total_requests: number;
@@ -56,6 +59,7 @@ export default function Dashboard() {
   const [selectedRequest, setSelectedRequest] = useState<any | null>(null);
   const [requestDetails, setRequestDetails] = useState<any | null>(null);
   const [loadingDetails, setLoadingDetails] = useState(false);
+  const [loadingMoreRequests, setLoadingMoreRequests] = useState(false);
 
   useEffect(() => {
     checkUserAndLoadData();
@@ -113,6 +117,8 @@ export default function Dashboard() {
       setAdminData({
         allUsers: usersRes.success ? usersRes.data : [],
         allRequests: requestsRes.success ? requestsRes.data.requests : [],
+        requestsTotal: requestsRes.success ? requestsRes.data.total : 0,
+        nextRequestsCursor: requestsRes.success ? requestsRes.data.next_cursor : null,
         systemStats: statsRes.success ? statsRes.data.overview : {}
       });
     } catch (error) {
@@ -120,6 +126,31 @@ export default function Dashboard() {
     }
   };
 
+  const loadMoreRequests = async () => {
+    if (!adminData?.nextRequestsCursor) return;
+    try {
+      setLoadingMoreRequests(true);
+      const token = localStorage.getItem('authToken');
+      
+      const result = await fetch(`https://pr-connect-r40k.onrender.com/api/admin/requests?cursor=${adminData.nextRequestsCursor}`, {
+        headers: { 'Authorization': `Bearer ${token}` },
+      }).then(res => res.json());
+      
+      if (result.success) {
+        setAdminData(prev => prev && {
+          ...prev,
+          allRequests: [...prev.allRequests, ...result.data.requests],
+          requestsTotal: result.data.total,
+          nextRequestsCursor: result.data.next_cursor
+        });
+      }
+    } catch (error) {
+      console.error('Error loading more requests:', error);
+    } finally {
+      setLoadingMoreRequests(false);
+    }
+  };
+
   const fetchRequestDetails = async (requestId: number) => {
     try {
       setLoadingDetails(true);
@@ -357,6 +388,9 @@ export default function Dashboard() {
               <p className="text-gray-600 text-lg">
                 System-wide overview and user management
               </p>
+              <Link href="/admin/traces" className="inline-block mt-3 text-sm font-medium text-indigo-600 hover:text-indigo-800">
+                🧭 View request traces →
+              </Link>
             </div>
 
             {/* Admin Stats */}
@@ -367,7 +401,7 @@ export default function Dashboard() {
               </div>
               <div className="bg-gradient-to-r from-orange-500 to-red-600 rounded-2xl shadow-lg p-6 text-white">
                 <h3 className="text-sm font-semibold uppercase tracking-wide opacity-90">System Requests</h3>
-                <p className="text-3xl font-bold">{adminData.systemStats.total_requests || adminData.allRequests.length}</p>
+                <p className="text-3xl font-bold">{adminData.systemStats.total_requests || adminData.requestsTotal}</p>
               </div>
               <div className="bg-gradient-to-r from-pink-500 to-purple-600 rounded-2xl shadow-lg p-6 text-white">
                 <h3 className="text-sm font-semibold uppercase tracking-wide opacity-90">System Responses</h3>
@@ -426,7 +460,7 @@ export default function Dashboard() {
                         </div>
                         <div className="flex justify-between">
                           <span>Total Press Releases:</span>
-                          <span className="font-medium">{adminData.allRequests.length}</span>
+                          <span className="font-medium">{adminData.requestsTotal || adminData.allRequests.length}</span>
                         </div>
                       </div>
                     </div>
@@ -526,6 +560,18 @@ export default function Dashboard() {
                       </tbody>
                     </table>
                   </div>
+                  <div className="flex items-center justify-between text-sm text-gray-500">
+                    <span>Showing {adminData.allRequests.length} of {adminData.requestsTotal || adminData.allRequests.length} requests</span>
+                    {adminData.nextRequestsCursor && (
+                      <button
+                        onClick={loadMoreRequests}
+                        disabled={loadingMoreRequests}
+                        className="px-4 py-2 bg-indigo-600 text-white rounded-lg hover:bg-indigo-700 transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+                      >
+                        {loadingMoreRequests ? 'Loading...' : 'Load more'}
+                      </button>
+                    )}
+                  </div>
                 </div>
               )}
             </div>
@@ -73,6 +73,8 @@ function RequestPageContent() {
   const recognitionRef = useRef<any>(null);
   const [savingTranscript, setSavingTranscript] = useState(false);
   const [transcriptSaveMessage, setTranscriptSaveMessage] = useState<string | null>(null);
+  // Dictation is streamed to a transcript chunk by chunk; requests are chained so chunks stay in order
+  const dictationRef = useRef<{ transcript: Promise<number | null> | null; failed: boolean }>({ transcript: null, failed: false });
 
   const [formData, setFormData] = useState<PressReleaseRequest>({
     title: '',
@@ -149,6 +151,7 @@ function RequestPageContent() {
 
           // Add only NEW final results to accumulated speech
           if (newFinalTranscript.trim()) {
+            streamDictationChunk(newFinalTranscript.trim());
             setAccumulatedSpeech(prev => {
               const updated = prev + newFinalTranscript;
               console.log('✅ Added final text:', newFinalTranscript.trim());
@@ -266,6 +269,50 @@ function RequestPageContent() {
     }
   }, [accumulatedSpeech, isListening]);
 
+  // Send a final speech result to the dictation transcript, starting it on the first chunk
+  const streamDictationChunk = (chunk: string) => {
+    const session = dictationRef.current;
+    if (!session.transcript) {
+      session.transcript = api.startTranscript(chunk)
+        .then(result => (result.success ? result.data.id : null))
+        .catch(err => {
+          console.error('Start transcript error:', err);
+          return null;
+        })
+        .then(id => {
+          if (id === null) session.failed = true;
+          return id;
+        });
+      return;
+    }
+    session.transcript = session.transcript.then(async id => {
+      if (id === null) return null;
+      try {
+        const result = await api.appendTranscriptChunk(id, chunk);
+        if (!result.success) session.failed = true;
+      } catch (err) {
+        console.error('Append transcript chunk error:', err);
+        session.failed = true;
+      }
+      return id;
+    });
+  };
+
+  // Close the dictation session; resolves to the transcript id if every chunk was stored
+  const finishDictation = async (): Promise<number | null> => {
+    const session = dictationRef.current;
+    if (!session.transcript) return null;
+    const id = await session.transcript;
+    if (id === null || session.failed) return null;
+    try {
+      const result = await api.finishTranscript(id);
+      return result.success ? id : null;
+    } catch (err) {
+      console.error('Finish transcript error:', err);
+      return null;
+    }
+  };
+
   // Helper function to restart recognition
   const restartRecognition = () => {
     if (recognitionRef.current && isRecognitionActive) {
@@ -384,6 +431,8 @@ function RequestPageContent() {
       setError(null);
       setSpeechText('');
       setAccumulatedSpeech('');
+      setTranscriptSaveMessage(null);
+      dictationRef.current = { transcript: null, failed: false };
       
       // Clear any existing restart timeout
       if (restartTimeout) {
@@ -437,6 +486,14 @@ function RequestPageContent() {
         }
       }
       
+      // Fold the streamed chunks into the saved transcript
+      finishDictation().then(id => {
+        if (id !== null) {
+          setTranscriptSaveMessage('✅ Transcript saved automatically! You can view it in the Transcripts section.');
+          setTimeout(() => setTranscriptSaveMessage(null), 5000);
+        }
+      });
+      
       // Process accumulated speech after stopping
       setTimeout(() => {
         const finalText = accumulatedSpeech.trim();
@@ -501,6 +558,7 @@ function RequestPageContent() {
     setAccumulatedSpeech('');
     setError(null);
     setTranscriptSaveMessage(null);
+    dictationRef.current = { transcript: null, failed: false };
   };
 
   const saveTranscript = async () => {
@@ -515,9 +573,13 @@ function RequestPageContent() {
       setError(null);
       setTranscriptSaveMessage(null);
 
-      const result = await api.saveTranscript(finalText);
+      // Dictation already streamed in full is saved; only fall back to sending the whole text
+      const result = (await finishDictation()) !== null
+        ? { success: true, message: 'Transcript saved successfully' }
+        : await api.saveTranscript(finalText);
       
       if (result.success) {
+        dictationRef.current = { transcript: null, failed: false };
         setTranscriptSaveMessage('✅ Transcript saved successfully! You can view it in the Transcripts section.');
         // Clear the current speech after saving
         setSpeechText('');
@@ -7,7 +7,7 @@ import DashboardLayout from '../dashboard/layout';
 
 interface Transcript {
   id: number;
-  text: string;
+  text?: string;  // Listings only carry the preview; full text is loaded on demand
   created_at: string;
   word_count: number;
   preview: string;
@@ -100,8 +100,30 @@ function TranscriptsContent() {
     });
   };
 
-  const formatCombinedTranscripts = (transcriptIds: number[]): string => {
-    const selectedTranscriptData = transcripts.filter(t => transcriptIds.includes(t.id));
+  // Fetch full text for transcripts whose listing entry only has the preview
+  const loadTranscriptTexts = async (transcriptIds: number[]): Promise<Transcript[]> => {
+    const loaded = await Promise.all(
+      transcripts
+        .filter(t => transcriptIds.includes(t.id))
+        .map(async (t) => {
+          if (t.text !== undefined) return t;
+          const full = await api.getTranscript(t.id);
+          return full ? { ...t, text: full.text } : t;
+        })
+    );
+    setTranscripts(prev => prev.map(t => loaded.find(l => l.id === t.id) || t));
+    return loaded;
+  };
+
+  const openTranscript = async (transcript: Transcript) => {
+    setSelectedTranscript(transcript);
+    if (transcript.text === undefined) {
+      const [loaded] = await loadTranscriptTexts([transcript.id]);
+      setSelectedTranscript(loaded || transcript);
+    }
+  };
+
+  const formatCombinedTranscripts = (selectedTranscriptData: Transcript[]): string => {
     
     // Sort by creation date (oldest first)
     selectedTranscriptData.sort((a, b) => new Date(a.created_at).getTime() - new Date(b.created_at).getTime());
@@ -150,7 +172,7 @@ Instructions for AI: The following content contains ${selectedTranscriptData.len
     return header + '\n' + combinedContent;
   };
 
-  const handleUseForPressRelease = (transcriptIds: number[] = []) => {
+  const handleUseForPressRelease = async (transcriptIds: number[] = []) => {
     let idsToUse = transcriptIds;
     
     // If no IDs provided and we're in single-select mode, use the current transcript
@@ -170,11 +192,12 @@ Instructions for AI: The following content contains ${selectedTranscriptData.len
 
     let combinedText: string;
     let source: string;
+    const selectedTranscriptData = await loadTranscriptTexts(idsToUse);
 
     if (idsToUse.length === 1) {
       // Single transcript
-      const transcript = transcripts.find(t => t.id === idsToUse[0]);
-      if (!transcript) {
+      const transcript = selectedTranscriptData[0];
+      if (!transcript || transcript.text === undefined) {
         setError('Transcript not found');
         return;
       }
@@ -182,7 +205,7 @@ Instructions for AI: The following content contains ${selectedTranscriptData.len
       source = 'transcript';
     } else {
       // Multiple transcripts - format them properly
-      combinedText = formatCombinedTranscripts(idsToUse);
+      combinedText = formatCombinedTranscripts(selectedTranscriptData);
       source = 'combined-transcripts';
     }
 
@@ -260,7 +283,7 @@ Instructions for AI: The following content contains ${selectedTranscriptData.len
             <strong>Full Transcript:</strong>
             <div className="mt-2 p-4 bg-gray-50 rounded-lg border max-h-96 overflow-y-auto">
               <p className="text-gray-800 whitespace-pre-wrap leading-relaxed">
-                {selectedTranscript.text}
+                {selectedTranscript.text ?? 'Loading transcript...'}
               </p>
             </div>
           </div>
@@ -387,7 +410,7 @@ Instructions for AI: The following content contains ${selectedTranscriptData.len
                 if (isMultiSelectMode) {
                   handleTranscriptSelect(transcript.id);
                 } else {
-                  setSelectedTranscript(transcript);
+                  openTranscript(transcript);
                 }
               }}
             >
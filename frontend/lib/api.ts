@@ -55,6 +55,8 @@ export interface PressReleaseRequest {
   category: string;
   contact_info?: string;
   additional_notes?: string;
+  check_duplicates?: boolean;  // Return similar earlier briefs instead of generating
+  reuse_request_id?: number;   // Reuse releases from an earlier similar request
 }
 
 export interface GeneratedPressRelease {
@@ -73,6 +75,35 @@ export interface PressReleaseResponse {
   status: string;
 }
 
+export interface TraceSpan {
+  trace_id: string;
+  span_id: string;
+  parent_id: string | null;
+  name: string;
+  service: string;  // "backend" or "agent"
+  start_time: number;
+  duration_ms: number;
+  offset_ms: number;  // Start relative to the first span of the trace
+  depth: number;
+  status: 'ok' | 'error';
+  attributes: Record<string, any>;
+}
+
+export interface Trace {
+  trace_id: string;
+  total_ms: number;
+  spans: TraceSpan[];
+}
+
+export interface TraceSummary {
+  trace_id: string;
+  request_id: string;
+  name: string;
+  start_time: number;
+  duration_ms: number;
+  status: 'ok' | 'error';
+}
+
 export interface ApiResponse<T> {
   success: boolean;
   data?: T;
@@ -165,6 +196,25 @@ export const api = {
     return response.json();
   },
 
+  // Full-text search over requests, generated releases and transcripts
+  async search(query: string, types?: string[]): Promise<any[]> {
+    const params = new URLSearchParams({ q: query });
+    if (types && types.length > 0) {
+      params.set('type', types.join(','));
+    }
+
+    const response = await fetch(`${API_BASE_URL}/api/search?${params.toString()}`, {
+      headers: getAuthHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
+    const result = await response.json();
+    return result.success ? result.data : [];
+  },
+
   // Initialize database (for setup)
   async initDatabase(): Promise<{ success: boolean; message: string }> {
     const response = await fetch(`${API_BASE_URL}/api/init-db`, {
@@ -207,7 +257,51 @@ export const api = {
     return response.json();
   },
 
-  // Get all transcripts
+  // Start a transcript that will be streamed in chunks during dictation
+  async startTranscript(text: string = ''): Promise<{ success: boolean; data?: any; message: string }> {
+    const response = await fetch(`${API_BASE_URL}/api/transcripts`, {
+      method: 'POST',
+      headers: getAuthHeaders(),
+      body: JSON.stringify({ text, streaming: true }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
+    return response.json();
+  },
+
+  // Append a dictation chunk to an existing transcript
+  async appendTranscriptChunk(transcriptId: number, text: string): Promise<{ success: boolean; data?: any; message: string }> {
+    const response = await fetch(`${API_BASE_URL}/api/transcripts/${transcriptId}/append`, {
+      method: 'POST',
+      headers: getAuthHeaders(),
+      body: JSON.stringify({ text }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
+    return response.json();
+  },
+
+  // Finish a dictation session: the backend folds the chunks into the transcript and indexes it
+  async finishTranscript(transcriptId: number): Promise<{ success: boolean; data?: any; message: string }> {
+    const response = await fetch(`${API_BASE_URL}/api/transcripts/${transcriptId}/finish`, {
+      method: 'POST',
+      headers: getAuthHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
+    return response.json();
+  },
+
+  // Get all transcripts (summaries: id, preview, word_count, created_at)
   async getTranscripts(): Promise<any[]> {
     const response = await fetch(`${API_BASE_URL}/api/transcripts`, {
       headers: getAuthHeaders(),
@@ -259,6 +353,37 @@ export const api = {
       throw new Error(`API Error: ${response.statusText}`);
     }
 
+    const result = await response.json();
+    return result.success ? result.data : null;
+  },
+
+  // Most recent traced requests (admin only)
+  async getRecentTraces(limit: number = 20): Promise<TraceSummary[]> {
+    const response = await fetch(`${API_BASE_URL}/api/admin/traces?limit=${limit}`, {
+      headers: getAuthHeaders(),
+    });
+    
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
+    const result = await response.json();
+    return result.success ? result.data : [];
+  },
+
+  // Span waterfall for one request id (admin only); null when no trace was recorded
+  async getTrace(requestId: string): Promise<Trace | null> {
+    const response = await fetch(`${API_BASE_URL}/api/admin/traces/${encodeURIComponent(requestId)}`, {
+      headers: getAuthHeaders(),
+    });
+    
+    if (response.status === 404) {
+      return null;
+    }
+    if (!response.ok) {
+      throw new Error(`API Error: ${response.statusText}`);
+    }
+
     const result = await response.json();
     return result.success ? result.data : null;
   }
@@ -70,6 +70,10 @@ export default function AdminPage() {
   const router = useRouter();
   const [users, setUsers] = useState<User[]>([]);
   const [requests, setRequests] = useState<PressReleaseRequest[]>([]);
+  const [requestsTotal, setRequestsTotal] = useState(0);
+  // Cursor for the next page of /api/admin/requests (null once every request is loaded)
+  const [nextRequestsCursor, setNextRequestsCursor] = useState<number | null>(null);
+  const [loadingMoreRequests, setLoadingMoreRequests] = useState(false);
   const [stats, setStats] = useState<AdminStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
@@ -120,7 +124,11 @@ export default function AdminPage() {
       ]);
       
       if (usersRes.success) setUsers(usersRes.data);
-      if (requestsRes.success) setRequests(requestsRes.data.requests);
+      if (requestsRes.success) {
+        setRequests(requestsRes.data.requests);
+        setRequestsTotal(requestsRes.data.total);
+        setNextRequestsCursor(requestsRes.data.next_cursor);
+      }
       if (statsRes.success) setStats(statsRes.data);
       
     } catch (error) {
@@ -131,6 +139,29 @@ export default function AdminPage() {
     }
   };
 
+  const loadMoreRequests = async () => {
+    if (!nextRequestsCursor) return;
+    try {
+      setLoadingMoreRequests(true);
+      const token = localStorage.getItem('authToken');
+      const result = await fetch(`https://pr-connect-r40k.onrender.com/api/admin/requests?cursor=${nextRequestsCursor}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+        },
+      }).then(res => res.json());
+      
+      if (result.success) {
+        setRequests(prev => [...prev, ...result.data.requests]);
+        setRequestsTotal(result.data.total);
+        setNextRequestsCursor(result.data.next_cursor);
+      }
+    } catch (error) {
+      console.error('Error loading more requests:', error);
+    } finally {
+      setLoadingMoreRequests(false);
+    }
+  };
+
   const filteredUsers = users.filter(user =>
     user.full_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
     user.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -360,6 +391,18 @@ export default function AdminPage() {
                 </tbody>
               </table>
             </div>
+            <div className="px-6 py-4 border-t border-gray-200 flex items-center justify-between text-sm text-gray-500">
+              <span>Loaded {requests.length} of {requestsTotal || requests.length} press releases</span>
+              {nextRequestsCursor && (
+                <button
+                  onClick={loadMoreRequests}
+                  disabled={loadingMoreRequests}
+                  className="px-4 py-2 bg-blue-600 text-white rounded-md hover:bg-blue-700 disabled:opacity-50"
+                >
+                  {loadingMoreRequests ? 'Loading...' : 'Load more'}
+                </button>
+              )}
+            </div>
           </div>
         </div>
       )}